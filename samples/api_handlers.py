@@ -0,0 +1,59 @@
+import asyncio
+import pprint
+import time
+from td.client import TDClient
+
+# Create a new session
+TDSession = TDClient(
+    client_id='<YOUR_CLIENT_ID>',
+    redirect_uri='<YOUR_REDIRECT_URI>',
+    credentials_path='<YOUR_CREDENTIALS_PATH>'
+)
+
+# Login to the session
+TDSession.login()
+
+# Create a streaming sesion
+TDStreamingClient = TDSession.create_streaming_session()
+
+# Level One Quote
+TDStreamingClient.level_one_quotes(
+    symbols=["SPY", "IVV", "SDS", "SH"],
+    fields=list(range(0, 50))
+)
+
+# Level One Futures
+TDStreamingClient.level_one_futures(
+    symbols=['/ES'],
+    fields=list(range(0, 42))
+)
+
+
+# Handlers get the section of the message for their service, no need to look for `data` or `notify`.
+def on_quote(service_result: dict):
+    pprint.pprint(service_result['content'], indent=4)
+
+
+# Handlers for a few symbols only get the content of those symbols.
+def on_spy(service_result: dict):
+    print('Here is my key: {}'.format(service_result['content'][0]['key']))
+
+
+# Slow handlers can run in a thread pool, so they don't hold up the stream.
+def on_futures(service_result: dict):
+    time.sleep(1)
+    print(service_result['content'])
+
+
+# Coroutines work too.
+async def on_heartbeat(entry: dict):
+    print(entry)
+
+
+TDStreamingClient.add_handler(service='QUOTE', callback=on_quote)
+TDStreamingClient.add_handler(service='QUOTE', callback=on_spy, symbols=['SPY'])
+TDStreamingClient.add_handler(service='LEVELONE_FUTURES', callback=on_futures, offload=True)
+TDStreamingClient.add_handler(service='notify', callback=on_heartbeat)
+
+# Run the pipeline, every message goes to the handlers.
+asyncio.run(TDStreamingClient.run_pipeline())
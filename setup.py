@@ -41,6 +41,13 @@ setup(
         'pyopenssl'
     ],
 
+    # optional dependencies, `pip install td-ameritrade-python-api[async]` for the `AsyncTDClient`,
+    # and `[parquet]` for the `ParquetSink`.
+    extras_require={
+        'async': ['aiohttp'],
+        'parquet': ['pyarrow']
+    },
+
     # some keywords for my library.
     keywords='finance, td ameritrade, api',
 
@@ -0,0 +1,290 @@
+import time
+import asyncio
+import json as json_lib
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Callable
+
+import aiohttp
+
+from td.client import TDClient
+from td.stream import TDStreamerClient
+from td.quote_batcher import AsyncQuoteBatcher
+
+
+class AsyncTDClient(TDClient):
+
+    """TD Ameritrade API Asynchronous Client Class.
+
+    An `asyncio` twin of the `TDClient`. Every endpoint method of the `TDClient`
+    (`get_quotes`, `get_price_history`, `get_accounts`, `place_order`, ...) is
+    available here and returns an awaitable instead of blocking, so hundreds of
+    requests can run concurrently on a single event loop.
+
+    The client shares the token state, the argument validation and the error
+    mapping of the `TDClient`, only the transport is different. The login process
+    is the same as the regular client.
+    """
+
+    _quote_batcher_class = AsyncQuoteBatcher
+
+    def __init__(self, client_id: str, redirect_uri: str, account_number: str = None, credentials_path: str = None,
+                 auth_flow: str = 'default', _do_init: bool = True, _multiprocessing_safe: bool = False) -> None:
+        """Creates a new instance of the AsyncTDClient Object.
+
+        Takes the same arguments as the `TDClient`, the HTTP session itself is
+        created lazily on the first request, inside the running event loop.
+
+        ### Usage:
+        ----
+            >>> td_session = AsyncTDClient(
+                client_id='<CLIENT_ID>',
+                redirect_uri='<REDIRECT_URI>',
+                credentials_path='<CREDENTIALS_PATH>'
+            )
+            >>> td_session.login()
+            >>> quotes = await td_session.get_quotes(instruments=['MSFT', 'AAPL'])
+        """
+
+        super().__init__(
+            client_id=client_id,
+            redirect_uri=redirect_uri,
+            account_number=account_number,
+            credentials_path=credentials_path,
+            auth_flow=auth_flow,
+            _do_init=_do_init,
+            _multiprocessing_safe=_multiprocessing_safe
+        )
+
+        self._async_session: aiohttp.ClientSession = None
+
+    def __repr__(self) -> str:
+        """String representation of our TD Ameritrade Async Class instance."""
+
+        # define the string representation
+        str_representation = '<TDAmeritrade Async Client (logged_in={login_state}, authorized={auth_state})>'.format(
+            login_state=self.state['logged_in'],
+            auth_state=self.authstate
+        )
+
+        return str_representation
+
+    async def __aenter__(self) -> 'AsyncTDClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def async_session(self) -> aiohttp.ClientSession:
+        """Returns the pooled `aiohttp` session, creating it if needed.
+
+        The connector uses the same pool settings as the `TDClient`, where
+        `pool_maxsize` is the number of connections allowed per host.
+
+        ### Returns:
+        ----
+        {aiohttp.ClientSession} -- The pooled session.
+        """
+
+        if self._async_session is None or self._async_session.closed:
+
+            connector = aiohttp.TCPConnector(
+                limit=self.config['pool_connections'] * self.config['pool_maxsize'],
+                limit_per_host=self.config['pool_maxsize'],
+                force_close=not self.config['keep_alive']
+            )
+
+            self._async_session = aiohttp.ClientSession(connector=connector)
+
+        return self._async_session
+
+    async def close(self) -> None:
+        """Closes the `aiohttp` session and all of its connections."""
+
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+
+        self._async_session = None
+
+    def _prepare_params(self, params: dict) -> dict:
+        """Prepares the URL params the same way `requests` would.
+
+        `requests` drops parameters that are `None` and converts the rest to
+        strings, `aiohttp` refuses both `None` and `bool` values.
+
+        ### Arguments:
+        ----
+        params {dict} -- The URL params for the request.
+
+        ### Returns:
+        ----
+        {dict} -- The cleaned params.
+        """
+
+        if params is None:
+            return None
+
+        return {key: str(value) for key, value in params.items() if value is not None}
+
+    async def _make_request(self, method: str, endpoint: str, mode: str = None, params: dict = None, data: dict = None,
+                            json: dict = None, order_details: bool = False, parser: Callable[[bytes], Any] = None) -> Any:
+        """Handles all the asynchronous requests in the library.
+
+        The async counterpart of `TDClient._make_request`, it builds the URL and
+        headers the same way and maps errors to the same exceptions.
+
+        ### Arguments:
+        ----
+        method: The Request method, can be one of the
+            following: ['get','post','put','delete','patch']
+
+        endpoint: The API URL endpoint, example is 'quotes'
+
+        mode: The content-type mode, can be one of the
+            following: ['form','json']
+
+        params: The URL params for the request.
+
+        data: A data payload for a request.
+
+        json: A json data payload for a request
+
+        parser: A function that decodes the raw response
+            body, used instead of `json` if provided.
+
+        ### Returns:
+        ----
+        A Dictionary object containing the JSON values.
+        """
+
+        url = self._api_endpoint(endpoint=endpoint)
+
+        # Make sure the token is valid, a refresh is a blocking request so it runs off the loop.
+        if time.monotonic() >= self._token_deadline:
+            await asyncio.get_running_loop().run_in_executor(None, self.validate_token)
+
+        headers = self._headers(mode=mode)
+
+        lane = self._request_lane(method=method, endpoint=endpoint)
+        retries = 0
+
+        while True:
+
+            # Wait for our turn, so we stay under the quota.
+            if self.config['rate_limit_enabled']:
+                await self.request_scheduler.acquire_async(lane=lane)
+
+            # Send the request.
+            response = await self.async_session.request(
+                method=method.upper(),
+                url=url,
+                headers=headers,
+                params=self._prepare_params(params=params),
+                data=data,
+                json=json
+            )
+
+            # If we still got throttled, back off and try again.
+            if response.status == 429 and self.config['rate_limit_enabled'] and retries < self.config['rate_limit_retries']:
+                self.request_scheduler.penalize(retry_after=response.headers.get('Retry-After'))
+                response.release()
+                retries += 1
+            else:
+                break
+
+        async with response:
+
+            # grab the status code
+            status_code = response.status
+
+            # grab the response headers.
+            response_headers = response.headers
+
+            # Grab the order id, if it exists.
+            order_id = self._grab_order_id(headers=response_headers)
+
+            # If it's okay and we need details, then add them.
+            if response.ok and order_details:
+
+                response_dict = {
+                    'order_id': order_id,
+                    'headers': response_headers,
+                    'content': await response.read(),
+                    'status_code': status_code,
+                    'request_body': json_lib.dumps(json) if json is not None else data,
+                    'request_method': method.upper()
+                }
+
+                return response_dict
+
+            # If it's okay and we have our own parser, hand it the raw body.
+            elif response.ok and parser:
+                return parser(await response.read())
+
+            # If it's okay and no details.
+            elif response.ok:
+                return await response.json(content_type=None)
+
+            # Refresh the token off the loop, it's a blocking request.
+            elif status_code == 401:
+                message = await response.text()
+                await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    self._handle_error_response,
+                    status_code,
+                    message
+                )
+
+            else:
+                self._handle_error_response(status_code=status_code, message=await response.text())
+
+    async def get_quotes(self, instruments: List) -> Dict:
+        """Grabs real-time quotes for an instrument.
+
+        The async counterpart of `TDClient.get_quotes`, fresh quotes are served
+        from the quote cache when it's enabled.
+
+        ### Arguments:
+        ----
+        instruments: A list of different financial instruments.
+
+        ### Usage:
+        ----
+            >>> await td_client.get_quotes(instruments=['MSFT','SQ'])
+        """
+
+        if self.quote_cache is None:
+            return await self._request_quotes(instruments=instruments)
+
+        # Only request the symbols that aren't fresh in the cache.
+        quotes, missing = self.quote_cache.get_many(symbols=instruments)
+
+        if missing:
+            missing_quotes = await self._request_quotes(instruments=missing)
+            self.quote_cache.put_many(quotes=missing_quotes)
+            quotes.update(missing_quotes)
+
+        return quotes
+
+    async def create_streaming_session(self) -> TDStreamerClient:
+        """Creates a new streaming session with the TD API.
+
+        ### Usage:
+        ----
+            >>> td_stream_session = await td_session.create_streaming_session()
+
+        ### Returns:
+        ----
+        TDStreamerClient -- A new instance of a Stream Client that can be
+            used to subscribe to different streaming services.
+        """
+
+        # Grab the Streamer Info.
+        user_principals = await self.get_user_principals(
+            fields=['streamerConnectionInfo', 'streamerSubscriptionKeys', 'preferences', 'surrogateIds']
+        )
+
+        return self._build_streaming_session(user_principals=user_principals)
@@ -0,0 +1,522 @@
+import argparse
+import contextlib
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+
+from td.json_backend import StreamDecoder
+from td.json_backend import default_decoder
+from td.message import StreamingMessage
+from td.records import SERVICE_FIELD_IDS
+from td.stream import TDStreamerClient
+
+
+# The services frames can be generated for.
+BENCHMARK_SERVICES = ['QUOTE', 'TIMESALE_EQUITY', 'CHART_EQUITY', 'CHART_HISTORY_FUTURES', 'LISTED_BOOK', 'ACTIVES_NASDAQ']
+
+# The steps of the stream a frame can be put through.
+BENCHMARK_STAGES = ['parse', 'service_rows', 'csv_rows', 'records', 'message']
+
+_MARKET_MAKERS = ['ARCX', 'BATX', 'NSDQ', 'EDGX', 'NYSE', 'CINN']
+
+
+@contextlib.contextmanager
+def paused_gc() -> Iterator[None]:
+    """Turns the garbage collector off for a block, like `timeit` does.
+
+    Building and keeping many messages alive otherwise triggers full
+    collections, which end up in the measures.
+    """
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _quote_content(rng: random.Random, symbol: str) -> dict:
+    """Builds a level one quote update, only some fields change on each tick."""
+
+    bid = round(rng.uniform(10, 500), 2)
+    content = {'key': symbol, '1': bid, '2': round(bid + 0.01 * rng.randint(1, 5), 2)}
+
+    if rng.random() < 0.5:
+        content.update({'3': bid, '8': rng.randint(1000, 10000000), '9': rng.randint(1, 1000)})
+
+    if rng.random() < 0.2:
+        content.update({
+            '4': rng.randint(1, 50), '5': rng.randint(1, 50), '6': 'P', '7': 'Q', '11': 35000 + rng.randint(0, 20000)
+        })
+
+    return content
+
+
+def _timesale_content(rng: random.Random, symbol: str) -> dict:
+    """Builds a time and sale print."""
+
+    return {
+        'seq': rng.randint(1, 10000),
+        'key': symbol,
+        '1': 1580748000000 + rng.randint(0, 3600000),
+        '2': round(rng.uniform(10, 500), 4),
+        '3': rng.randint(1, 5000),
+        '4': rng.randint(1, 100000)
+    }
+
+
+def _chart_content(rng: random.Random, symbol: str) -> dict:
+    """Builds a one minute chart bar."""
+
+    open_price = round(rng.uniform(10, 500), 2)
+
+    return {
+        'seq': rng.randint(1, 10000),
+        'key': symbol,
+        '1': open_price,
+        '2': round(open_price + rng.uniform(0, 1), 2),
+        '3': round(open_price - rng.uniform(0, 1), 2),
+        '4': round(open_price + rng.uniform(-1, 1), 2),
+        '5': float(rng.randint(100, 100000)),
+        '6': rng.randint(1, 10000),
+        '7': 1580748000000 + 60000 * rng.randint(0, 390),
+        '8': 18295
+    }
+
+
+def _chart_history_content(rng: random.Random, symbol: str) -> dict:
+    """Builds a chart history with a few candles."""
+
+    candles = []
+
+    for index in range(10):
+        open_price = round(rng.uniform(2700, 2800), 2)
+        candles.append({
+            '0': 1586815200000 + 60000 * index,
+            '1': open_price,
+            '2': open_price + 2.0,
+            '3': open_price - 2.0,
+            '4': open_price + 0.5,
+            '5': float(rng.randint(1, 2000))
+        })
+
+    return {'key': symbol, '0': '1', '1': 0, '2': len(candles), '3': candles}
+
+
+def _book_content(rng: random.Random, symbol: str) -> dict:
+    """Builds a level two book with a few price levels on each side."""
+
+    def side(base: float, step: float) -> List[dict]:
+        levels = []
+        for index in range(5):
+            makers = rng.sample(_MARKET_MAKERS, rng.randint(1, 3))
+            levels.append({
+                '0': round(base + step * index, 2),
+                '1': 100 * len(makers),
+                '2': len(makers),
+                '3': [{'0': maker, '1': 100, '2': 35000000 + rng.randint(0, 1000000)} for maker in makers]
+            })
+        return levels
+
+    mid = round(rng.uniform(10, 500), 2)
+
+    return {'key': symbol, '1': 1580748098456, '2': side(base=mid - 0.01, step=-0.01), '3': side(base=mid + 0.01, step=0.01)}
+
+
+def _actives_content(rng: random.Random, symbol: str) -> dict:
+    """Builds an actives update, with two groups of ten symbols."""
+
+    groups = []
+
+    for group_id in range(2):
+        items = ':'.join(
+            '{}:{}:{}'.format('SYM{}'.format(index), rng.randint(1000, 1000000), round(rng.uniform(0, 5), 2))
+            for index in range(10)
+        )
+        groups.append('{}:10:{}:{}'.format(group_id, rng.randint(1000000, 1000000000), items))
+
+    return {'key': 'NASDAQ-ALL', '1': '42005;0;11:40:00;11:40:05;2;' + ';'.join(groups)}
+
+
+_CONTENT_BUILDERS: Dict[str, Callable[[random.Random, str], dict]] = {
+    'QUOTE': _quote_content,
+    'TIMESALE_EQUITY': _timesale_content,
+    'CHART_EQUITY': _chart_content,
+    'CHART_HISTORY_FUTURES': _chart_history_content,
+    'LISTED_BOOK': _book_content,
+    'ACTIVES_NASDAQ': _actives_content
+}
+
+
+def synthetic_frames(service: str, count: int = 5000, symbols: int = 10, seed: int = 0) -> List[str]:
+    """Builds stream frames, like the ones the streamer sends for a service.
+
+    Arguments:
+    ----
+    service {str} -- The service, one of `BENCHMARK_SERVICES`.
+
+    Keyword Arguments:
+    ----
+    count {int} -- The number of frames. (default: {5000})
+
+    symbols {int} -- The number of symbols in each frame. (default: {10})
+
+    seed {int} -- The seed of the random values, the same seed builds the
+        same frames. (default: {0})
+
+    Returns:
+    ----
+    List[str] -- The JSON frames.
+    """
+
+    if service not in _CONTENT_BUILDERS:
+        raise ValueError('Invalid service, please choose a valid one: {}'.format(', '.join(BENCHMARK_SERVICES)))
+
+    rng = random.Random(seed)
+    build_content = _CONTENT_BUILDERS[service]
+    section = 'snapshot' if service == 'CHART_HISTORY_FUTURES' else 'data'
+    command = 'GET' if service == 'CHART_HISTORY_FUTURES' else 'SUBS'
+
+    # The actives have a single key.
+    symbol_count = 1 if service.startswith('ACTIVES_') else symbols
+
+    frames = []
+
+    with paused_gc():
+        for sequence in range(count):
+            frames.append(json.dumps({
+                section: [
+                    {
+                        'service': service,
+                        'timestamp': 1580748000000 + sequence,
+                        'command': command,
+                        'content': [build_content(rng, 'SYM{}'.format(index)) for index in range(symbol_count)]
+                    }
+                ]
+            }))
+
+    return frames
+
+
+def run_coroutine(coroutine: Any) -> Any:
+    """Runs a coroutine that never waits, without an event loop.
+
+    Arguments:
+    ----
+    coroutine {Coroutine} -- The coroutine.
+
+    Returns:
+    ----
+    Any -- What the coroutine returned.
+    """
+
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+
+    coroutine.close()
+    raise RuntimeError('The coroutine waited on something, it needs an event loop.')
+
+
+def service_writer(stream_client: TDStreamerClient, service: str) -> Callable[..., List]:
+    """Returns the `_write_*_services` method `_csv_rows` uses for a service."""
+
+    if service in stream_client.approved_writes_level_2:
+        return stream_client._write_level_two_services
+    elif 'ACTIVES_' in service:
+        return stream_client._write_active_services
+    elif service == 'CHART_HISTORY_FUTURES':
+        return stream_client._write_chart_services
+
+    return stream_client._write_non_chart_services
+
+
+def _percentile(latencies: List[int], percent: float) -> float:
+    """Returns a percentile of sorted latencies, in microseconds."""
+
+    index = min(len(latencies) - 1, int(round(percent / 100.0 * (len(latencies) - 1))))
+
+    return latencies[index] / 1000.0
+
+
+def measure(function: Callable[[Any], Any], items: List[Any], allocations: bool = True, allocation_sample: int = 500) -> dict:
+    """Times a function on each item, and measures what it allocates.
+
+    The timed pass runs with the garbage collector off. The
+    allocations are measured in a second pass over the first items, with
+    `tracemalloc`, while the results are kept alive.
+
+    Arguments:
+    ----
+    function {Callable[[Any], Any]} -- The function, called with each item.
+
+    items {List[Any]} -- The items.
+
+    Keyword Arguments:
+    ----
+    allocations {bool} -- `True` to measure the allocations. (default: {True})
+
+    allocation_sample {int} -- The number of items the allocations are
+        measured on, tracing is slow. (default: {500})
+
+    Returns:
+    ----
+    dict -- The items per second, the latency percentiles in microseconds,
+        and the bytes and memory blocks allocated per item.
+    """
+
+    latencies = [0] * len(items)
+    perf_counter_ns = time.perf_counter_ns
+
+    with paused_gc():
+        start_total = perf_counter_ns()
+        for index, item in enumerate(items):
+            start = perf_counter_ns()
+            function(item)
+            latencies[index] = perf_counter_ns() - start
+        total = perf_counter_ns() - start_total
+
+    latencies.sort()
+
+    result = {
+        'frames': len(items),
+        'seconds': total / 1e9,
+        'frames_per_second': len(items) / (total / 1e9) if total else None,
+        'latency_us': {
+            'mean': sum(latencies) / len(latencies) / 1000.0,
+            'p50': _percentile(latencies, 50),
+            'p99': _percentile(latencies, 99),
+            'max': latencies[-1] / 1000.0
+        },
+        'allocations': None
+    }
+
+    if allocations:
+
+        sample = items[:allocation_sample]
+        results = [None] * len(sample)
+        blocks = sys.getallocatedblocks()
+
+        with paused_gc():
+            tracemalloc.start()
+            try:
+                for index, item in enumerate(sample):
+                    results[index] = function(item)
+                size, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        result['allocations'] = {
+            'frames': len(sample),
+            'bytes_per_frame': size / len(sample),
+            'blocks_per_frame': (sys.getallocatedblocks() - blocks) / len(sample),
+            'peak_bytes': peak
+        }
+
+        del results
+
+    return result
+
+
+def benchmark_service(service: str, frames: List[str], stages: List[str] = None, allocations: bool = True,
+                      stream_client: TDStreamerClient = None) -> Dict[str, dict]:
+    """Puts the frames of a service through each step of the stream client.
+
+    Arguments:
+    ----
+    service {str} -- The service of the frames.
+
+    frames {List[str]} -- The frames, from `synthetic_frames` or a recording.
+
+    Keyword Arguments:
+    ----
+    stages {List[str]} -- The steps to measure, every one of `BENCHMARK_STAGES`
+        if not provided. `parse` is `_parse_json_message`, `service_rows` the
+        `_write_*_services` method of the service, `csv_rows` is `_csv_rows`,
+        `records` is `decode_records`, and `message` builds a `StreamingMessage`
+        and its components. (default: {None})
+
+    allocations {bool} -- `True` to measure the allocations. (default: {True})
+
+    stream_client {TDStreamerClient} -- The client to measure, a new one
+        if not provided. (default: {None})
+
+    Returns:
+    ----
+    Dict[str, dict] -- The measures of each step, see `measure`.
+    """
+
+    stages = stages or BENCHMARK_STAGES
+
+    for stage in stages:
+        if stage not in BENCHMARK_STAGES:
+            raise ValueError('Invalid stage, please choose a valid one: {}'.format(', '.join(BENCHMARK_STAGES)))
+
+    if stream_client is None:
+        stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+
+    # The steps after the parsing start from decoded messages.
+    with paused_gc():
+        messages = [stream_client.json_decoder.loads(frame) for frame in frames]
+    write_rows = service_writer(stream_client=stream_client, service=service)
+
+    def parse(frame: str) -> dict:
+        return run_coroutine(stream_client._parse_json_message(message=frame))
+
+    def service_rows(message: dict) -> List:
+        service_results = message.get('data') or message['snapshot']
+        return [write_rows(data_content=service_result['content'], service_name=service) for service_result in service_results]
+
+    def streaming_message(frame: str) -> StreamingMessage:
+        message = StreamingMessage(message=frame)
+        message.set_components()
+        return message
+
+    runs = {
+        'parse': (parse, frames),
+        'service_rows': (service_rows, messages),
+        'csv_rows': (stream_client._csv_rows, messages),
+        'records': (lambda message: stream_client.decode_records(message=message), messages),
+        'message': (streaming_message, frames)
+    }
+
+    results = {}
+
+    for stage in stages:
+
+        # Services without records have nothing to decode.
+        if stage == 'records' and service not in SERVICE_FIELD_IDS:
+            continue
+
+        function, items = runs[stage]
+        results[stage] = measure(function=function, items=items, allocations=allocations)
+
+    return results
+
+
+def run_benchmarks(services: List[str] = None, stages: List[str] = None, frames: int = 5000, symbols: int = 10,
+                   seed: int = 0, allocations: bool = True, backend: str = None) -> dict:
+    """Runs the benchmarks of several services, on synthetic frames.
+
+    Keyword Arguments:
+    ----
+    services {List[str]} -- The services, every one of `BENCHMARK_SERVICES`
+        if not provided. (default: {None})
+
+    stages {List[str]} -- The steps, every one of `BENCHMARK_STAGES` if not
+        provided. (default: {None})
+
+    frames {int} -- The number of frames of each service. (default: {5000})
+
+    symbols {int} -- The number of symbols in each frame. (default: {10})
+
+    seed {int} -- The seed of the frames. (default: {0})
+
+    allocations {bool} -- `True` to measure the allocations. (default: {True})
+
+    backend {str} -- The JSON library used to parse the frames, the default
+        decoder's if not provided. (default: {None})
+
+    Returns:
+    ----
+    dict -- The environment the benchmarks ran in, and the measures of
+        each step of each service.
+    """
+
+    services = services or BENCHMARK_SERVICES
+
+    stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+
+    if backend is not None:
+        stream_client.json_decoder = StreamDecoder(backend=backend)
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'json_backend': stream_client.json_decoder.backend,
+            'message_json_backend': default_decoder.backend,
+            'frames': frames,
+            'symbols': symbols,
+            'seed': seed
+        },
+        'services': {}
+    }
+
+    for service in services:
+
+        service_frames = synthetic_frames(service=service, count=frames, symbols=symbols, seed=seed)
+
+        report['services'][service] = {
+            'frame_bytes': sum(len(frame) for frame in service_frames) / len(service_frames),
+            'stages': benchmark_service(
+                service=service,
+                frames=service_frames,
+                stages=stages,
+                allocations=allocations,
+                stream_client=stream_client
+            )
+        }
+
+    return report
+
+
+def main(arguments: List[str] = None) -> dict:
+    """Runs the benchmarks from the command line, and prints the report as JSON.
+
+    Usage:
+    ----
+        $ python -m td.benchmark --frames 20000 --services QUOTE LISTED_BOOK --output report.json
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='python -m td.benchmark',
+        description='Measures how fast the stream client handles synthetic frames.'
+    )
+    parser.add_argument('--services', nargs='+', choices=BENCHMARK_SERVICES, help='The services to measure, all by default.')
+    parser.add_argument('--stages', nargs='+', choices=BENCHMARK_STAGES, help='The steps to measure, all of them by default.')
+    parser.add_argument('--frames', type=int, default=5000, help='The number of frames of each service.')
+    parser.add_argument('--symbols', type=int, default=10, help='The number of symbols in each frame.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the frames.')
+    parser.add_argument('--backend', help='The JSON library used to parse the frames.')
+    parser.add_argument('--no-allocations', action='store_true', help='Skip measuring the allocations.')
+    parser.add_argument('--output', help='The file the JSON report is written to, printed if not provided.')
+
+    options = parser.parse_args(arguments)
+
+    report = run_benchmarks(
+        services=options.services,
+        stages=options.stages,
+        frames=options.frames,
+        symbols=options.symbols,
+        seed=options.seed,
+        allocations=not options.no_allocations,
+        backend=options.backend
+    )
+
+    if options.output:
+        with open(file=options.output, mode='w') as report_file:
+            json.dump(report, report_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+import re
+import json
+import bisect
+
+from array import array
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Union
+
+
+# The candle fields and the array typecode used to store them.
+CANDLE_COLUMNS = {
+    'open': 'd',
+    'high': 'd',
+    'low': 'd',
+    'close': 'd',
+    'volume': 'q',
+    'datetime': 'q'
+}
+
+_NUMBER = rb'\s*(-?[0-9.eE+-]+)\s*'
+
+# Matches a whole candle, in the order the API sends the fields.
+_CANDLE_PATTERN = re.compile(
+    rb'\{\s*"open":' + _NUMBER +
+    rb',\s*"high":' + _NUMBER +
+    rb',\s*"low":' + _NUMBER +
+    rb',\s*"close":' + _NUMBER +
+    rb',\s*"volume":' + _NUMBER +
+    rb',\s*"datetime":' + _NUMBER + rb'\}'
+)
+
+_SYMBOL_PATTERN = re.compile(rb'"symbol"\s*:\s*"([^"]*)"')
+
+
+class Candles():
+
+    """
+    A columnar representation of price history candles.
+
+    Each field is kept in its own contiguous `array`, instead of one dictionary
+    per candle. The arrays can be handed to NumPy or pandas without copying the
+    data, when they are installed.
+    """
+
+    def __init__(self, symbol: str = None, columns: Dict[str, array] = None) -> None:
+        """Initalizes the `Candles` object.
+
+        Keyword Arguments:
+        ----
+        symbol {str} -- The ticker symbol of the candles. (default: {None})
+
+        columns {Dict[str, array]} -- The candle columns, an empty set of
+            columns is created if not provided. (default: {None})
+        """
+
+        self.symbol = symbol
+
+        if columns is None:
+            columns = {name: array(typecode) for name, typecode in CANDLE_COLUMNS.items()}
+
+        self.columns = columns
+
+    def __repr__(self) -> str:
+        return '<Candles (symbol={symbol}, count={count})>'.format(symbol=self.symbol, count=len(self))
+
+    def __len__(self) -> int:
+        return len(self.columns['datetime'])
+
+    def __getitem__(self, name: str) -> array:
+        return self.columns[name]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Candles):
+            return NotImplemented
+        return self.symbol == other.symbol and self.columns == other.columns
+
+    @property
+    def empty(self) -> bool:
+        """Returns `True` if there are no candles."""
+
+        return len(self) == 0
+
+    @property
+    def nbytes(self) -> int:
+        """Returns the number of bytes used by the columns."""
+
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def append(self, open: float, high: float, low: float, close: float, volume: int, datetime: int) -> None:
+        """Adds a single candle at the end."""
+
+        columns = self.columns
+        columns['open'].append(float(open))
+        columns['high'].append(float(high))
+        columns['low'].append(float(low))
+        columns['close'].append(float(close))
+        columns['volume'].append(int(volume))
+        columns['datetime'].append(int(datetime))
+
+    @classmethod
+    def from_candles(cls, candles: List[dict], symbol: str = None) -> 'Candles':
+        """Builds the columns from a list of candle dictionaries.
+
+        Arguments:
+        ----
+        candles {List[dict]} -- The `candles` of a `get_price_history` response.
+
+        Keyword Arguments:
+        ----
+        symbol {str} -- The ticker symbol of the candles. (default: {None})
+
+        Returns:
+        ----
+        Candles -- The columnar candles.
+        """
+
+        new_candles = cls(symbol=symbol)
+
+        for candle in candles:
+            new_candles.append(**candle)
+
+        return new_candles
+
+    @classmethod
+    def from_response(cls, response: dict) -> 'Candles':
+        """Builds the columns from a decoded `get_price_history` response.
+
+        Arguments:
+        ----
+        response {dict} -- The `get_price_history` response.
+
+        Returns:
+        ----
+        Candles -- The columnar candles.
+        """
+
+        return cls.from_candles(candles=response.get('candles', []), symbol=response.get('symbol'))
+
+    @classmethod
+    def from_json(cls, content: Union[bytes, str]) -> 'Candles':
+        """Decodes the columns straight from the raw response body.
+
+        The candles are scanned out of the body with a single regular expression
+        and parsed directly into the arrays, no dictionary is ever built for them.
+        If the body doesn't have the expected layout, it falls back to `json`.
+
+        Arguments:
+        ----
+        content {Union[bytes, str]} -- The raw `get_price_history` response body.
+
+        Returns:
+        ----
+        Candles -- The columnar candles.
+        """
+
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+
+        matches = _CANDLE_PATTERN.findall(content)
+
+        # Every candle has a `datetime`, if we didn't match them all the layout is different.
+        if len(matches) != content.count(b'"datetime"'):
+            return cls.from_response(response=json.loads(content))
+
+        symbol_match = _SYMBOL_PATTERN.search(content)
+        symbol = symbol_match.group(1).decode('utf-8') if symbol_match else None
+
+        opens, highs, lows, closes, volumes, datetimes = zip(*matches) if matches else ((),) * 6
+
+        columns = {
+            'open': array('d', map(float, opens)),
+            'high': array('d', map(float, highs)),
+            'low': array('d', map(float, lows)),
+            'close': array('d', map(float, closes)),
+            'volume': array('q', [int(float(volume)) for volume in volumes]),
+            'datetime': array('q', map(int, datetimes))
+        }
+
+        return cls(symbol=symbol, columns=columns)
+
+    def to_candles(self) -> List[dict]:
+        """Converts the columns back to a list of candle dictionaries.
+
+        Returns:
+        ----
+        List[dict] -- The candles, in the `get_price_history` format.
+        """
+
+        names = list(CANDLE_COLUMNS)
+
+        return [
+            dict(zip(names, values))
+            for values in zip(*(self.columns[name] for name in names))
+        ]
+
+    def to_response(self) -> dict:
+        """Converts the columns back to a `get_price_history` response."""
+
+        return {
+            'candles': self.to_candles(),
+            'symbol': self.symbol,
+            'empty': self.empty
+        }
+
+    def between(self, start: int, end: int) -> 'Candles':
+        """Returns the candles in a date range.
+
+        Arguments:
+        ----
+        start {int} -- The start of the range, in milliseconds since epoch.
+
+        end {int} -- The end of the range, in milliseconds since epoch.
+
+        Returns:
+        ----
+        Candles -- The candles with a `datetime` between `start` and `end`, inclusive.
+        """
+
+        datetimes = self.columns['datetime']
+        first = bisect.bisect_left(datetimes, start)
+        last = bisect.bisect_right(datetimes, end)
+
+        return Candles(
+            symbol=self.symbol,
+            columns={name: column[first:last] for name, column in self.columns.items()}
+        )
+
+    def to_numpy(self) -> dict:
+        """Converts the columns to NumPy arrays without copying them.
+
+        The arrays share their memory with the columns, the `datetime` column
+        is returned as a `datetime64[ms]` array.
+
+        Returns:
+        ----
+        dict -- The NumPy array of each column.
+        """
+
+        import numpy
+
+        arrays = {}
+
+        for name, column in self.columns.items():
+            arrays[name] = numpy.frombuffer(column, dtype=numpy.float64 if column.typecode == 'd' else numpy.int64)
+
+        arrays['datetime'] = arrays['datetime'].view('datetime64[ms]')
+
+        return arrays
+
+    def to_pandas(self) -> Any:
+        """Converts the columns to a pandas `DataFrame` indexed by `datetime`.
+
+        Returns:
+        ----
+        pandas.DataFrame -- The candles, one row per candle.
+        """
+
+        import pandas
+
+        arrays = self.to_numpy()
+        index = pandas.DatetimeIndex(arrays.pop('datetime'), name='datetime')
+
+        return pandas.DataFrame(data=arrays, index=index, copy=False)
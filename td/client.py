@@ -1,26 +1,33 @@
 import os
 import time
 import json
+import math
 import pprint
 import datetime
 import pathlib
 import requests
+import threading
 import urllib.parse
 
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Union
+from typing import Callable
 from typing import Optional
-from datetime import timedelta
 
 from td.utils import StatePath
 from td.utils import TDUtilities
 
 from td.orders import Order
 from td.orders import OrderLeg
+from td.candles import Candles
 from td.stream import TDStreamerClient
+from td.scheduler import RequestScheduler
+from td.quote_batcher import QuoteBatcher
+from td.quote_cache import QuoteCache
 from td.option_chain import OptionChain
+from td.token_refresher import TokenRefresher
 
 from td.enums import VALID_CHART_VALUES
 from td.enums import ENDPOINT_ARGUMENTS
@@ -48,9 +55,16 @@ class TDClient():
     _multiprocessing_safe flag = True makes a single instance of this client safe to pass to multiple threads / processes,
     as it will check a shared token cache first upon token expiration rather than each thread invalidating each others tokens.
     Only the first thread to see a token has expired will actually request a new one, the other threads / processes will pull
-    from cache.
+    from cache. The cache is a `SharedTokenStore` in shared memory, reading it never blocks, and a process that calls
+    `start_token_refresher` before forking its workers becomes the one that refreshes the tokens for all of them.
     """
 
+    _quote_batcher_class = QuoteBatcher
+
+    # A token is refreshed this many seconds before it expires.
+    ACCESS_TOKEN_MARGIN = 300
+    REFRESH_TOKEN_MARGIN = 172800
+
     def __init__(self, client_id: str, redirect_uri: str, account_number: str = None, credentials_path: str = None, 
                        auth_flow: str = 'default', _do_init: bool = True, _multiprocessing_safe = False) -> None:
         """Creates a new instance of the TDClient Object.
@@ -103,7 +117,13 @@ class TDClient():
             'api_version': 'v1',
             'auth_endpoint': 'https://auth.tdameritrade.com/auth',
             'token_endpoint': 'oauth2/token',
-            'refresh_enabled': True
+            'refresh_enabled': True,
+            'pool_connections': 10,
+            'pool_maxsize': 10,
+            'pool_block': False,
+            'keep_alive': True,
+            'rate_limit_enabled': True,
+            'rate_limit_retries': 3
         }
         
         # Define the initalized state, these are the default values.
@@ -112,18 +132,14 @@ class TDClient():
             'refresh_token': None,
             'logged_in': False
         }
-        self._cached_state = None
+        self._token_store = None
+        self._token_store_version = None
         self._multiprocessing_safe = _multiprocessing_safe
         self._multiprocessing_lock = None
         if self._multiprocessing_safe:
-            import multiprocessing as mp
-            self._cached_state = mp.Manager().dict()
-            self._multiprocessing_lock = mp.Lock()
-            self._cached_state.update({
-                'access_token': None,
-                'refresh_token': None,
-                'logged_in': False
-            })
+            from td.token_store import SharedTokenStore
+            self._token_store = SharedTokenStore()
+            self._multiprocessing_lock = self._token_store.lock
 
         self.auth_flow = auth_flow
         self.client_id = client_id
@@ -145,6 +161,16 @@ class TDClient():
         # define a new attribute called 'authstate' and initialize to `False`. This will be used by our login function.
         self.authstate = False
 
+        # The monotonic times the tokens need refreshing at, kept up to date by `_update_token_deadlines`.
+        self._access_token_deadline = -math.inf
+        self._refresh_token_deadline = -math.inf
+        self._token_deadline = -math.inf
+        self._token_lock = threading.Lock()
+        self._token_lock_pid = os.getpid()
+
+        # Tokens are refreshed inline until `start_token_refresher` is called.
+        self.token_refresher = None
+
         # call the state_manager method and update the state to init (initalized)
         if _do_init:
             self._state_manager('init')
@@ -152,6 +178,20 @@ class TDClient():
         # Initalize the client with no streaming session.
         self.streaming_session = None
 
+        # Every request waits for its turn in the scheduler, so we stay under the quota.
+        self.request_scheduler = RequestScheduler(
+            requests_per_minute=120,
+            multiprocessing_safe=self._multiprocessing_safe
+        )
+
+        # The pooled HTTP session is created lazily, on the first request.
+        self._request_session = None
+        self._request_session_pid = None
+
+        # Quotes aren't batched or cached until `enable_quote_batching` or `enable_quote_cache` is called.
+        self.quote_batcher = None
+        self.quote_cache = None
+
     def __repr__(self) -> str:
         """String representation of our TD Ameritrade Class instance."""
 
@@ -214,6 +254,154 @@ class TDClient():
         # Built the URl
         return '/'.join(parts)
 
+    def configure_session(self, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                          keep_alive: bool = True) -> requests.Session:
+        """Configures the pooled HTTP session used for every request.
+
+        The client keeps a single `requests.Session` alive for its whole
+        lifetime, so every endpoint method reuses the same TCP+TLS connections
+        instead of paying for a fresh handshake on each call. Calling this method
+        closes the current session and builds a new one with the given settings.
+
+        ### Arguments:
+        ----
+        pool_connections {int} -- The number of per-host connection pools to
+            keep cached. (default: {10})
+
+        pool_maxsize {int} -- The maximum number of connections kept alive
+            in each per-host pool. (default: {10})
+
+        pool_block {bool} -- If `True`, requests wait for a free connection once
+            `pool_maxsize` is reached instead of opening a throwaway one. (default: {False})
+
+        keep_alive {bool} -- If `False`, every request asks the server to close
+            the connection once the response is read. (default: {True})
+
+        ### Returns:
+        ----
+        {requests.Session} -- The newly configured session.
+
+        ### Usage:
+        ----
+            >>> td_client.configure_session(pool_maxsize=32, pool_block=True)
+        """
+
+        self.config['pool_connections'] = pool_connections
+        self.config['pool_maxsize'] = pool_maxsize
+        self.config['pool_block'] = pool_block
+        self.config['keep_alive'] = keep_alive
+
+        self.close_session()
+
+        return self.request_session
+
+    @property
+    def request_session(self) -> requests.Session:
+        """Returns the pooled HTTP session, creating it if needed.
+
+        A session is never shared across processes, if the client was
+        forked a new session is created in the child process.
+
+        ### Returns:
+        ----
+        {requests.Session} -- The pooled session.
+        """
+
+        if self._request_session is None or self._request_session_pid != os.getpid():
+
+            # Mount an adapter with the configured pool sizes.
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=self.config['pool_connections'],
+                pool_maxsize=self.config['pool_maxsize'],
+                pool_block=self.config['pool_block']
+            )
+
+            request_session = requests.Session()
+            request_session.verify = True
+            request_session.mount('https://', adapter)
+            request_session.mount('http://', adapter)
+
+            if not self.config['keep_alive']:
+                request_session.headers['Connection'] = 'close'
+
+            self._request_session = request_session
+            self._request_session_pid = os.getpid()
+
+        return self._request_session
+
+    def close_session(self) -> None:
+        """Closes the pooled HTTP session and all of its connections."""
+
+        if self._request_session is not None and self._request_session_pid == os.getpid():
+            self._request_session.close()
+
+        self._request_session = None
+        self._request_session_pid = None
+
+    def configure_rate_limit(self, requests_per_minute: int = 120, burst: int = 10, enabled: bool = True,
+                             retries: int = 3) -> RequestScheduler:
+        """Configures the client-side rate limiter.
+
+        Every request first waits for a token from the `RequestScheduler`, with orders
+        served ahead of quotes and quotes ahead of history backfills. If the server
+        still answers with a 429, the bucket is emptied and the request is retried.
+
+        ### Arguments:
+        ----
+        requests_per_minute {int} -- The request quota of the API. (default: {120})
+
+        burst {int} -- The number of requests that can be sent back to back. (default: {10})
+
+        enabled {bool} -- If `False`, requests are sent right away and a 429
+            raises an `ExdLmtError`. (default: {True})
+
+        retries {int} -- The number of times a request that got a 429 is
+            retried before raising an `ExdLmtError`. (default: {3})
+
+        ### Returns:
+        ----
+        {RequestScheduler} -- The scheduler used by the client.
+
+        ### Usage:
+        ----
+            >>> td_client.configure_rate_limit(requests_per_minute=120, burst=5)
+            >>> td_client.request_scheduler.stats
+        """
+
+        self.config['rate_limit_enabled'] = enabled
+        self.config['rate_limit_retries'] = retries
+
+        self.request_scheduler = RequestScheduler(
+            requests_per_minute=requests_per_minute,
+            burst=burst,
+            multiprocessing_safe=self._multiprocessing_safe
+        )
+
+        return self.request_scheduler
+
+    def _request_lane(self, method: str, endpoint: str) -> str:
+        """Determines the scheduler lane of a request.
+
+        ### Arguments:
+        ----
+        method {str} -- The request method.
+
+        endpoint {str} -- The API URL endpoint.
+
+        ### Returns:
+        ----
+        {str} -- One of the lanes in `td.scheduler.PRIORITY_LANES`.
+        """
+
+        if 'orders' in endpoint:
+            return 'orders'
+        elif endpoint.endswith('pricehistory'):
+            return 'history'
+        elif endpoint == 'marketdata/quotes' or endpoint.endswith('/quotes'):
+            return 'quotes'
+        else:
+            return 'default'
+
     def _state_manager(self, action: str) -> None:
         """Manages the session state.
 
@@ -235,15 +423,14 @@ class TDClient():
             with open(file=self.credentials_path, mode='r') as json_file:
                 self.state.update(json.load(json_file))
                 if self._multiprocessing_safe:
-                    self._cached_state.update(self.state)
+                    self._token_store_version = self._token_store.write(state=self.state)
+
+            self._update_token_deadlines()
 
         # if they want to save it and have allowed for caching then load the file.
         elif action == 'save':     
             with open(file=self.credentials_path, mode='w+') as json_file:
-                if self._multiprocessing_safe:
-                    json.dump(obj=dict(self._cached_state), fp=json_file, indent=4)
-                else:
-                    json.dump(obj=self.state, fp=json_file, indent=4)
+                json.dump(obj=self.state, fp=json_file, indent=4)
 
     def login(self) -> bool:
         """Logs the user into the TD Ameritrade API.
@@ -297,8 +484,8 @@ class TDClient():
         }
 
         # Make the request.
-        response = requests.post(
-            url="https://api.tdameritrade.com/v1/oauth2/token",
+        response = self.request_session.post(
+            url=self._api_endpoint(endpoint=self.config['token_endpoint']),
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
             data=data
         )
@@ -334,8 +521,8 @@ class TDClient():
         }
 
         # Make the request.
-        response = requests.post(
-            url="https://api.tdameritrade.com/v1/oauth2/token",
+        response = self.request_session.post(
+            url=self._api_endpoint(endpoint=self.config['token_endpoint']),
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
             data=data
         )
@@ -421,8 +608,8 @@ class TDClient():
             data['access_type'] = 'offline'
 
         # Make the request.
-        response = requests.post(
-            url="https://api.tdameritrade.com/v1/oauth2/token",
+        response = self.request_session.post(
+            url=self._api_endpoint(endpoint=self.config['token_endpoint']),
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
             data=data
         )
@@ -439,6 +626,10 @@ class TDClient():
     def validate_token(self, already_updated_from_cache=False) -> bool:
         """Validates whether the tokens are valid or not.
 
+        The time each token needs refreshing at is kept as a monotonic deadline,
+        so while the tokens are fresh this is a single comparison. Otherwise the
+        tokens that are due are refreshed.
+
         ### Returns
         -------
         bool
@@ -446,64 +637,180 @@ class TDClient():
             the credentials file doesn't exist.
         """
 
-        if 'refresh_token_expires_at' in self.state and 'access_token_expires_at' in self.state:
-
-            # Grab the Expire Times.
-            refresh_token_exp = self.state['refresh_token_expires_at']
-            access_token_exp = self.state['access_token_expires_at']
-
-            refresh_token_ts = datetime.datetime.fromtimestamp(refresh_token_exp)
-            access_token_ts = datetime.datetime.fromtimestamp(access_token_exp)
-
-            # Grab the Expire Thresholds.
-            refresh_token_exp_threshold = refresh_token_ts - timedelta(days=2)
-            access_token_exp_threshold = access_token_ts - timedelta(minutes=5)
-
-            # Convert to Seconds.
-            refresh_token_exp_threshold = refresh_token_exp_threshold.timestamp()
-            access_token_exp_threshold = access_token_exp_threshold.timestamp()
-
-            # See if we need a new Refresh Token.
-            if datetime.datetime.now().timestamp() > refresh_token_exp_threshold:
-                if self._multiprocessing_safe and not already_updated_from_cache:
-                    # ONLY ONE PROCESS / THREAD CAN GET A NEW TOKEN AT THE SAME TIME! Update from cache then revalidate!
-                    # Only using the multiprocessing cache here prevents added latency checking cross process values
-                    #  except when the token has expired, which should only be once every 30 minutes. Better than making
-                    #  state a full MP dict.
-                    with self._multiprocessing_lock:
-                        self.state.update(dict(self._cached_state))
-                        self.validate_token(already_updated_from_cache=True)
-                else:
-                    print("Grabbing new refresh token...")
-                    self.grab_refresh_token()
-
-            # See if we need a new Access Token.
-            if datetime.datetime.now().timestamp() > access_token_exp_threshold:
-                if self._multiprocessing_safe and not already_updated_from_cache:
-                    # ONLY ONE PROCESS / THREAD CAN GET A NEW TOKEN AT THE SAME TIME! Update from cache then revalidate!
-                    # Only using the multiprocessing cache here prevents added latency checking cross process values
-                    #  except when the token has expired, which should only be once every 30 minutes. Better than making
-                    #  state a full MP dict.
-                    with self._multiprocessing_lock:
-                        self.state.update(dict(self._cached_state))
-                        self.validate_token(already_updated_from_cache=True)
-                else:
-                    print("Grabbing new access token...")
-                    self.grab_access_token()
-
+        if time.monotonic() < self._token_deadline:
             return True
 
-        else:
-            
-            pprint.pprint(
-                {
-                    "credential_path": str(self.credentials_path),
-                    "message": "The credential file does not contain expiration times for your tokens, please go through the oAuth process."
-                }
-            )
+        return self._refresh_tokens(already_updated_from_cache=already_updated_from_cache)
+
+    @property
+    def token_deadlines_known(self) -> bool:
+        """Returns `True` if the state has the expiration times of both tokens."""
+
+        return 'refresh_token_expires_at' in self.state and 'access_token_expires_at' in self.state
+
+    def _update_token_deadlines(self) -> None:
+        """Converts the token expiration times in the state to monotonic deadlines.
+
+        The expiration times are wall clock timestamps, the deadlines are on the
+        `time.monotonic` clock, so they don't move if the system clock does, and
+        they already have the refresh margins taken off.
+        """
+
+        if not self.token_deadlines_known:
+            self._access_token_deadline = -math.inf
+            self._refresh_token_deadline = -math.inf
+            self._token_deadline = -math.inf
+            return
+
+        offset = time.monotonic() - time.time()
+
+        self._access_token_deadline = self.state['access_token_expires_at'] - self.ACCESS_TOKEN_MARGIN + offset
+        self._refresh_token_deadline = self.state['refresh_token_expires_at'] - self.REFRESH_TOKEN_MARGIN + offset
+        self._token_deadline = min(self._access_token_deadline, self._refresh_token_deadline)
+
+    def _refresh_tokens(self, ahead: float = 0.0, already_updated_from_cache: bool = False) -> bool:
+        """Refreshes the tokens that are due.
+
+        ### Arguments:
+        ----
+        ahead {float} -- Refreshes the tokens that are due within this many
+            seconds, used by the `TokenRefresher`. (default: {0.0})
+
+        already_updated_from_cache {bool} -- `True` if the state was just pulled
+            from the token store. (default: {False})
+
+        ### Returns:
+        ----
+        {bool} -- `True` if the tokens were valid, `False` if the
+            credentials file doesn't have their expiration times.
+        """
 
+        # A lock inherited through a fork can be held by a refresher thread
+        # that doesn't exist in this process, so each process gets its own.
+        if self._token_lock_pid != os.getpid():
+            self._token_lock = threading.Lock()
+            self._token_lock_pid = os.getpid()
+
+        with self._token_lock:
+
+            # Pick up expiration times that were set on the state directly.
+            self._update_token_deadlines()
+
+            if not self.token_deadlines_known:
+
+                pprint.pprint(
+                    {
+                        "credential_path": str(self.credentials_path),
+                        "message": (
+                            "The credential file does not contain expiration times for your tokens, "
+                            "please go through the oAuth process."
+                        )
+                    }
+                )
+
+                return False
+
+            if time.monotonic() + ahead < self._token_deadline:
+                return True
+
+            if self._multiprocessing_safe and not already_updated_from_cache:
+
+                # Another process may have refreshed the tokens already, reading the store doesn't block.
+                if self._sync_token_store():
+                    self._update_token_deadlines()
+
+                    if time.monotonic() + ahead < self._token_deadline:
+                        return True
+
+                # ONLY ONE PROCESS / THREAD CAN GET A NEW TOKEN AT THE SAME TIME! Update from the store then revalidate!
+                with self._multiprocessing_lock:
+                    self._sync_token_store()
+                    self._update_token_deadlines()
+                    return self._grab_due_tokens(ahead=ahead)
+
+            return self._grab_due_tokens(ahead=ahead)
+
+    def _sync_token_store(self) -> bool:
+        """Pulls the tokens another process saved in the token store.
+
+        ### Returns:
+        ----
+        {bool} -- `True` if the store had a newer state.
+        """
+
+        version, state = self._token_store.read(since=self._token_store_version)
+
+        if state is None:
             return False
 
+        self.state.update(state)
+        self._token_store_version = version
+
+        return True
+
+    def _grab_due_tokens(self, ahead: float = 0.0) -> bool:
+        """Grabs a new refresh token and a new access token, if they are due.
+
+        ### Arguments:
+        ----
+        ahead {float} -- Grabs the tokens that are due within this many seconds. (default: {0.0})
+
+        ### Returns:
+        ----
+        {bool} -- Always `True`.
+        """
+
+        # See if we need a new Refresh Token, it comes with a new Access Token.
+        if time.monotonic() + ahead > self._refresh_token_deadline:
+            print("Grabbing new refresh token...")
+            self.grab_refresh_token()
+
+        # See if we need a new Access Token.
+        if time.monotonic() + ahead > self._access_token_deadline:
+            print("Grabbing new access token...")
+            self.grab_access_token()
+
+        return True
+
+    def start_token_refresher(self, lead_time: float = 600.0, retry_delay: float = 30.0) -> TokenRefresher:
+        """Refreshes the tokens in a thread, before requests need them.
+
+        ### Arguments:
+        ----
+        lead_time {float} -- The number of seconds before a token is due
+            that it gets refreshed. (default: {600.0})
+
+        retry_delay {float} -- The number of seconds to wait after a refresh
+            that didn't go through. (default: {30.0})
+
+        ### Returns:
+        ----
+        {TokenRefresher} -- The refresher, see `TokenRefresher.refreshes` and `TokenRefresher.errors`.
+
+        ### Usage:
+        ----
+            >>> td_client.login()
+            >>> td_client.start_token_refresher()
+            >>> td_client.get_quotes(instruments=['MSFT'])
+        """
+
+        self.stop_token_refresher()
+
+        self.token_refresher = TokenRefresher(
+            td_client=self,
+            lead_time=lead_time,
+            retry_delay=retry_delay
+        )
+
+        return self.token_refresher
+
+    def stop_token_refresher(self) -> None:
+        """Stops the token refresher, tokens are refreshed inline again."""
+
+        if self.token_refresher is not None:
+            self.token_refresher.stop()
+            self.token_refresher = None
+
     def _silent_sso(self) -> bool:
         """
         Overview:
@@ -564,13 +871,17 @@ class TDClient():
 
         self.state['logged_in'] = True
         if self._multiprocessing_safe:
-            self._cached_state.update(self.state)
+            self._token_store_version = self._token_store.write(state=self.state)
         self._state_manager('save')
+        self._update_token_deadlines()
+
+        if self.token_refresher is not None:
+            self.token_refresher.wake()
 
         return self.state
 
     def _make_request(self, method: str, endpoint: str, mode: str = None, params: dict = None, data: dict = None, json:dict = None, 
-                        order_details: bool = False) -> Any:
+                        order_details: bool = False, parser: Callable[[bytes], Any] = None) -> Any:
         """Handles all the requests in the library.
 
         A central function used to handle all the requests made in the library,
@@ -593,6 +904,9 @@ class TDClient():
 
         json: A json data payload for a request
 
+        parser: A function that decodes the raw response
+            body, used instead of `json` if provided.
+
         ### Returns:
         ----
         A Dictionary object containing the JSON values.            
@@ -604,24 +918,41 @@ class TDClient():
         self.validate_token()
         headers = self._headers(mode=mode)
 
-        # Define a new session.
-        request_session = requests.Session()
-        request_session.verify = True
+        # Grab the pooled session, so the connection is reused.
+        request_session = self.request_session
 
         # Define a new request.
-        request_request = requests.Request(
-            method=method.upper(),
-            headers=headers,
-            url=url,
-            params=params,
-            data=data,
-            json=json
-        ).prepare()
-        
-        # Send the request.
-        response: requests.Response = request_session.send(request=request_request)
+        request_request = request_session.prepare_request(
+            requests.Request(
+                method=method.upper(),
+                headers=headers,
+                url=url,
+                params=params,
+                data=data,
+                json=json
+            )
+        )
 
-        request_session.close()
+        lane = self._request_lane(method=method, endpoint=endpoint)
+        retries = 0
+
+        while True:
+
+            # Wait for our turn, so we stay under the quota.
+            if self.config['rate_limit_enabled']:
+                self.request_scheduler.acquire(lane=lane)
+
+            # Send the request.
+            response: requests.Response = request_session.send(request=request_request)
+
+            # If we still got throttled, back off and try again.
+            can_retry = self.config['rate_limit_enabled'] and retries < self.config['rate_limit_retries']
+
+            if response.status_code == 429 and can_retry:
+                self.request_scheduler.penalize(retry_after=response.headers.get('Retry-After'))
+                retries += 1
+            else:
+                break
 
         # grab the status code
         status_code = response.status_code
@@ -630,10 +961,7 @@ class TDClient():
         response_headers = response.headers
 
         # Grab the order id, if it exists.
-        if 'Location' in response_headers:            
-            order_id = response_headers['Location'].split('orders/')[1]
-        else:
-            order_id = ''
+        order_id = self._grab_order_id(headers=response_headers)
 
         # If it's okay and we need details, then add them.
         if response.ok and order_details:
@@ -649,29 +977,81 @@ class TDClient():
 
             return response_dict
 
-        # If it's okay and no details.
+        # If it's okay, decode the body.
         elif response.ok:
-            return response.json()
+            return self._parse_response(response=response, parser=parser)
+
+        else:
+            self._handle_error_response(status_code=status_code, message=response.text)
+
+    def _parse_response(self, response: requests.Response, parser: Callable[[bytes], Any] = None) -> Any:
+        """Decodes the body of a successful response.
+
+        ### Arguments:
+        ----
+        response {requests.Response} -- The response.
+
+        parser {Callable[[bytes], Any]} -- A function that decodes the raw
+            body, used instead of `json` if provided. (default: {None})
+
+        ### Returns:
+        ----
+        {Any} -- The decoded body.
+        """
+
+        # If we have our own parser, hand it the raw body.
+        if parser:
+            return parser(response.content)
+
+        return response.json()
+
+    def _grab_order_id(self, headers: dict) -> str:
+        """Grabs the order id from the `Location` header of a response.
+
+        ### Arguments:
+        ----
+        headers {dict} -- The response headers.
 
+        ### Returns:
+        ----
+        {str} -- The order id, or an empty string if there isn't one.
+        """
+
+        if 'Location' in headers:
+            return headers['Location'].split('orders/')[1]
         else:
+            return ''
+
+    def _handle_error_response(self, status_code: int, message: str) -> None:
+        """Maps an unsuccessful response to the matching exception.
+
+        An expired token (401) triggers an access token refresh instead,
+        all other error codes raise one of the errors in `td.exceptions`.
+
+        ### Arguments:
+        ----
+        status_code {int} -- The HTTP status code of the response.
+
+        message {str} -- The response text.
+        """
 
-            if response.status_code == 400:
-                raise NotNulError(message=response.text)
-            elif response.status_code == 401:
-                try:
-                    self.grab_access_token()
-                except:
-                    raise TknExpError(message=response.text)
-            elif response.status_code == 403:
-                raise ForbidError(message=response.text)
-            elif response.status_code == 404:
-                raise NotFndError(message=response.text)
-            elif response.status_code == 429:
-                raise ExdLmtError(message=response.text)
-            elif response.status_code == 500 or response.status_code == 503:
-                raise ServerError(message=response.text)
-            elif response.status_code > 400:
-                raise GeneralError(message=response.text)
+        if status_code == 400:
+            raise NotNulError(message=message)
+        elif status_code == 401:
+            try:
+                self.grab_access_token()
+            except:
+                raise TknExpError(message=message)
+        elif status_code == 403:
+            raise ForbidError(message=message)
+        elif status_code == 404:
+            raise NotFndError(message=message)
+        elif status_code == 429:
+            raise ExdLmtError(message=message)
+        elif status_code == 500 or status_code == 503:
+            raise ServerError(message=message)
+        elif status_code > 400:
+            raise GeneralError(message=message)
 
     def _validate_arguments(self, endpoint: str, parameter_name: str, parameter_argument: List[str]) -> bool:
         """Validates arguments for an API call.
@@ -758,7 +1138,9 @@ class TDClient():
 
         Serves as the mechanism to make a request to the Get Quote and Get Quotes Endpoint.
         If one item is provided a Get Quote request will be made and if more than one item
-        is provided then a Get Quotes request will be made.
+        is provided then a Get Quotes request will be made. If quote caching is enabled, only
+        the symbols missing from the cache are requested, and if quote batching is enabled,
+        concurrent calls are merged into a single request.
 
         ### Documentation:
         ----
@@ -774,6 +1156,41 @@ class TDClient():
             >>> td_client.get_quotes(instruments=['MSFT','SQ'])
 
         """
+
+        if self.quote_cache is None:
+            return self._request_quotes(instruments=instruments)
+
+        # Only request the symbols that aren't fresh in the cache.
+        quotes, missing = self.quote_cache.get_many(symbols=instruments)
+
+        if missing:
+            missing_quotes = self._request_quotes(instruments=missing)
+            self.quote_cache.put_many(quotes=missing_quotes)
+            quotes.update(missing_quotes)
+
+        return quotes
+
+    def _request_quotes(self, instruments: List) -> Dict:
+        """Requests quotes, through the quote batcher if it's enabled.
+
+        ### Arguments:
+        ----
+        instruments: A list of different financial instruments.
+        """
+
+        if self.quote_batcher is not None:
+            return self.quote_batcher.get_quotes(instruments=instruments)
+
+        return self._fetch_quotes(instruments=instruments)
+
+    def _fetch_quotes(self, instruments: List) -> Dict:
+        """Makes a single Get Quotes request.
+
+        ### Arguments:
+        ----
+        instruments: A list of different financial instruments.
+        """
+
         # because we have a list argument, prep it for the request.
         instruments = self._prepare_arguments_list(
             parameter_list=instruments
@@ -791,8 +1208,82 @@ class TDClient():
         # return the response of the get request.
         return self._make_request(method='get', endpoint=endpoint, params=params)
 
+    def enable_quote_batching(self, window: float = 0.005, max_symbols: int = 300, max_length: int = 2000) -> QuoteBatcher:
+        """Merges concurrent `get_quotes` calls into a single request.
+
+        Calls made from different threads within `window` seconds of each other
+        share one request, chunked to stay under the symbol and URL length limits.
+        Every caller only gets back the quotes for its own symbols.
+
+        ### Arguments:
+        ----
+        window {float} -- The number of seconds a batch stays open for other
+            callers. (default: {0.005})
+
+        max_symbols {int} -- The maximum number of symbols in a single request. (default: {300})
+
+        max_length {int} -- The maximum length of the comma separated symbol
+            list in a single request. (default: {2000})
+
+        ### Returns:
+        ----
+        {QuoteBatcher} -- The batcher used by the client.
+
+        ### Usage:
+        ----
+            >>> td_client.enable_quote_batching(window=0.01)
+            >>> td_client.get_quotes(instruments=['MSFT'])
+            >>> td_client.quote_batcher.stats
+        """
+
+        self.quote_batcher = self._quote_batcher_class(
+            fetch_quotes=self._fetch_quotes,
+            window=window,
+            max_symbols=max_symbols,
+            max_length=max_length
+        )
+
+        return self.quote_batcher
+
+    def disable_quote_batching(self) -> None:
+        """Sends every `get_quotes` call as its own request again."""
+
+        self.quote_batcher = None
+
+    def enable_quote_cache(self, ttl: float = 1.0) -> QuoteCache:
+        """Serves `get_quotes` from an in-memory cache.
+
+        Quotes are kept for `ttl` seconds. Streaming sessions created afterwards
+        with `create_streaming_session` feed the cache, so symbols with an active
+        `level_one_quotes` subscription are always fresh and never requested.
+
+        ### Arguments:
+        ----
+        ttl {float} -- The number of seconds a quote stays fresh. (default: {1.0})
+
+        ### Returns:
+        ----
+        {QuoteCache} -- The cache used by the client.
+
+        ### Usage:
+        ----
+            >>> td_client.enable_quote_cache(ttl=0.5)
+            >>> td_client.get_quotes(instruments=['MSFT'])
+            >>> td_client.quote_cache.stats
+        """
+
+        self.quote_cache = QuoteCache(ttl=ttl)
+
+        return self.quote_cache
+
+    def disable_quote_cache(self) -> None:
+        """Sends every `get_quotes` call to the API again."""
+
+        self.quote_cache = None
+
     def get_price_history(self, symbol: str, period_type:str = None, period: str = None, start_date:str = None, end_date:str = None,
-                          frequency_type: str = None, frequency: str = None, extended_hours: bool = True) -> Dict:
+                          frequency_type: str = None, frequency: str = None, extended_hours: bool = True,
+                          columnar: bool = False) -> Union[Dict, Candles]:
         """Gets historical candle data for a financial instrument.
         
         ### Documentation:
@@ -824,6 +1315,10 @@ class TDClient():
         extended_hours: True to return extended hours 
             data, false for regular market hours only.
             Default is true
+
+        columnar: True to return the candles as a `Candles`
+            object, decoded straight from the response body
+            into one array per field. Default is false.
         """
 
         # Fail early, can't have a period with start and end date specified.
@@ -858,6 +1353,10 @@ class TDClient():
         # define the endpoint
         endpoint = 'marketdata/{}/pricehistory'.format(symbol)
 
+        # Skip the list of dictionaries, and decode the columns directly.
+        if columnar:
+            return self._make_request(method='get', endpoint=endpoint, params=params, parser=Candles.from_json)
+
         # return the response of the get request.
         return self._make_request(method='get', endpoint=endpoint, params=params)
 
@@ -2148,6 +2647,22 @@ class TDClient():
             fields=['streamerConnectionInfo','streamerSubscriptionKeys','preferences','surrogateIds']
         )
 
+        return self._build_streaming_session(user_principals=userPrincipalsResponse)
+
+    def _build_streaming_session(self, user_principals: dict) -> TDStreamerClient:
+        """Builds the streaming credentials and a new `TDStreamerClient`.
+
+        ### Arguments:
+        ----
+        user_principals {dict} -- The response of the `get_user_principals` endpoint,
+            including the streamer connection info and subscription keys.
+
+        ### Returns:
+        ----
+        TDStreamerClient -- A new instance of a Stream Client.
+        """
+
+        userPrincipalsResponse = user_principals
 
         # Grab the timestampe.
         tokenTimeStamp = userPrincipalsResponse['streamerInfo']['tokenTimestamp']
@@ -2182,4 +2697,8 @@ class TDClient():
             credentials=credentials
         )
 
+        # Let the stream keep the quote cache fresh.
+        if self.quote_cache is not None:
+            streaming_session.attach_quote_cache(quote_cache=self.quote_cache)
+
         return streaming_session
@@ -0,0 +1,330 @@
+import asyncio
+import itertools
+
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Tuple
+
+
+# How a full queue makes room for a new item.
+OVERFLOW_POLICIES = ['block', 'drop_oldest', 'coalesce']
+
+# Level one services only send the fields that changed, so messages can be merged.
+COALESCED_SERVICES = {
+    'QUOTE',
+    'OPTION',
+    'LEVELONE_FUTURES',
+    'LEVELONE_FOREX',
+    'LEVELONE_FUTURES_OPTIONS'
+}
+
+
+class StreamQueue():
+
+    """
+    A bounded `asyncio` queue used between the stages of the stream.
+
+    When the queue is full, a new item either waits for room (`block`), pushes
+    out the oldest item (`drop_oldest`) or, with `coalesce`, is merged into the
+    queued item with the same key. Items without a key, or without a queued
+    item to merge into, push out the oldest item when coalescing. A merged item
+    keeps the place of the queued one, so its newer values come out ahead of
+    the items queued after it. With `always_merge`, items are merged whenever
+    their key is queued, whether or not the queue is full.
+    """
+
+    def __init__(self, maxsize: int = 1000, overflow: str = 'block', key: Callable[[Any], Hashable] = None,
+                 merge: Callable[[Any, Any], Any] = None, always_merge: bool = False) -> None:
+        """Initalizes the `StreamQueue`.
+
+        Keyword Arguments:
+        ----
+        maxsize {int} -- The maximum number of queued items. (default: {1000})
+
+        overflow {str} -- What to do when the queue is full, one of `block`,
+            `drop_oldest` or `coalesce`. (default: {'block'})
+
+        key {Callable[[Any], Hashable]} -- Returns the coalescing key of an item, or
+            `None` if it can't be coalesced. Required by `coalesce`. (default: {None})
+
+        merge {Callable[[Any, Any], Any]} -- Merges a new item into the queued one with
+            the same key and returns the result. Required by `coalesce`. (default: {None})
+
+        always_merge {bool} -- `True` to merge an item with a queued key even when
+            there's room, so each key is queued at most once. (default: {False})
+        """
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy, please choose a valid one: {}'.format(', '.join(OVERFLOW_POLICIES)))
+
+        if overflow == 'coalesce' and (key is None or merge is None):
+            raise ValueError('The coalesce policy needs a key and a merge function.')
+
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.key = key
+        self.merge = merge
+        self.always_merge = always_merge
+
+        # Items are queued with their key under a running number, `_keys` points each
+        # coalescing key to its newest queued item, the only one still open to merges.
+        self._items = OrderedDict()
+        self._keys = {}
+        self._counter = itertools.count()
+        # Created by the first `put` or `get`, an event made outside the running
+        # loop is bound to another loop before Python 3.10.
+        self._not_empty: asyncio.Event = None
+        self._not_full: asyncio.Event = None
+        self._closed = False
+
+        self._received = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._max_depth = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def closed(self) -> bool:
+        """Returns `True` once the queue was closed."""
+
+        return self._closed
+
+    def full(self) -> bool:
+        """Returns `True` if there is no room for a new item."""
+
+        return len(self._items) >= self.maxsize
+
+    async def put(self, item: Any) -> None:
+        """Adds an item, applying the overflow policy if the queue is full.
+
+        Arguments:
+        ----
+        item {Any} -- The item to add.
+        """
+
+        if self._closed:
+            return
+
+        self._received += 1
+
+        item_key = self.key(item) if self.overflow == 'coalesce' else None
+
+        if item_key in self._keys and (self.always_merge or self.full()):
+            position = self._keys[item_key]
+            self._items[position] = (item_key, self.merge(self._items[position][1], item))
+            self._coalesced += 1
+            return
+
+        if self.overflow == 'block':
+            while self.full() and not self._closed:
+                not_full = self._events()[1]
+                not_full.clear()
+                await not_full.wait()
+
+            # The queue was closed while we waited, the item goes nowhere.
+            if self._closed:
+                return
+        elif self.full():
+            self._pop()
+            self._dropped += 1
+
+        position = next(self._counter)
+        self._items[position] = (item_key, item)
+
+        if item_key is not None:
+            self._keys[item_key] = position
+
+        self._max_depth = max(self._max_depth, len(self._items))
+
+        if self._not_empty is not None:
+            self._not_empty.set()
+
+    async def get(self) -> Any:
+        """Removes and returns the oldest item, waiting for one if needed.
+
+        Returns:
+        ----
+        Any -- The oldest item, or `None` once the queue is closed and empty.
+        """
+
+        while not self._items:
+
+            if self._closed:
+                return None
+
+            not_empty = self._events()[0]
+            not_empty.clear()
+            await not_empty.wait()
+
+        item = self._pop()
+
+        if self._not_full is not None:
+            self._not_full.set()
+
+        return item
+
+    def close(self) -> None:
+        """Closes the queue, readers get `None` once it's empty."""
+
+        self._closed = True
+
+        if self._not_empty is not None:
+            self._not_empty.set()
+            self._not_full.set()
+
+    def _pop(self) -> Any:
+        """Removes and returns the oldest item, forgetting its coalescing key."""
+
+        position, (item_key, item) = self._items.popitem(last=False)
+
+        if item_key is not None and self._keys[item_key] == position:
+            del self._keys[item_key]
+
+        return item
+
+    def _events(self) -> Tuple[asyncio.Event, asyncio.Event]:
+        """Returns the `not empty` and `not full` events, creating them in the running loop."""
+
+        if self._not_empty is None:
+            self._not_empty = asyncio.Event()
+            self._not_full = asyncio.Event()
+
+        return self._not_empty, self._not_full
+
+    @property
+    def stats(self) -> dict:
+        """Returns the queue counters.
+
+        Returns:
+        ----
+        dict -- The current and maximum queue depth, the maximum size, and the
+            number of items received, dropped and coalesced.
+        """
+
+        return {
+            'depth': len(self._items),
+            'max_depth': self._max_depth,
+            'maxsize': self.maxsize,
+            'received': self._received,
+            'dropped': self._dropped,
+            'coalesced': self._coalesced
+        }
+
+
+def message_key(message: dict) -> Hashable:
+    """Returns the coalescing key of a decoded stream message.
+
+    Only data messages made of level one services can be coalesced, their
+    key is the list of services they hold.
+
+    Arguments:
+    ----
+    message {dict} -- A decoded stream message.
+
+    Returns:
+    ----
+    Hashable -- The key, or `None` if the message can't be coalesced.
+    """
+
+    if len(message) != 1 or 'data' not in message:
+        return None
+
+    services = tuple(service_result.get('service') for service_result in message['data'])
+
+    if not all(service in COALESCED_SERVICES for service in services):
+        return None
+
+    return services
+
+
+def merge_messages(queued_message: dict, new_message: dict) -> dict:
+    """Merges a level one data message into a queued one.
+
+    The fields of each symbol are updated in place, so the merged message
+    holds the latest value of every field that changed in either message.
+
+    Arguments:
+    ----
+    queued_message {dict} -- The message waiting in the queue.
+
+    new_message {dict} -- The message that just came in.
+
+    Returns:
+    ----
+    dict -- The merged message.
+    """
+
+    for queued_result, new_result in zip(queued_message['data'], new_message['data']):
+
+        queued_content = {content['key']: content for content in queued_result['content']}
+
+        for content in new_result['content']:
+            if content['key'] in queued_content:
+                queued_content[content['key']].update(content)
+            else:
+                queued_result['content'].append(content)
+
+        queued_result['timestamp'] = new_result.get('timestamp')
+
+    return queued_message
+
+
+def symbol_key(item: Any) -> Hashable:
+    """Returns the conflation key of a subscriber item, its service and symbol.
+
+    Arguments:
+    ----
+    item {Any} -- A record, or a service section or data message holding a
+        single content entry.
+
+    Returns:
+    ----
+    Hashable -- The key, or `None` if the item can't be conflated.
+    """
+
+    # Records are read for a single service.
+    if isinstance(item, tuple):
+        return item.symbol
+
+    if 'data' in item:
+        if len(item) != 1 or len(item['data']) != 1:
+            return None
+        item = item['data'][0]
+
+    content = item.get('content')
+
+    if not isinstance(content, list) or len(content) != 1:
+        return None
+
+    return item.get('service'), content[0].get('key')
+
+
+def merge_symbol_items(queued_item: Any, new_item: Any) -> Any:
+    """Merges a subscriber item into the queued one of the same symbol.
+
+    Fields the new item doesn't carry keep their queued value, so the result
+    is the latest state of the symbol. A new item is returned, the items can
+    be shared with other subscribers so they're never changed.
+
+    Arguments:
+    ----
+    queued_item {Any} -- The item waiting in the queue.
+
+    new_item {Any} -- The item that just came in.
+
+    Returns:
+    ----
+    Any -- The merged item.
+    """
+
+    if isinstance(new_item, tuple):
+        return queued_item._replace(**{field: value for field, value in zip(new_item._fields, new_item) if value is not None})
+
+    if 'data' in new_item:
+        return {'data': [merge_symbol_items(queued_item['data'][0], new_item['data'][0])]}
+
+    return dict(new_item, content=[dict(queued_item['content'][0], **new_item['content'][0])])
@@ -1002,3 +1002,56 @@ CSV_FIELD_KEYS_LEVEL_2 = {
     "LISTED_BOOK": "nested",
     "FUTURES_BOOK": "nested"
 }
+
+# Maps the LEVELONE_QUOTES stream fields to the keys of a `get_quotes` response.
+LEVEL_ONE_QUOTE_REST_KEYS = {
+    "key": "symbol",
+    "delayed": "delayed",
+    "assetMainType": "assetMainType",
+    "cusip": "cusip",
+    "1": "bidPrice",
+    "2": "askPrice",
+    "3": "lastPrice",
+    "4": "bidSize",
+    "5": "askSize",
+    "6": "askId",
+    "7": "bidId",
+    "8": "totalVolume",
+    "9": "lastSize",
+    "10": "tradeTime",
+    "11": "quoteTime",
+    "12": "highPrice",
+    "13": "lowPrice",
+    "14": "bidTick",
+    "15": "closePrice",
+    "16": "exchange",
+    "17": "marginable",
+    "18": "shortable",
+    "24": "volatility",
+    "25": "description",
+    "26": "lastId",
+    "27": "digits",
+    "28": "openPrice",
+    "29": "netChange",
+    "30": "52WkHigh",
+    "31": "52WkLow",
+    "32": "peRatio",
+    "33": "divAmount",
+    "34": "divYield",
+    "37": "nAV",
+    "38": "fundPrice",
+    "39": "exchangeName",
+    "40": "divDate",
+    "41": "regularMarketQuote",
+    "42": "regularMarketTrade",
+    "43": "regularMarketLastPrice",
+    "44": "regularMarketLastSize",
+    "45": "regularMarketTradeTime",
+    "46": "regularMarketTradeDay",
+    "47": "regularMarketNetChange",
+    "48": "securityStatus",
+    "49": "mark",
+    "50": "quoteTimeInLong",
+    "51": "tradeTimeInLong",
+    "52": "regularMarketTradeTimeInLong"
+}
@@ -0,0 +1,264 @@
+import asyncio
+import concurrent.futures
+
+from collections import namedtuple
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+
+# The sections of a message that aren't service data.
+MESSAGE_KINDS = ['response', 'notify', 'gap']
+
+# Registers a handler for the data of every service.
+ALL_SERVICES = '*'
+
+Handler = namedtuple('Handler', ['service', 'symbols', 'callback', 'is_async', 'offload'])
+
+
+class HandlerRegistry():
+
+    """
+    Hands the messages of a stream to the functions registered for them.
+
+    Handlers are registered per service, and optionally per symbol, the lookups
+    are built when a handler is added or removed, so dispatching a message is a
+    dictionary lookup per service. Handlers can be plain functions or coroutines,
+    and plain functions can be offloaded to a thread pool, so a slow one never
+    holds up the stream.
+    """
+
+    def __init__(self, max_workers: int = 4) -> None:
+        """Initalizes the `HandlerRegistry`.
+
+        Keyword Arguments:
+        ----
+        max_workers {int} -- The number of threads running the offloaded
+            handlers. (default: {4})
+        """
+
+        self.max_workers = max_workers
+        self.handlers: List[Handler] = []
+
+        # service -> handlers, and (service, symbol) -> handlers.
+        self._service_handlers: Dict[str, Tuple[Handler, ...]] = {}
+        self._symbol_handlers: Dict[Tuple[str, str], Tuple[Handler, ...]] = {}
+        self._symbol_services = frozenset()
+        self._every_service: Tuple[Handler, ...] = ()
+
+        self._executor: concurrent.futures.ThreadPoolExecutor = None
+        self._pending = set()
+
+        self._dispatched = 0
+        self._offloaded = 0
+        self._errors = 0
+        self.error: Exception = None
+
+    def __len__(self) -> int:
+        return len(self.handlers)
+
+    def register(self, service: str, callback: Callable, symbols: Iterable[str] = None, offload: bool = False) -> Handler:
+        """Registers a function for the messages of a service.
+
+        Arguments:
+        ----
+        service {str} -- The service, for example `QUOTE`, `*` for every
+            service, or one of `response`, `notify` or `gap`.
+
+        callback {Callable} -- A function or a coroutine, called with each
+            service section of a data message, `{'service', 'timestamp', 'command', 'content'}`,
+            or with each entry of the `response` and `notify` sections, or with the gap.
+
+        Keyword Arguments:
+        ----
+        symbols {Iterable[str]} -- Only call the handler for these symbols, the
+            content it gets only holds their entries. (default: {None})
+
+        offload {bool} -- `True` to run the handler in the thread pool, without
+            waiting for it. Offloaded calls can run at the same time. (default: {False})
+
+        Returns:
+        ----
+        Handler -- The handler, used to remove it.
+        """
+
+        is_async = asyncio.iscoroutinefunction(callback)
+
+        if offload and is_async:
+            raise ValueError('Only plain functions can be offloaded, coroutines already run on the loop.')
+
+        if symbols is not None and (service in MESSAGE_KINDS or service == ALL_SERVICES):
+            raise ValueError('Symbols can only be given for a single service.')
+
+        handler = Handler(
+            service=service,
+            symbols=frozenset(symbols) if symbols is not None else None,
+            callback=callback,
+            is_async=is_async,
+            offload=offload
+        )
+
+        self.handlers.append(handler)
+        self._build()
+
+        return handler
+
+    def remove(self, handler: Handler) -> None:
+        """Removes a handler.
+
+        Arguments:
+        ----
+        handler {Handler} -- The handler returned by `register`.
+        """
+
+        self.handlers = [other for other in self.handlers if other is not handler]
+        self._build()
+
+    def _build(self) -> None:
+        """Builds the lookups of the handlers."""
+
+        service_handlers = {}
+        symbol_handlers = {}
+
+        for handler in self.handlers:
+            if handler.symbols is None:
+                service_handlers.setdefault(handler.service, []).append(handler)
+            else:
+                for symbol in handler.symbols:
+                    symbol_handlers.setdefault((handler.service, symbol), []).append(handler)
+
+        # The handlers of every service are added to each one, and used for the others.
+        every_service = tuple(service_handlers.pop(ALL_SERVICES, ()))
+
+        self._service_handlers = {
+            service: tuple(handlers) + (every_service if service not in MESSAGE_KINDS else ())
+            for service, handlers in service_handlers.items()
+        }
+        self._every_service = every_service
+        self._symbol_handlers = {key: tuple(handlers) for key, handlers in symbol_handlers.items()}
+        self._symbol_services = frozenset(service for service, _ in symbol_handlers)
+
+    async def dispatch(self, message: dict) -> None:
+        """Hands a decoded stream message to its handlers.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        service_handlers = self._service_handlers
+        every_service = self._every_service
+
+        for section in ('data', 'snapshot'):
+            for service_result in message.get(section, ()):
+
+                service = service_result.get('service')
+
+                for handler in service_handlers.get(service, every_service):
+                    await self._call(handler=handler, argument=service_result)
+
+                if service in self._symbol_services:
+                    await self._dispatch_symbols(service=service, service_result=service_result)
+
+        for kind in ('response', 'notify'):
+            if kind in message:
+                for handler in service_handlers.get(kind, ()):
+                    for entry in message[kind]:
+                        await self._call(handler=handler, argument=entry)
+
+        if 'gap' in message:
+            for handler in service_handlers.get('gap', ()):
+                await self._call(handler=handler, argument=message['gap'])
+
+    async def _dispatch_symbols(self, service: str, service_result: dict) -> None:
+        """Hands the entries of a service section to the handlers of their symbols."""
+
+        symbol_handlers = self._symbol_handlers
+
+        # handler -> its entries, a handler of several symbols is only called once.
+        entries: Dict[int, Tuple[Handler, list]] = {}
+
+        for content_entry in service_result.get('content', ()):
+            for handler in symbol_handlers.get((service, content_entry.get('key')), ()):
+                entries.setdefault(id(handler), (handler, []))[1].append(content_entry)
+
+        for handler, content in entries.values():
+            await self._call(handler=handler, argument=dict(service_result, content=content))
+
+    async def _call(self, handler: Handler, argument: object) -> None:
+        """Calls a handler, on the loop or in the thread pool.
+
+        An error raised by the handler is kept, like the ones of the offloaded
+        calls, and the message still goes to the other handlers.
+        """
+
+        self._dispatched += 1
+
+        try:
+            if handler.is_async:
+                await handler.callback(argument)
+            elif handler.offload:
+                self._offload(handler=handler, argument=argument)
+            else:
+                handler.callback(argument)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            self._errors += 1
+            self.error = error
+
+    def _offload(self, handler: Handler, argument: object) -> None:
+        """Runs a handler in the thread pool, without waiting for it."""
+
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='TDHandler'
+            )
+
+        future = self._executor.submit(handler.callback, argument)
+
+        self._offloaded += 1
+        self._pending.add(future)
+        future.add_done_callback(self._offload_done)
+
+    def _offload_done(self, future: concurrent.futures.Future) -> None:
+        """Keeps the error of an offloaded handler."""
+
+        self._pending.discard(future)
+
+        if not future.cancelled() and future.exception() is not None:
+            self._errors += 1
+            self.error = future.exception()
+
+    @property
+    def stats(self) -> dict:
+        """Returns the registry counters.
+
+        Returns:
+        ----
+        dict -- The number of handler calls, the calls offloaded, the ones
+            still running in the thread pool, and the calls that failed.
+        """
+
+        return {
+            'handlers': len(self.handlers),
+            'dispatched': self._dispatched,
+            'offloaded': self._offloaded,
+            'pending': len(self._pending),
+            'errors': self._errors
+        }
+
+    def close(self, wait: bool = True) -> None:
+        """Stops the thread pool.
+
+        Keyword Arguments:
+        ----
+        wait {bool} -- `True` to wait for the offloaded calls. (default: {True})
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
@@ -0,0 +1,443 @@
+import datetime
+import json
+import os
+import pathlib
+import threading
+import time
+import urllib.parse
+
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from td.utils import TDUtilities
+from td.client import TDClient
+from td.candles import Candles
+from td.candles import CANDLE_COLUMNS
+from td.exceptions import TknExpError
+from td.exceptions import NotNulError
+from td.exceptions import ForbidError
+from td.exceptions import NotFndError
+
+
+# The `periodType` sent along with each `frequencyType`.
+DEFAULT_PERIOD_TYPES = {
+    'minute': 'day',
+    'daily': 'year',
+    'weekly': 'year',
+    'monthly': 'year'
+}
+
+
+class CandleCache():
+
+    """
+    An on-disk, columnar cache of price history candles.
+
+    Candles are stored per (symbol, frequency) with one binary file per column,
+    along with the date ranges that were already downloaded. A later request for
+    an overlapping range only needs to download the gaps.
+    """
+
+    def __init__(self, cache_directory: Union[str, pathlib.Path]) -> None:
+        """Initalizes the `CandleCache`.
+
+        Arguments:
+        ----
+        cache_directory {Union[str, pathlib.Path]} -- The directory the candles are stored in.
+        """
+
+        self.cache_directory = pathlib.Path(cache_directory)
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+
+    def _series_path(self, symbol: str, frequency_type: str, frequency: int, extended_hours: bool) -> pathlib.Path:
+        """Returns the directory of a candle series."""
+
+        series_name = '{frequency_type}_{frequency}_{hours}'.format(
+            frequency_type=frequency_type,
+            frequency=frequency,
+            hours='extended' if extended_hours else 'regular'
+        )
+
+        # Symbols like `/ES` or `$SPX.X` need to be escaped.
+        return self.cache_directory.joinpath(urllib.parse.quote(symbol, safe=''), series_name)
+
+    def load(self, symbol: str, frequency_type: str, frequency: int,
+             extended_hours: bool) -> Tuple[Dict[str, array], List[List[int]]]:
+        """Loads a candle series from disk.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        frequency_type {str} -- The frequency type of the candles.
+
+        frequency {int} -- The frequency of the candles.
+
+        extended_hours {bool} -- Whether the candles include extended hours.
+
+        Returns:
+        ----
+        Tuple[Dict[str, array], List[List[int]]] -- The candle columns, and the date
+            ranges, in milliseconds since epoch, that were already downloaded.
+        """
+
+        series_path = self._series_path(symbol, frequency_type, frequency, extended_hours)
+        coverage_path = series_path.joinpath('coverage.json')
+
+        columns = {name: array(typecode) for name, typecode in CANDLE_COLUMNS.items()}
+
+        if not coverage_path.exists():
+            return columns, []
+
+        with open(file=coverage_path, mode='r') as coverage_file:
+            coverage = json.load(coverage_file)
+
+        for name, column in columns.items():
+            column_path = series_path.joinpath(name + '.bin')
+            with open(file=column_path, mode='rb') as column_file:
+                column.frombytes(column_file.read())
+
+        return columns, coverage
+
+    def store(self, symbol: str, frequency_type: str, frequency: int, extended_hours: bool,
+              columns: Dict[str, array], coverage: List[List[int]]) -> None:
+        """Writes a candle series to disk.
+
+        Every file is written next to its destination and then moved in place,
+        so a reader never sees a half written series.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        frequency_type {str} -- The frequency type of the candles.
+
+        frequency {int} -- The frequency of the candles.
+
+        extended_hours {bool} -- Whether the candles include extended hours.
+
+        columns {Dict[str, array]} -- The candle columns, sorted by datetime.
+
+        coverage {List[List[int]]} -- The date ranges that were downloaded.
+        """
+
+        series_path = self._series_path(symbol, frequency_type, frequency, extended_hours)
+        series_path.mkdir(parents=True, exist_ok=True)
+
+        for name, column in columns.items():
+            column_path = series_path.joinpath(name + '.bin')
+            temporary_path = column_path.with_suffix('.tmp')
+            with open(file=temporary_path, mode='wb') as column_file:
+                column.tofile(column_file)
+            os.replace(temporary_path, column_path)
+
+        # The coverage goes last, it's what marks the columns as valid.
+        coverage_path = series_path.joinpath('coverage.json')
+        temporary_path = coverage_path.with_suffix('.tmp')
+        with open(file=temporary_path, mode='w') as coverage_file:
+            json.dump(obj=coverage, fp=coverage_file)
+        os.replace(temporary_path, coverage_path)
+
+
+def missing_ranges(coverage: List[List[int]], start: int, end: int) -> List[List[int]]:
+    """Returns the parts of a date range that aren't covered yet.
+
+    Arguments:
+    ----
+    coverage {List[List[int]]} -- The sorted, non overlapping ranges already covered.
+
+    start {int} -- The start of the requested range.
+
+    end {int} -- The end of the requested range.
+
+    Returns:
+    ----
+    List[List[int]] -- The gaps, as [start, end] ranges.
+    """
+
+    gaps = []
+    cursor = start
+
+    for covered_start, covered_end in coverage:
+
+        if covered_end < cursor:
+            continue
+        if covered_start > end:
+            break
+
+        if covered_start > cursor:
+            gaps.append([cursor, covered_start])
+
+        cursor = max(cursor, covered_end)
+
+    if cursor < end:
+        gaps.append([cursor, end])
+
+    return gaps
+
+
+def merge_ranges(coverage: List[List[int]], new_range: List[int]) -> List[List[int]]:
+    """Adds a range to the coverage, merging overlapping ranges.
+
+    Arguments:
+    ----
+    coverage {List[List[int]]} -- The ranges already covered.
+
+    new_range {List[int]} -- The range to add.
+
+    Returns:
+    ----
+    List[List[int]] -- The sorted, non overlapping ranges.
+    """
+
+    merged = []
+
+    for range_start, range_end in sorted(coverage + [new_range]):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+
+    return merged
+
+
+class PriceHistoryDownloader():
+
+    """
+    Downloads the price history of many symbols in parallel.
+
+    Symbols are spread over a pool of worker threads that share the client, and
+    so its rate limiter. Failed symbols are retried with an exponential backoff.
+    If a cache directory is provided, candles are kept on disk and only the date
+    ranges that weren't downloaded before are requested.
+    """
+
+    # Errors that won't go away by asking again.
+    fatal_errors = (NotNulError, ForbidError, NotFndError)
+
+    def __init__(self, td_client: TDClient, cache_directory: Union[str, pathlib.Path] = None, max_workers: int = 8,
+                 retries: int = 3, backoff: float = 1.0) -> None:
+        """Initalizes the `PriceHistoryDownloader`.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- An authenticated `TDClient`.
+
+        Keyword Arguments:
+        ----
+        cache_directory {Union[str, pathlib.Path]} -- The directory the candles are
+            cached in, no cache is used if not provided. (default: {None})
+
+        max_workers {int} -- The number of symbols downloaded at the same time. (default: {8})
+
+        retries {int} -- The number of times a failed symbol is retried. (default: {3})
+
+        backoff {float} -- The number of seconds to wait before the first retry,
+            it doubles on each retry. (default: {1.0})
+
+        Usage:
+        ----
+            >>> downloader = PriceHistoryDownloader(
+                td_client=td_session,
+                cache_directory='data/history'
+            )
+            >>> price_history = downloader.download(
+                symbols=['MSFT', 'AAPL'],
+                frequency_type='minute',
+                frequency=1,
+                start_date=datetime(2020, 7, 1),
+                end_date=datetime(2020, 7, 10)
+            )
+        """
+
+        self.td_client = td_client
+        self.cache = CandleCache(cache_directory) if cache_directory else None
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+
+        self.errors: Dict[str, Exception] = {}
+        self._errors_lock = threading.Lock()
+        self._td_utilities = TDUtilities()
+
+    def _to_milliseconds(self, date: Union[datetime.datetime, int]) -> int:
+        """Converts a datetime to milliseconds since epoch."""
+
+        if isinstance(date, datetime.datetime):
+            return self._td_utilities.milliseconds_since_epoch(dt_object=date)
+
+        return int(date)
+
+    def _fetch_range(self, symbol: str, frequency_type: str, frequency: int, extended_hours: bool,
+                     start: int, end: int) -> Candles:
+        """Downloads the candles of a single date range, retrying on failure."""
+
+        attempt = 0
+
+        while True:
+            try:
+                response = self.td_client.get_price_history(
+                    symbol=symbol,
+                    period_type=DEFAULT_PERIOD_TYPES[frequency_type],
+                    start_date=start,
+                    end_date=end,
+                    frequency_type=frequency_type,
+                    frequency=frequency,
+                    extended_hours=extended_hours,
+                    columnar=True
+                )
+                # The token was refreshed instead of the candles being returned, ask again.
+                if response is None:
+                    raise TknExpError(message='No price history was returned for {}.'.format(symbol))
+                return response
+            except self.fatal_errors:
+                raise
+            except Exception:
+                if attempt >= self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+
+    def _merge_candles(self, columns: Dict[str, array], candles: Candles) -> Dict[str, array]:
+        """Merges new candles into the columns, sorted and without duplicates."""
+
+        rows = {}
+
+        for new_columns in (columns, candles.columns):
+            for row in zip(*(new_columns[name] for name in CANDLE_COLUMNS)):
+                rows[row[-1]] = row
+
+        merged = {name: array(typecode) for name, typecode in CANDLE_COLUMNS.items()}
+
+        for timestamp in sorted(rows):
+            for name, value in zip(CANDLE_COLUMNS, rows[timestamp]):
+                merged[name].append(value)
+
+        return merged
+
+    def download_symbol(self, symbol: str, frequency_type: str, frequency: int, start_date: Union[datetime.datetime, int],
+                        end_date: Union[datetime.datetime, int], extended_hours: bool = True,
+                        columnar: bool = False) -> Union[dict, Candles]:
+        """Downloads the price history of a single symbol, using the cache if possible.
+
+        Arguments:
+        ----
+        symbol {str} -- The ticker symbol.
+
+        frequency_type {str} -- The type of frequency with which a new candle
+            is formed, one of `minute`, `daily`, `weekly` or `monthly`.
+
+        frequency {int} -- The number of the frequency type in each candle.
+
+        start_date {Union[datetime.datetime, int]} -- The start date, as a datetime
+            or milliseconds since epoch.
+
+        end_date {Union[datetime.datetime, int]} -- The end date, as a datetime
+            or milliseconds since epoch.
+
+        Keyword Arguments:
+        ----
+        extended_hours {bool} -- `True` to include extended hours. (default: {True})
+
+        columnar {bool} -- `True` to return a `Candles` object instead of
+            a list of dictionaries. (default: {False})
+
+        Returns:
+        ----
+        Union[dict, Candles] -- A `get_price_history` response, with the candles in the date range.
+        """
+
+        if frequency_type not in DEFAULT_PERIOD_TYPES:
+            raise ValueError('Invalid frequency type, please choose a valid one: {}'.format(', '.join(DEFAULT_PERIOD_TYPES)))
+
+        start = self._to_milliseconds(date=start_date)
+        end = self._to_milliseconds(date=end_date)
+
+        if self.cache is None:
+            candles = self._fetch_range(symbol, frequency_type, frequency, extended_hours, start, end)
+            return candles if columnar else candles.to_response()
+
+        columns, coverage = self.cache.load(symbol, frequency_type, frequency, extended_hours)
+
+        # The future can't be covered yet.
+        now = int(time.time() * 1000)
+
+        gaps = missing_ranges(coverage=coverage, start=start, end=end)
+
+        if gaps:
+
+            for gap_start, gap_end in gaps:
+                candles = self._fetch_range(symbol, frequency_type, frequency, extended_hours, gap_start, gap_end)
+                columns = self._merge_candles(columns=columns, candles=candles)
+
+                if gap_start < now:
+                    coverage = merge_ranges(coverage=coverage, new_range=[gap_start, min(gap_end, now)])
+
+            self.cache.store(symbol, frequency_type, frequency, extended_hours, columns, coverage)
+
+        candles = Candles(symbol=symbol, columns=columns).between(start=start, end=end)
+
+        return candles if columnar else candles.to_response()
+
+    def download(self, symbols: List[str], frequency_type: str, frequency: int, start_date: Union[datetime.datetime, int],
+                 end_date: Union[datetime.datetime, int], extended_hours: bool = True,
+                 columnar: bool = False) -> Dict[str, Union[dict, Candles]]:
+        """Downloads the price history of many symbols in parallel.
+
+        Symbols that still fail after all their retries are left out of the
+        result, their error can be found in the `errors` dictionary.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The ticker symbols.
+
+        frequency_type {str} -- The type of frequency with which a new candle
+            is formed, one of `minute`, `daily`, `weekly` or `monthly`.
+
+        frequency {int} -- The number of the frequency type in each candle.
+
+        start_date {Union[datetime.datetime, int]} -- The start date, as a datetime
+            or milliseconds since epoch.
+
+        end_date {Union[datetime.datetime, int]} -- The end date, as a datetime
+            or milliseconds since epoch.
+
+        Keyword Arguments:
+        ----
+        extended_hours {bool} -- `True` to include extended hours. (default: {True})
+
+        columnar {bool} -- `True` to return a `Candles` object for each symbol
+            instead of a list of dictionaries. (default: {False})
+
+        Returns:
+        ----
+        Dict[str, Union[dict, Candles]] -- The `get_price_history` response of each symbol.
+        """
+
+        self.errors = {}
+        results = {}
+
+        def download_one(symbol: str) -> None:
+            try:
+                results[symbol] = self.download_symbol(
+                    symbol=symbol,
+                    frequency_type=frequency_type,
+                    frequency=frequency,
+                    start_date=start_date,
+                    end_date=end_date,
+                    extended_hours=extended_hours,
+                    columnar=columnar
+                )
+            except Exception as error:
+                with self._errors_lock:
+                    self.errors[symbol] = error
+
+        # A symbol is only downloaded once, so two workers never write the same series.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(download_one, dict.fromkeys(symbols)))
+
+        return {symbol: results[symbol] for symbol in symbols if symbol in results}
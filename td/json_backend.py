@@ -0,0 +1,107 @@
+import importlib
+
+from typing import Callable
+from typing import List
+from typing import Union
+
+
+# The backends we try, fastest first. `json` is always available.
+JSON_BACKENDS = ['orjson', 'ujson', 'simdjson', 'json']
+
+# The UTF-8 replacement character, and what it gets replaced with.
+_REPLACEMENT_CHARACTER = '\ufffd'
+_REPLACEMENT_BYTES = _REPLACEMENT_CHARACTER.encode('utf-8')
+_REPLACEMENT_VALUE = '"None"'
+
+
+def available_backends() -> List[str]:
+    """Returns the JSON backends that are installed, fastest first.
+
+    Returns:
+    ----
+    List[str] -- The names of the installed backends.
+    """
+
+    backends = []
+
+    for backend in JSON_BACKENDS:
+        try:
+            importlib.import_module(backend)
+        except ImportError:
+            continue
+        backends.append(backend)
+
+    return backends
+
+
+class StreamDecoder():
+
+    """
+    Decodes the JSON messages coming from the stream.
+
+    The decoder uses the fastest JSON library that is installed, or the one
+    requested. Messages are handed to the library as is, the replacement
+    characters that sometimes show up in the stream are only cleaned up
+    if the first attempt fails.
+    """
+
+    def __init__(self, backend: str = None) -> None:
+        """Initalizes the `StreamDecoder`.
+
+        Keyword Arguments:
+        ----
+        backend {str} -- The JSON library to use, one of `orjson`, `ujson`,
+            `simdjson` or `json`. The fastest one installed is used if
+            not provided. (default: {None})
+        """
+
+        if backend is None:
+            backend = available_backends()[0]
+        elif backend not in JSON_BACKENDS:
+            raise ValueError('Invalid JSON backend, please choose a valid one: {}'.format(', '.join(JSON_BACKENDS)))
+
+        self.backend = backend
+        self._loads: Callable[[Union[str, bytes]], dict] = importlib.import_module(backend).loads
+
+    def __repr__(self) -> str:
+        return '<StreamDecoder (backend={backend})>'.format(backend=self.backend)
+
+    def loads(self, message: Union[str, bytes]) -> dict:
+        """Decodes a message from the stream.
+
+        Arguments:
+        ----
+        message {Union[str, bytes]} -- The raw message.
+
+        Returns:
+        ----
+        dict -- A python dictionary containing the original values.
+        """
+
+        try:
+            return self._loads(message)
+        except ValueError:
+            return self._loads(self.sanitize(message=message))
+
+    def sanitize(self, message: Union[str, bytes]) -> Union[str, bytes]:
+        """Replaces the replacement characters of a message with `"None"`.
+
+        The message keeps its type, so it's only copied once.
+
+        Arguments:
+        ----
+        message {Union[str, bytes]} -- The raw message.
+
+        Returns:
+        ----
+        Union[str, bytes] -- The cleaned up message.
+        """
+
+        if isinstance(message, str):
+            return message.replace(_REPLACEMENT_CHARACTER, _REPLACEMENT_VALUE)
+
+        return message.replace(_REPLACEMENT_BYTES, _REPLACEMENT_VALUE.encode('utf-8'))
+
+
+# The decoder shared by the stream clients and messages.
+default_decoder = StreamDecoder()
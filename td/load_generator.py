@@ -0,0 +1,414 @@
+import argparse
+import concurrent.futures
+import contextlib
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+from td.client import TDClient
+from td.mock_api import MockTDServer
+
+
+# The endpoint calls the load is made of, by name, the method and its arguments.
+LOAD_SCENARIOS: Dict[str, Tuple[str, dict]] = {
+    'get_quotes': ('get_quotes', {'instruments': ['MSFT', 'AAPL', 'SQ']}),
+    'get_price_history': ('get_price_history', {
+        'symbol': 'MSFT',
+        'period_type': 'day',
+        'period': '1',
+        'frequency_type': 'minute',
+        'frequency': '1'
+    }),
+    'get_accounts': ('get_accounts', {'account': 'all', 'fields': ['positions', 'orders']}),
+    'get_market_hours': ('get_market_hours', {'markets': ['EQUITY'], 'date': '2020-07-20'}),
+    'get_movers': ('get_movers', {'market': '$DJI', 'direction': 'up', 'change': 'percent'}),
+    'search_instruments': ('search_instruments', {'symbol': 'MSFT', 'projection': 'symbol-search'}),
+    'get_orders': ('get_orders', {'account': '000000000'}),
+    'place_order': ('place_order', {
+        'account': '000000000',
+        'order': {
+            'orderType': 'LIMIT',
+            'session': 'NORMAL',
+            'duration': 'DAY',
+            'price': 100.0,
+            'orderStrategyType': 'SINGLE',
+            'orderLegCollection': [
+                {'instruction': 'BUY', 'quantity': 1, 'instrument': {'symbol': 'MSFT', 'assetType': 'EQUITY'}}
+            ]
+        }
+    })
+}
+
+# The client steps that are timed on each request.
+TIMED_STEPS = ['validate_token', '_headers', '_parse_response']
+
+
+def create_mock_client(url: str, credentials_path: str = None, **kwargs) -> TDClient:
+    """Creates a `TDClient` that talks to a mock server, already logged in.
+
+    Arguments:
+    ----
+    url {str} -- The URL of the mock server.
+
+    Keyword Arguments:
+    ----
+    credentials_path {str} -- The credentials file, only written if a token is
+        refreshed, in the temporary directory if not provided. (default: {None})
+
+    Returns:
+    ----
+    TDClient -- The client, the keyword arguments are passed on to it.
+    """
+
+    if credentials_path is None:
+        credentials_path = os.path.join(tempfile.gettempdir(), 'td_mock_state.json')
+
+    td_client = TDClient(
+        client_id='MOCK_CLIENT_ID',
+        redirect_uri='http://localhost/callback',
+        credentials_path=credentials_path,
+        _do_init=False,
+        **kwargs
+    )
+    td_client.config['api_endpoint'] = url
+
+    now = time.time()
+
+    td_client.state.update({
+        'access_token': 'MOCK_ACCESS_TOKEN',
+        'refresh_token': 'MOCK_REFRESH_TOKEN',
+        'access_token_expires_at': now + 1800,
+        'refresh_token_expires_at': now + 7776000,
+        'logged_in': True
+    })
+    td_client._update_token_deadlines()
+    td_client.authstate = True
+
+    return td_client
+
+
+class StepTimer():
+
+    """
+    Measures the time a client spends in some of its methods.
+
+    The methods are wrapped on the instance while the timer is active, so the
+    class and every other client are left alone.
+    """
+
+    def __init__(self, td_client: TDClient, steps: List[str] = None) -> None:
+        """Initalizes the `StepTimer`.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- The client to measure.
+
+        Keyword Arguments:
+        ----
+        steps {List[str]} -- The methods to time. (default: {TIMED_STEPS})
+        """
+
+        self.td_client = td_client
+        self.steps = steps or TIMED_STEPS
+        self.timings: Dict[str, List[float]] = {step: [] for step in self.steps}
+
+    def _wrap(self, step: str, method: Callable) -> Callable:
+        """Wraps a method, so each call is timed."""
+
+        timings = self.timings[step]
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs) -> Any:
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings.append(perf_counter() - start)
+
+        return timed
+
+    @contextlib.contextmanager
+    def active(self) -> Iterator['StepTimer']:
+        """Times the steps within the block."""
+
+        for step in self.steps:
+            setattr(self.td_client, step, self._wrap(step=step, method=getattr(self.td_client, step)))
+
+        try:
+            yield self
+        finally:
+            for step in self.steps:
+                delattr(self.td_client, step)
+
+    @property
+    def stats(self) -> Dict[str, dict]:
+        """Returns the calls of each step, and the time spent in them, in milliseconds."""
+
+        return {
+            step: {
+                'calls': len(timings),
+                'total_ms': sum(timings) * 1000.0,
+                'mean_us': sum(timings) / len(timings) * 1e6 if timings else 0.0
+            }
+            for step, timings in self.timings.items()
+        }
+
+
+def _latency_stats(latencies: List[float]) -> dict:
+    """Returns the percentiles of latencies, in milliseconds."""
+
+    if not latencies:
+        return {'mean': None, 'p50': None, 'p90': None, 'p99': None, 'max': None}
+
+    latencies = sorted(latencies)
+
+    def percentile(percent: float) -> float:
+        return latencies[min(len(latencies) - 1, int(round(percent / 100.0 * (len(latencies) - 1))))] * 1000.0
+
+    return {
+        'mean': sum(latencies) / len(latencies) * 1000.0,
+        'p50': percentile(50),
+        'p90': percentile(90),
+        'p99': percentile(99),
+        'max': latencies[-1] * 1000.0
+    }
+
+
+def pool_stats(td_client: TDClient) -> dict:
+    """Returns the connections opened by the client, and the requests sent on them.
+
+    Arguments:
+    ----
+    td_client {TDClient} -- The client.
+
+    Returns:
+    ----
+    dict -- The connections the pools of the session opened, and the requests
+        sent per connection.
+    """
+
+    connections = 0
+    requests_sent = 0
+
+    # The same adapter is mounted for `http://` and `https://`.
+    adapters = {id(adapter): adapter for adapter in td_client.request_session.adapters.values()}
+
+    for adapter in adapters.values():
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+
+    return {
+        'connections': connections,
+        'requests': requests_sent,
+        'requests_per_connection': requests_sent / connections if connections else 0.0
+    }
+
+
+class LoadGenerator():
+
+    """
+    Drives the endpoint methods of a `TDClient` from several threads.
+
+    Each worker thread calls the scenarios in turn, until the number of
+    requests is reached or the time is up, and the load generator reports the
+    throughput, the latency percentiles of each scenario, how well the pooled
+    connections were reused, and the time the client spent validating the
+    token, building the headers and decoding the responses.
+    """
+
+    def __init__(self, td_client: TDClient, scenarios: List[str] = None, concurrency: int = 4) -> None:
+        """Initalizes the `LoadGenerator`.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- The client, shared by the worker threads.
+
+        Keyword Arguments:
+        ----
+        scenarios {List[str]} -- The scenarios to call, every one of `LOAD_SCENARIOS`
+            if not provided. (default: {None})
+
+        concurrency {int} -- The number of worker threads. (default: {4})
+        """
+
+        scenarios = scenarios or list(LOAD_SCENARIOS)
+
+        for scenario in scenarios:
+            if scenario not in LOAD_SCENARIOS:
+                raise ValueError('Invalid scenario, please choose a valid one: {}'.format(', '.join(LOAD_SCENARIOS)))
+
+        self.td_client = td_client
+        self.scenarios = scenarios
+        self.concurrency = concurrency
+
+        self._lock = threading.Lock()
+        self._sent = 0
+
+    def _next_request(self, requests: int, deadline: float) -> int:
+        """Returns the number of the next request, or `None` once the load is done."""
+
+        with self._lock:
+
+            if (requests is not None and self._sent >= requests) or (deadline is not None and time.monotonic() >= deadline):
+                return None
+
+            self._sent += 1
+
+            return self._sent - 1
+
+    def _worker(self, requests: int, deadline: float) -> List[Tuple[str, float, bool]]:
+        """Sends requests until the load is done.
+
+        Returns:
+        ----
+        List[Tuple[str, float, bool]] -- The scenario, latency and success of each request.
+        """
+
+        results = []
+        perf_counter = time.perf_counter
+
+        while True:
+
+            number = self._next_request(requests=requests, deadline=deadline)
+
+            if number is None:
+                return results
+
+            scenario = self.scenarios[number % len(self.scenarios)]
+            method_name, arguments = LOAD_SCENARIOS[scenario]
+            method = getattr(self.td_client, method_name)
+
+            start = perf_counter()
+
+            try:
+                method(**arguments)
+                succeeded = True
+            except Exception:
+                succeeded = False
+
+            results.append((scenario, perf_counter() - start, succeeded))
+
+    def run(self, requests: int = 1000, duration: float = None) -> dict:
+        """Runs the load.
+
+        Keyword Arguments:
+        ----
+        requests {int} -- The number of requests to send, `None` to only stop
+            after `duration`. (default: {1000})
+
+        duration {float} -- The maximum number of seconds. (default: {None})
+
+        Returns:
+        ----
+        dict -- The throughput, the latency percentiles overall and of each
+            scenario in milliseconds, the connection reuse, and the time spent
+            in each client step.
+        """
+
+        if requests is None and duration is None:
+            raise ValueError('The load needs a number of requests, a duration, or both.')
+
+        self._sent = 0
+        step_timer = StepTimer(td_client=self.td_client)
+        deadline = time.monotonic() + duration if duration is not None else None
+
+        with step_timer.active():
+
+            start = time.perf_counter()
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='TDLoad') as executor:
+                futures = [executor.submit(self._worker, requests, deadline) for _ in range(self.concurrency)]
+                results = [result for future in futures for result in future.result()]
+
+            seconds = time.perf_counter() - start
+
+        scenarios = {}
+
+        for scenario in self.scenarios:
+            latencies = [latency for name, latency, _ in results if name == scenario]
+            scenarios[scenario] = {
+                'requests': len(latencies),
+                'errors': sum(1 for name, _, succeeded in results if name == scenario and not succeeded),
+                'latency_ms': _latency_stats(latencies=latencies)
+            }
+
+        return {
+            'concurrency': self.concurrency,
+            'requests': len(results),
+            'errors': sum(1 for _, _, succeeded in results if not succeeded),
+            'seconds': seconds,
+            'requests_per_second': len(results) / seconds if seconds else None,
+            'latency_ms': _latency_stats(latencies=[latency for _, latency, _ in results]),
+            'scenarios': scenarios,
+            'connections': pool_stats(td_client=self.td_client),
+            'client_steps': step_timer.stats
+        }
+
+
+def main(arguments: List[str] = None) -> dict:
+    """Runs a load against a mock server from the command line, and prints the report as JSON.
+
+    Usage:
+    ----
+        $ python -m td.load_generator --concurrency 16 --requests 5000 --latency 0.02
+    """
+
+    parser = argparse.ArgumentParser(
+        prog='python -m td.load_generator',
+        description='Drives the TDClient endpoint methods against a local mock of the TD Ameritrade API.'
+    )
+    parser.add_argument('--scenarios', nargs='+', choices=list(LOAD_SCENARIOS), help='The endpoint calls, all by default.')
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[4], help='The numbers of worker threads, one run each.')
+    parser.add_argument('--requests', type=int, default=1000, help='The number of requests of each run.')
+    parser.add_argument('--duration', type=float, help='The maximum number of seconds of each run.')
+    parser.add_argument('--latency', type=float, default=0.0, help='The seconds the mock server waits before answering.')
+    parser.add_argument('--pool-maxsize', type=int, default=10, help='The connections the client keeps alive.')
+    parser.add_argument('--rate-limit', action='store_true', help='Keep the client side rate limiter on.')
+    parser.add_argument('--output', help='The file the JSON report is written to, printed if not provided.')
+
+    options = parser.parse_args(arguments)
+
+    report = {'latency': options.latency, 'pool_maxsize': options.pool_maxsize, 'runs': []}
+
+    with MockTDServer(latency=options.latency) as mock_server:
+
+        for concurrency in options.concurrency:
+
+            td_client = create_mock_client(url=mock_server.url)
+            td_client.configure_session(pool_maxsize=options.pool_maxsize)
+            td_client.configure_rate_limit(enabled=options.rate_limit)
+
+            connections = mock_server.stats['connections']
+
+            load_generator = LoadGenerator(td_client=td_client, scenarios=options.scenarios, concurrency=concurrency)
+            run = load_generator.run(requests=options.requests, duration=options.duration)
+            run['connections']['server_connections'] = mock_server.stats['connections'] - connections
+
+            td_client.close_session()
+            report['runs'].append(run)
+
+    if options.output:
+        with open(file=options.output, mode='w') as report_file:
+            json.dump(report, report_file, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,9 @@
-import json
-
 from datetime import datetime
 from typing import Union
 from typing import List
 
+from td.json_backend import default_decoder
+
 
 class StreamingMessage():
 
@@ -42,14 +42,7 @@ class StreamingMessage():
         dict -- A Message dictionary.
         """
 
-        message = message.encode(
-            'utf-8').replace(
-                b'\xef\xbf\xbd',
-                bytes('"None"', 'utf-8')
-            ).decode('utf-8')
-        message = json.loads(message)
-
-        return message
+        return default_decoder.loads(message)
 
     def set_components(self) -> List[dict]:
         """Converts each response to a StreamingMessageComponent Object.
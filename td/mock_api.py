@@ -0,0 +1,267 @@
+import http.server
+import itertools
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+
+from typing import Dict
+from typing import List
+from typing import Pattern
+from typing import Tuple
+
+
+# The sample responses that ship with the repo.
+SAMPLES_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples', 'responses')
+
+# method, path after the API version, and the sample answered with.
+MOCK_ROUTES: List[Tuple[str, str, str]] = [
+    ('GET', r'marketdata/quotes', 'sample_multiple_quotes.jsonc'),
+    ('GET', r'marketdata/[^/]+/quotes', 'sample_single_quotes.jsonc'),
+    ('GET', r'marketdata/[^/]+/pricehistory', 'sample_historical_prices.jsonc'),
+    ('GET', r'marketdata/chains', 'sample_option_chain.jsonc'),
+    ('GET', r'marketdata/[^/]+/movers', 'sample_movers.jsonc'),
+    ('GET', r'marketdata/([^/]+/)?hours', 'sample_market_hours.jsonc'),
+    ('GET', r'instruments', 'sample_search_instrument.jsonc'),
+    ('GET', r'instruments/[^/]+', 'sample_instrument.jsonc'),
+    ('GET', r'accounts(/[^/]+)?', 'sample_accounts.jsonc'),
+    ('GET', r'accounts/[^/]+/preferences', 'sample_account_preferences.jsonc'),
+    ('GET', r'accounts/[^/]+/transactions(/[^/]+)?', 'sample_transaction_data.jsonc'),
+    ('GET', r'userprincipals', 'sample_user_principals.jsonc'),
+    ('GET', r'userprincipals/streamersubscriptionkeys', 'sample_streamer_keys.jsonc'),
+    ('GET', r'(accounts/[^/]+/)?orders', None),
+    ('GET', r'accounts/[^/]+/orders/[^/]+', None)
+]
+
+# The token handed out by the mock, it never expires during a test.
+MOCK_TOKEN = {
+    'access_token': 'MOCK_ACCESS_TOKEN',
+    'refresh_token': 'MOCK_REFRESH_TOKEN',
+    'scope': 'PlaceTrades AccountAccess MoveMoney',
+    'expires_in': 1800,
+    'refresh_token_expires_in': 7776000,
+    'token_type': 'Bearer'
+}
+
+
+class MockTDServer():
+
+    """
+    A local stand-in for the TD Ameritrade REST API.
+
+    The `GET` endpoints answer with the sample responses, the quotes endpoint
+    answers with a quote for each requested symbol, orders can be placed and
+    cancelled, and the token endpoint hands out tokens. Every response is
+    encoded once, so the server adds as little as possible to the measures,
+    and an artificial `latency` stands in for the time the real API takes.
+    The server counts the connections it accepts, which shows how well the
+    client reuses them.
+    """
+
+    def __init__(self, directory: str = SAMPLES_DIRECTORY, latency: float = 0.0, api_version: str = 'v1') -> None:
+        """Initalizes the `MockTDServer` and loads the samples.
+
+        Keyword Arguments:
+        ----
+        directory {str} -- The directory with the sample responses. (default: {SAMPLES_DIRECTORY})
+
+        latency {float} -- The seconds the server waits before answering. (default: {0.0})
+
+        api_version {str} -- The API version in the paths. (default: {'v1'})
+        """
+
+        self.directory = directory
+        self.latency = latency
+        self.api_version = api_version
+
+        self.routes: List[Tuple[str, Pattern, bytes]] = []
+
+        for method, pattern, sample_file in MOCK_ROUTES:
+            body = self._load_sample(sample_file=sample_file) if sample_file else b'[]'
+            self.routes.append((method, re.compile(pattern + '$'), body))
+
+        # The quotes endpoint answers with this quote, for each symbol.
+        with open(file=os.path.join(directory, 'sample_single_quotes.jsonc'), mode='r') as quote_file:
+            self.quote_template: dict = next(iter(json.load(quote_file).values()))
+
+        self.server: http.server.ThreadingHTTPServer = None
+        self.url: str = None
+        self._thread: threading.Thread = None
+
+        self._lock = threading.Lock()
+        self._order_ids = itertools.count(1)
+        self._connections = 0
+        self._requests = 0
+        self._status_codes: Dict[int, int] = {}
+
+    def _load_sample(self, sample_file: str) -> bytes:
+        """Loads a sample response and encodes it."""
+
+        with open(file=os.path.join(self.directory, sample_file), mode='r') as json_file:
+            return json.dumps(json.load(json_file)).encode('utf-8')
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Starts answering requests, in a thread.
+
+        Keyword Arguments:
+        ----
+        host {str} -- The host to listen on. (default: {'127.0.0.1'})
+
+        port {int} -- The port to listen on, `0` picks a free one. (default: {0})
+
+        Returns:
+        ----
+        str -- The URL of the server, used as the `api_endpoint` of a `TDClient`.
+        """
+
+        mock_server = self
+
+        class MockRequestHandler(http.server.BaseHTTPRequestHandler):
+
+            # Keep the connections alive, like the real API, and don't hold
+            # the body back until the headers are acknowledged.
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                mock_server._count(connection=True)
+
+            def do_GET(self) -> None:
+                mock_server._handle(request_handler=self, method='GET')
+
+            def do_POST(self) -> None:
+                mock_server._handle(request_handler=self, method='POST')
+
+            def do_PUT(self) -> None:
+                mock_server._handle(request_handler=self, method='PUT')
+
+            def do_PATCH(self) -> None:
+                mock_server._handle(request_handler=self, method='PATCH')
+
+            def do_DELETE(self) -> None:
+                mock_server._handle(request_handler=self, method='DELETE')
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self.server = http.server.ThreadingHTTPServer((host, port), MockRequestHandler)
+        self.server.daemon_threads = True
+        self.url = 'http://{}:{}'.format(host, self.server.server_address[1])
+
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={'poll_interval': 0.1},
+            name='MockTDServer',
+            daemon=True
+        )
+        self._thread.start()
+
+        return self.url
+
+    def stop(self) -> None:
+        """Stops the server."""
+
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self._thread.join()
+            self.server = None
+
+    def __enter__(self) -> 'MockTDServer':
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def stats(self) -> dict:
+        """Returns the server counters.
+
+        Returns:
+        ----
+        dict -- The connections accepted, the requests answered, the requests
+            per connection, and the number of responses of each status code.
+        """
+
+        with self._lock:
+            return {
+                'connections': self._connections,
+                'requests': self._requests,
+                'requests_per_connection': self._requests / self._connections if self._connections else 0.0,
+                'status_codes': dict(self._status_codes)
+            }
+
+    def _count(self, connection: bool = False, status_code: int = None) -> None:
+        """Counts a connection or a response."""
+
+        with self._lock:
+            if connection:
+                self._connections += 1
+            else:
+                self._requests += 1
+                self._status_codes[status_code] = self._status_codes.get(status_code, 0) + 1
+
+    def _handle(self, request_handler: http.server.BaseHTTPRequestHandler, method: str) -> None:
+        """Answers a request."""
+
+        # The body has to be read, or it ends up in the next request of the connection.
+        content_length = int(request_handler.headers.get('Content-Length') or 0)
+        request_body = request_handler.rfile.read(content_length) if content_length else b''
+
+        url = urllib.parse.urlsplit(request_handler.path)
+        prefix = '/{}/'.format(self.api_version)
+        path = url.path[len(prefix):] if url.path.startswith(prefix) else url.path.lstrip('/')
+        query = urllib.parse.parse_qs(url.query)
+
+        status_code, body, headers = self._route(method=method, path=path, query=query, request_body=request_body)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        request_handler.send_response(status_code)
+        request_handler.send_header('Content-Type', 'application/json')
+        request_handler.send_header('Content-Length', str(len(body)))
+
+        for name, value in headers.items():
+            request_handler.send_header(name, value)
+
+        request_handler.end_headers()
+        request_handler.wfile.write(body)
+
+        self._count(status_code=status_code)
+
+    def _route(self, method: str, path: str, query: Dict[str, List[str]],
+               request_body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Finds the response to a request.
+
+        Returns:
+        ----
+        Tuple[int, bytes, Dict[str, str]] -- The status code, the body and the extra headers.
+        """
+
+        if method == 'POST' and path == 'oauth2/token':
+            return 200, json.dumps(MOCK_TOKEN).encode('utf-8'), {}
+
+        if method == 'GET' and path == 'marketdata/quotes':
+            symbols = query.get('symbol', [''])[0].split(',')
+            quotes = {symbol: dict(self.quote_template, symbol=symbol) for symbol in symbols if symbol}
+            return 200, json.dumps(quotes).encode('utf-8'), {}
+
+        orders = re.match(r'accounts/([^/]+)/(orders|savedorders)$', path)
+
+        if method == 'POST' and orders:
+            order_url = '{}/{}/{}/{}'.format(self.url, self.api_version, path, next(self._order_ids))
+            return 201, b'', {'Location': order_url}
+
+        if method in ('PUT', 'PATCH', 'DELETE'):
+            return 200, b'', {}
+
+        for route_method, pattern, body in self.routes:
+            if route_method == method and pattern.match(path):
+                return 200, body, {}
+
+        return 404, json.dumps({'error': 'Not Found: {} {}'.format(method, path)}).encode('utf-8'), {}
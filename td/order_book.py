@@ -0,0 +1,379 @@
+from array import array
+from collections import namedtuple
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+# The level two services with a nested book.
+BOOK_SERVICES = [
+    'LISTED_BOOK',
+    'NASDAQ_BOOK',
+    'OPTIONS_BOOK',
+    'FUTURES_BOOK'
+]
+
+# A price level that changed between two frames, a size of 0 means it's gone.
+LevelChange = namedtuple('LevelChange', ['side', 'price', 'size', 'previous_size'])
+
+
+class BookSide():
+
+    """
+    One side of an order book, kept as sorted price levels.
+
+    The prices, sizes and order counts of the levels are stored in arrays that
+    are overwritten in place when the number of levels doesn't change, and the
+    market participant detail of each level is kept as it came from the stream.
+    Sizes are stored as floats, since some books stream fractional sizes, and
+    order counts are stored as integers.
+    """
+
+    __slots__ = ('side', 'sign', 'prices', 'sizes', 'counts', 'entries')
+
+    def __init__(self, side: str) -> None:
+        """Initalizes the `BookSide`.
+
+        Arguments:
+        ----
+        side {str} -- Either `bid`, sorted from the highest price, or `ask`,
+            sorted from the lowest price.
+        """
+
+        self.side = side
+        self.sign = -1.0 if side == 'bid' else 1.0
+        self.prices = array('d')
+        self.sizes = array('d')
+        self.counts = array('q')
+        self.entries: List[List[dict]] = []
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def update(self, levels: List[dict]) -> List[LevelChange]:
+        """Replaces the levels with the ones of a new frame.
+
+        Arguments:
+        ----
+        levels {List[dict]} -- The price levels of the side, as they come from the stream,
+            sorted first if they're out of order.
+
+        Returns:
+        ----
+        List[LevelChange] -- The levels that were added, removed or changed size.
+        """
+
+        changes = []
+        sign = self.sign
+
+        # The stream sends the levels sorted, the merge below relies on it.
+        if any(levels[index]['0'] * sign > levels[index + 1]['0'] * sign for index in range(len(levels) - 1)):
+            levels = sorted(levels, key=lambda level: level['0'] * sign)
+
+        prices = self.prices
+        sizes = self.sizes
+        counts = self.counts
+        side = self.side
+
+        old_count = len(prices)
+        new_count = len(levels)
+        old_index = new_index = 0
+
+        # Both sides are sorted, so the frames can be compared in a single pass.
+        while old_index < old_count or new_index < new_count:
+
+            if new_index < new_count:
+                new_level = levels[new_index]
+                new_key = new_level['0'] * sign
+
+            if old_index < old_count:
+                old_key = prices[old_index] * sign
+
+            if new_index >= new_count or (old_index < old_count and old_key < new_key):
+                changes.append(LevelChange(side, prices[old_index], 0, sizes[old_index]))
+                old_index += 1
+            elif old_index >= old_count or new_key < old_key:
+                changes.append(LevelChange(side, new_level['0'], new_level['1'], 0))
+                new_index += 1
+            else:
+                if new_level['1'] != sizes[old_index]:
+                    changes.append(LevelChange(side, new_level['0'], new_level['1'], sizes[old_index]))
+                old_index += 1
+                new_index += 1
+
+        if old_count == new_count:
+            for index, level in enumerate(levels):
+                prices[index] = level['0']
+                sizes[index] = level['1']
+                counts[index] = int(level['2'])
+        else:
+            self.prices = array('d', [level['0'] for level in levels])
+            self.sizes = array('d', [level['1'] for level in levels])
+            self.counts = array('q', [int(level['2']) for level in levels])
+
+        self.entries = [level['3'] for level in levels]
+
+        return changes
+
+    def level(self, index: int) -> dict:
+        """Returns a price level with its market participant detail.
+
+        Arguments:
+        ----
+        index {int} -- The position of the level, 0 is the best price.
+
+        Returns:
+        ----
+        dict -- The price, size, order count and a list of `(mpid, size, time)` entries.
+        """
+
+        return {
+            'price': self.prices[index],
+            'size': self.sizes[index],
+            'count': self.counts[index],
+            'entries': [(entry['0'], entry['1'], entry['2']) for entry in self.entries[index]]
+        }
+
+    def best(self) -> Tuple[float, float]:
+        """Returns the price and size of the best level, or `None` if the side is empty."""
+
+        if not self.prices:
+            return None
+
+        return self.prices[0], self.sizes[0]
+
+    def total_size(self, levels: int = None) -> float:
+        """Returns the size of the best levels, or of the whole side if `levels` is not provided."""
+
+        return sum(self.sizes[:levels])
+
+    def depth_to_size(self, size: float) -> Tuple[float, float]:
+        """Returns how deep a given size would go into this side.
+
+        Arguments:
+        ----
+        size {float} -- The size to fill.
+
+        Returns:
+        ----
+        Tuple[float, float] -- The last price reached and the average price, or
+            `None` if the side doesn't hold enough size.
+        """
+
+        filled = 0
+        cost = 0.0
+
+        for price, level_size in zip(self.prices, self.sizes):
+
+            take = min(level_size, size - filled)
+            filled += take
+            cost += take * price
+
+            if filled >= size:
+                return price, cost / filled
+
+        return None
+
+
+class OrderBook():
+
+    """
+    The level two order book of a single symbol.
+
+    Each frame from the stream holds the full book, it's compared level by level
+    against the previous one, so the changes come out of the update for free.
+    """
+
+    __slots__ = ('service', 'symbol', 'timestamp', 'bids', 'asks', 'changes', 'updates')
+
+    def __init__(self, service: str, symbol: str) -> None:
+        """Initalizes the `OrderBook`.
+
+        Arguments:
+        ----
+        service {str} -- The level two service, for example `LISTED_BOOK`.
+
+        symbol {str} -- The symbol of the book.
+        """
+
+        self.service = service
+        self.symbol = symbol
+        self.timestamp: int = None
+        self.bids = BookSide(side='bid')
+        self.asks = BookSide(side='ask')
+        self.changes: List[LevelChange] = []
+        self.updates = 0
+
+    def __repr__(self) -> str:
+        return '<OrderBook (service={service}, symbol={symbol}, bids={bids}, asks={asks})>'.format(
+            service=self.service,
+            symbol=self.symbol,
+            bids=len(self.bids),
+            asks=len(self.asks)
+        )
+
+    def update(self, content_entry: dict) -> List[LevelChange]:
+        """Applies a frame of the book.
+
+        Arguments:
+        ----
+        content_entry {dict} -- One entry of the `content` of a level two message.
+
+        Returns:
+        ----
+        List[LevelChange] -- The levels that changed since the previous frame.
+        """
+
+        self.timestamp = content_entry.get('1')
+        bid_changes = self.bids.update(levels=content_entry.get('2', []))
+        ask_changes = self.asks.update(levels=content_entry.get('3', []))
+
+        self.changes = bid_changes + ask_changes
+        self.updates += 1
+
+        return self.changes
+
+    @property
+    def best_bid(self) -> Tuple[float, float]:
+        """Returns the price and size of the best bid, or `None`."""
+
+        return self.bids.best()
+
+    @property
+    def best_ask(self) -> Tuple[float, float]:
+        """Returns the price and size of the best ask, or `None`."""
+
+        return self.asks.best()
+
+    @property
+    def spread(self) -> float:
+        """Returns the difference between the best ask and the best bid, or `None`."""
+
+        if not self.bids.prices or not self.asks.prices:
+            return None
+
+        return self.asks.prices[0] - self.bids.prices[0]
+
+    @property
+    def mid_price(self) -> float:
+        """Returns the price halfway between the best bid and the best ask, or `None`."""
+
+        if not self.bids.prices or not self.asks.prices:
+            return None
+
+        return (self.asks.prices[0] + self.bids.prices[0]) / 2
+
+    def imbalance(self, levels: int = None) -> float:
+        """Returns how much of the size of the book is on the bid.
+
+        Arguments:
+        ----
+        levels {int} -- The number of levels of each side to look at, the
+            whole book if not provided. (default: {None})
+
+        Returns:
+        ----
+        float -- Between -1.0, only asks, and 1.0, only bids, or `None` if the book is empty.
+        """
+
+        bid_size = self.bids.total_size(levels=levels)
+        ask_size = self.asks.total_size(levels=levels)
+
+        if not bid_size and not ask_size:
+            return None
+
+        return (bid_size - ask_size) / (bid_size + ask_size)
+
+    def depth_to_size(self, side: str, size: float) -> Tuple[float, float]:
+        """Returns how deep a given size would go into the book.
+
+        Arguments:
+        ----
+        side {str} -- The side the size is taken from, `bid` to sell or `ask` to buy.
+
+        size {float} -- The size to fill.
+
+        Returns:
+        ----
+        Tuple[float, float] -- The last price reached and the average price, or
+            `None` if the side doesn't hold enough size.
+        """
+
+        book_side = self.bids if side == 'bid' else self.asks
+
+        return book_side.depth_to_size(size=size)
+
+
+class OrderBooks():
+
+    """
+    Keeps the order books of every streamed level two symbol.
+
+    The books are fed by the `TDStreamerClient`, which applies every
+    `LISTED_BOOK`, `NASDAQ_BOOK`, `OPTIONS_BOOK` and `FUTURES_BOOK` message.
+    """
+
+    def __init__(self) -> None:
+        """Initalizes the `OrderBooks`."""
+
+        self.books: Dict[Tuple[str, str], OrderBook] = {}
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def get(self, symbol: str, service: str = 'LISTED_BOOK') -> OrderBook:
+        """Returns the book of a symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol of the book.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The level two service. (default: {'LISTED_BOOK'})
+
+        Returns:
+        ----
+        OrderBook -- The book, or `None` if the symbol wasn't streamed yet.
+        """
+
+        return self.books.get((service, symbol))
+
+    def update_from_message(self, message: dict) -> List[OrderBook]:
+        """Applies the level two data of a decoded stream message.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+
+        Returns:
+        ----
+        List[OrderBook] -- The books that were updated.
+        """
+
+        updated = []
+
+        for service_result in message.get('data', ()):
+
+            service = service_result.get('service')
+
+            if service not in BOOK_SERVICES:
+                continue
+
+            for content_entry in service_result['content']:
+
+                book_key = (service, content_entry['key'])
+                order_book = self.books.get(book_key)
+
+                if order_book is None:
+                    order_book = self.books[book_key] = OrderBook(service=service, symbol=content_entry['key'])
+
+                order_book.update(content_entry=content_entry)
+                updated.append(order_book)
+
+        return updated
+
+    def clear(self) -> None:
+        """Removes every book."""
+
+        self.books.clear()
@@ -0,0 +1,339 @@
+import datetime
+import pathlib
+import time
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from td.records import SERVICE_FIELD_IDS
+from td.records import get_service_decoder
+
+
+def _to_bool(value: object) -> bool:
+    """Converts a number or a `true` / `false` string to a boolean."""
+
+    if isinstance(value, str):
+        if value.lower() not in ('true', 'false'):
+            raise ValueError('Not a boolean: {}'.format(value))
+        return value.lower() == 'true'
+
+    return bool(value)
+
+
+class ServiceColumns():
+
+    """
+    Buffers the records of a single service and date in columns.
+
+    Every field of the service decoder gets its own list, plus a `timestamp`
+    column with the time of the message the record came in.
+    """
+
+    def __init__(self, service: str) -> None:
+        """Initalizes the `ServiceColumns`.
+
+        Arguments:
+        ----
+        service {str} -- The name of the service, for example `TIMESALE_EQUITY`.
+        """
+
+        self.service = service
+        self.decoder = get_service_decoder(service=service)
+        self.names = ('timestamp',) + self.decoder.field_names
+        self.columns: Dict[str, list] = {name: [] for name in self.names}
+
+        self._timestamps = self.columns['timestamp']
+        self._appends = [self.columns[name].append for name in self.decoder.field_names]
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def append(self, timestamp: int, content: List[dict]) -> None:
+        """Adds the content of a data message.
+
+        Arguments:
+        ----
+        timestamp {int} -- The timestamp of the message.
+
+        content {List[dict]} -- The content section of the message.
+        """
+
+        appends = self._appends
+        field_ids = self.decoder.field_ids
+
+        for content_entry in content:
+            self._timestamps.append(timestamp)
+            for append, value in zip(appends, map(content_entry.get, field_ids)):
+                append(value)
+
+    def take(self) -> Dict[str, list]:
+        """Returns the buffered columns and starts new ones.
+
+        Returns:
+        ----
+        Dict[str, list] -- The values of each column.
+        """
+
+        columns = self.columns
+
+        self.columns = {name: [] for name in self.names}
+        self._timestamps = self.columns['timestamp']
+        self._appends = [self.columns[name].append for name in self.decoder.field_names]
+
+        return columns
+
+
+class ParquetSink():
+
+    """
+    Writes decoded stream messages to Parquet files, one column per field.
+
+    Records are buffered in columns per service and day, and written as a row
+    group once a buffer reaches `row_group_size` rows, or when `flush_interval`
+    seconds went by. The files are partitioned as `service=<SERVICE>/date=<DATE>`,
+    so they can be loaded with `pandas.read_parquet` or `pyarrow.dataset`.
+
+    Requires `pyarrow`, which can be installed with `pip install td-ameritrade-python-api[parquet]`.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], row_group_size: int = 50000, flush_interval: float = 60.0) -> None:
+        """Initalizes the `ParquetSink`.
+
+        Arguments:
+        ----
+        directory {Union[str, pathlib.Path]} -- The root directory of the dataset.
+
+        Keyword Arguments:
+        ----
+        row_group_size {int} -- The number of rows buffered for a service and
+            day before they're written. (default: {50000})
+
+        flush_interval {float} -- The maximum number of seconds records stay
+            in the buffers. (default: {60.0})
+        """
+
+        import pyarrow
+        import pyarrow.parquet
+
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+
+        self.directory = pathlib.Path(directory)
+        self.row_group_size = row_group_size
+        self.flush_interval = flush_interval
+
+        self._buffers: Dict[Tuple[str, str], ServiceColumns] = {}
+        self._types: Dict[str, Dict[str, object]] = {}
+        self._writers: Dict[Tuple[str, str], object] = {}
+        self._dates: Dict[int, str] = {}
+        self._parts = 0
+        self._last_flush = time.monotonic()
+
+        self._rows_written = 0
+        self._row_groups = 0
+        self._coerced = 0
+
+    def _date(self, timestamp: int) -> str:
+        """Returns the UTC date of a timestamp in milliseconds."""
+
+        day = timestamp // 86400000
+        date = self._dates.get(day)
+
+        if date is None:
+            day_start = datetime.datetime.fromtimestamp(day * 86400, tz=datetime.timezone.utc)
+            date = self._dates[day] = day_start.date().isoformat()
+
+        return date
+
+    def append(self, message: dict) -> None:
+        """Buffers a decoded stream message, and writes the full buffers.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        for service_result in message.get('data', ()):
+
+            service = service_result.get('service')
+
+            if service not in SERVICE_FIELD_IDS:
+                continue
+
+            timestamp = service_result.get('timestamp', 0)
+            partition = (service, self._date(timestamp=timestamp))
+
+            service_columns = self._buffers.get(partition)
+            if service_columns is None:
+                service_columns = self._buffers[partition] = ServiceColumns(service=service)
+
+            service_columns.append(timestamp=timestamp, content=service_result['content'])
+
+            if len(service_columns) >= self.row_group_size:
+                self._write(partition=partition)
+
+        self.commit()
+
+    def write(self, messages: List[dict]) -> None:
+        """Buffers a batch of decoded stream messages.
+
+        Arguments:
+        ----
+        messages {List[dict]} -- Decoded messages from the `TDStreamerClient`.
+        """
+
+        for message in messages:
+            self.append(message=message)
+
+    def commit(self) -> None:
+        """Writes every buffer if `flush_interval` seconds went by since the last flush."""
+
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes every buffer that holds records."""
+
+        for partition, service_columns in self._buffers.items():
+            if len(service_columns):
+                self._write(partition=partition)
+
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Writes the buffers and closes the files."""
+
+        self.flush()
+
+        for parquet_writer in self._writers.values():
+            parquet_writer.close()
+
+        self._writers.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Returns the sink counters.
+
+        Returns:
+        ----
+        dict -- The number of rows and row groups written, the rows waiting in
+            the buffers, the number of open files, and the number of values that
+            didn't match the type of their column and were converted, or left empty.
+        """
+
+        return {
+            'rows_written': self._rows_written,
+            'row_groups': self._row_groups,
+            'coerced_values': self._coerced,
+            'rows_buffered': sum(len(service_columns) for service_columns in self._buffers.values()),
+            'open_files': len(self._writers)
+        }
+
+    def _array(self, values: list, column_type: object) -> object:
+        """Builds the array of a column, converting the values that don't match its type.
+
+        A field that sometimes comes in as another type, a float in an int field
+        or a number as a string, is converted to the type of the column, and left
+        empty if it can't be, so one odd value doesn't fail the whole row group.
+        """
+
+        pyarrow = self._pyarrow
+
+        try:
+            return pyarrow.array(values, type=column_type)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, ValueError, OverflowError):
+            pass
+
+        # How a value is converted, and the types it already has if it's a match.
+        if column_type == pyarrow.float64():
+            convert, matches = float, (int, float)
+        elif column_type == pyarrow.string():
+            convert, matches = str, (str,)
+        elif column_type == pyarrow.bool_():
+            convert, matches = _to_bool, (bool,)
+        else:
+            convert, matches = None, ()
+
+        coerced_values = []
+
+        for value in values:
+
+            if value is not None:
+                try:
+                    coerced_value = convert(value) if convert else pyarrow.array([value], type=column_type)[0].as_py()
+                except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, TypeError, ValueError, OverflowError):
+                    coerced_value = None
+                if coerced_value is None or not isinstance(value, matches) or coerced_value != value:
+                    self._coerced += 1
+                value = coerced_value
+
+            coerced_values.append(value)
+
+        return pyarrow.array(coerced_values, type=column_type)
+
+    def _write(self, partition: Tuple[str, str]) -> None:
+        """Writes the buffer of a partition as a row group."""
+
+        pyarrow = self._pyarrow
+        service = partition[0]
+        columns = self._buffers[partition].take()
+
+        # The type of a column is fixed by the first value it gets, so every
+        # row group of the service has the same schema, and a column without
+        # values yet is a placeholder until it gets one.
+        column_types = self._types.setdefault(service, {'timestamp': pyarrow.int64()})
+        arrays = {}
+
+        for name, values in columns.items():
+
+            column_type = column_types.get(name)
+
+            if column_type is None:
+
+                first_value = next((value for value in values if value is not None), None)
+
+                # Numbers are stored as doubles, a field can come in as an int or a float.
+                if isinstance(first_value, bool):
+                    column_type = pyarrow.bool_()
+                elif isinstance(first_value, (int, float)):
+                    column_type = pyarrow.float64()
+                elif isinstance(first_value, str):
+                    column_type = pyarrow.string()
+                elif first_value is not None:
+                    column_type = pyarrow.array([first_value]).type
+
+                if column_type is not None:
+                    column_types[name] = column_type
+                else:
+                    column_type = pyarrow.float64()
+
+            arrays[name] = self._array(values=values, column_type=column_type)
+
+        table = pyarrow.table(arrays)
+        rows = table.num_rows
+
+        parquet_writer = self._writers.get(partition)
+
+        # A new set of columns, or a column of another type, goes to a new file.
+        if parquet_writer is not None and not parquet_writer.schema.equals(table.schema):
+            parquet_writer.close()
+            parquet_writer = None
+
+        if parquet_writer is None:
+
+            date = partition[1]
+            partition_path = self.directory.joinpath('service={}'.format(service), 'date={}'.format(date))
+            partition_path.mkdir(parents=True, exist_ok=True)
+
+            self._parts += 1
+            file_name = 'part-{parts:05d}-{time}.parquet'.format(parts=self._parts, time=int(time.time()))
+            file_path = partition_path.joinpath(file_name)
+
+            parquet_writer = self._writers[partition] = self._parquet.ParquetWriter(str(file_path), table.schema)
+
+        parquet_writer.write_table(table, row_group_size=rows)
+
+        self._rows_written += rows
+        self._row_groups += 1
@@ -0,0 +1,375 @@
+import asyncio
+import collections
+import csv
+import json
+import os
+import threading
+import time
+
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+
+# What happens to a message when the ring buffer is full.
+PERSISTENCE_OVERFLOW_POLICIES = ['block', 'drop_oldest']
+
+
+class CsvSink():
+
+    """
+    Writes decoded stream messages to the level one and level two CSV files.
+
+    The rows are built by the `TDStreamerClient`, the sink only owns the
+    files, so it can be driven by the `PersistenceWriter` thread.
+    """
+
+    def __init__(self, file_path: str, rows: Callable[[dict], Tuple[List[list], List[list]]],
+                 append_mode: bool = True) -> None:
+        """Initalizes the `CsvSink` and opens the files.
+
+        Arguments:
+        ----
+        file_path {str} -- The level one CSV file, the level two rows go to
+            the same path ending in `_level_2.csv`.
+
+        rows {Callable[[dict], Tuple[List[list], List[list]]]} -- Returns the
+            level one and level two rows of a message.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- `True` to add to the existing files, `False` to
+            start new ones. (default: {True})
+        """
+
+        self.file_path = file_path
+        self.file_path_level_2 = file_path.replace('.csv', '_level_2.csv')
+        self.rows = rows
+
+        mode = 'a+' if append_mode else 'w+'
+
+        self.file_level_1 = open(file=self.file_path, mode=mode, newline='')
+        self.file_level_2 = open(file=self.file_path_level_2, mode=mode, newline='')
+
+        self._writer_level_1 = csv.writer(self.file_level_1)
+        self._writer_level_2 = csv.writer(self.file_level_2)
+
+    def write(self, messages: List[dict]) -> None:
+        """Writes the rows of a batch of messages.
+
+        Arguments:
+        ----
+        messages {List[dict]} -- Decoded messages from the `TDStreamerClient`.
+        """
+
+        for message in messages:
+            rows_level_1, rows_level_2 = self.rows(message)
+            self._writer_level_1.writerows(rows_level_1)
+            self._writer_level_2.writerows(rows_level_2)
+
+    def commit(self) -> None:
+        """Flushes the files and syncs them to disk."""
+
+        for csv_file in (self.file_level_1, self.file_level_2):
+            csv_file.flush()
+            os.fsync(csv_file.fileno())
+
+    def close(self) -> None:
+        """Closes the files."""
+
+        self.file_level_1.close()
+        self.file_level_2.close()
+
+
+class FrameSink():
+
+    """
+    Records the raw frames of a stream, so the session can be replayed.
+
+    Each line of the file is a JSON list, `[time received, frame]`, the
+    format read by `ReplayServer.from_recording`.
+    """
+
+    def __init__(self, file_path: str, append_mode: bool = False) -> None:
+        """Initalizes the `FrameSink` and opens the file.
+
+        Arguments:
+        ----
+        file_path {str} -- The file the frames are recorded to.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- `True` to add to an existing recording, `False` to
+            start a new one. (default: {False})
+        """
+
+        self.file_path = file_path
+        self.file = open(file=file_path, mode='a' if append_mode else 'w')
+
+    def write(self, messages: List[Tuple[float, str]]) -> None:
+        """Writes a batch of frames.
+
+        Arguments:
+        ----
+        messages {List[Tuple[float, str]]} -- The time each frame was received, and the frame.
+        """
+
+        self.file.writelines(json.dumps([received, frame]) + '\n' for received, frame in messages)
+
+    def commit(self) -> None:
+        """Flushes the file."""
+
+        self.file.flush()
+
+    def close(self) -> None:
+        """Closes the file."""
+
+        self.file.close()
+
+
+class PersistenceWriter():
+
+    """
+    Hands decoded stream messages to a dedicated writer thread.
+
+    Messages go into a bounded ring buffer, the thread takes everything that's
+    waiting, hands the batch to each sink and commits it with a single flush,
+    at most once every `flush_interval` seconds. The sinks are any object with
+    `write(messages)`, `commit()` and `close()` methods, they're only ever
+    called from the writer thread, so the event loop never touches the disk.
+    """
+
+    def __init__(self, capacity: int = 10000, flush_interval: float = 0.5, overflow: str = 'block') -> None:
+        """Initalizes the `PersistenceWriter` and starts its thread.
+
+        Keyword Arguments:
+        ----
+        capacity {int} -- The maximum number of messages waiting to be
+            written. (default: {10000})
+
+        flush_interval {float} -- The minimum number of seconds between two
+            commits, messages that come in meanwhile go in the same one. (default: {0.5})
+
+        overflow {str} -- What to do when the ring buffer is full, `block`
+            waits for the writer to catch up, `drop_oldest` drops the oldest
+            waiting message. (default: {'block'})
+        """
+
+        if overflow not in PERSISTENCE_OVERFLOW_POLICIES:
+            raise ValueError(
+                'Invalid overflow policy, please choose a valid one: {}'.format(', '.join(PERSISTENCE_OVERFLOW_POLICIES))
+            )
+
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.sinks = []
+
+        # (time queued, message) pairs.
+        self._buffer = collections.deque()
+        self._condition = threading.Condition()
+        self._closing = False
+
+        self._received = 0
+        self._written = 0
+        self._dropped = 0
+        self._commits = 0
+        self._errors = 0
+        self._last_commit = 0.0
+        self._commit_time = 0.0
+        self._lag = 0.0
+        self.error: Exception = None
+
+        self._thread = threading.Thread(target=self._run, name='PersistenceWriter', daemon=True)
+        self._thread.start()
+
+    def add_sink(self, sink: object) -> None:
+        """Adds a sink, it gets every message queued from now on.
+
+        Arguments:
+        ----
+        sink {object} -- An object with `write`, `commit` and `close` methods.
+        """
+
+        with self._condition:
+            self.sinks = self.sinks + [sink]
+
+    def try_append(self, message: dict) -> bool:
+        """Queues a decoded stream message if there's room, it never waits.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+
+        Returns:
+        ----
+        bool -- `False` if the buffer is full and the `block` policy makes
+            the message wait for room, it wasn't queued.
+        """
+
+        with self._condition:
+
+            if self._closing:
+                return True
+
+            if len(self._buffer) >= self.capacity:
+                if self.overflow != 'drop_oldest':
+                    return False
+                self._buffer.popleft()
+                self._dropped += 1
+
+            self._put(message=message)
+
+            return True
+
+    def append(self, message: dict) -> None:
+        """Queues a decoded stream message to be written, waiting for room if needed.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        with self._condition:
+
+            if self._closing:
+                return
+
+            while len(self._buffer) >= self.capacity:
+                if self.overflow == 'drop_oldest':
+                    self._buffer.popleft()
+                    self._dropped += 1
+                else:
+                    self._condition.wait()
+
+            self._put(message=message)
+
+    async def append_async(self, message: dict) -> None:
+        """Queues a decoded stream message from the event loop.
+
+        If the buffer is full and the `block` policy makes the message wait,
+        it waits in the executor, so only the coroutine that appends waits for
+        the writer to catch up, the other tasks of the loop keep running.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        if not self.try_append(message=message):
+            await asyncio.get_running_loop().run_in_executor(None, self.append, message)
+
+    def _put(self, message: dict) -> None:
+        """Adds a message to the buffer, the condition is held by the caller."""
+
+        self._buffer.append((time.monotonic(), message))
+        self._received += 1
+        self._condition.notify_all()
+
+    def close(self) -> None:
+        """Writes the queued messages, closes the sinks and stops the thread."""
+
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+
+        if self._thread.is_alive():
+            self._thread.join()
+
+    @property
+    def failed(self) -> bool:
+        """Returns `True` if a sink raised an error."""
+
+        return self.error is not None
+
+    @property
+    def stats(self) -> dict:
+        """Returns the writer counters.
+
+        Returns:
+        ----
+        dict -- The messages received, written and dropped, the number of
+            commits and errors, the messages waiting, and the lag, the seconds
+            the oldest waiting message has been in the buffer, or the seconds
+            the last written batch waited if nothing is waiting.
+        """
+
+        with self._condition:
+
+            if self._buffer:
+                lag = time.monotonic() - self._buffer[0][0]
+            else:
+                lag = self._lag
+
+            return {
+                'received': self._received,
+                'written': self._written,
+                'dropped': self._dropped,
+                'commits': self._commits,
+                'errors': self._errors,
+                'depth': len(self._buffer),
+                'capacity': self.capacity,
+                'lag': lag,
+                'commit_time': self._commit_time
+            }
+
+    def _take(self) -> List[Tuple[float, dict]]:
+        """Waits for messages and takes every one of them."""
+
+        with self._condition:
+
+            while not self._buffer and not self._closing:
+                self._condition.wait()
+
+            # Give the other messages a chance to join this commit, unless the
+            # buffer is full or the writer is closing.
+            while len(self._buffer) < self.capacity and not self._closing:
+                wait = self._last_commit + self.flush_interval - time.monotonic()
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+
+            batch = list(self._buffer)
+            self._buffer.clear()
+            self._condition.notify_all()
+
+            return batch
+
+    def _run(self) -> None:
+        """Commits the queued messages in batches until closed."""
+
+        while True:
+
+            batch = self._take()
+
+            if batch:
+                self._commit(batch=batch)
+            elif self._closing:
+                break
+
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as error:
+                self._errors += 1
+                self.error = error
+
+    def _commit(self, batch: List[Tuple[float, dict]]) -> None:
+        """Writes a batch to every sink and commits it."""
+
+        messages = [message for _, message in batch]
+        start = time.monotonic()
+
+        for sink in self.sinks:
+            try:
+                sink.write(messages)
+                sink.commit()
+            except Exception as error:
+                self._errors += 1
+                self.error = error
+
+        self._last_commit = time.monotonic()
+        self._commit_time = self._last_commit - start
+        self._lag = self._last_commit - batch[0][0]
+        self._written += len(messages)
+        self._commits += 1
@@ -0,0 +1,255 @@
+import asyncio
+import threading
+import time
+
+from typing import Callable
+from typing import Dict
+from typing import List
+
+
+class QuoteBatcher():
+
+    """
+    Coalesces concurrent `get_quotes` calls into a single request.
+
+    The first caller of a batch becomes its leader, it waits for a short window
+    while other callers add their symbols, then fetches the union of all symbols,
+    chunked so no request is over the symbol or URL length limits. Every caller
+    gets back only the quotes for the symbols it asked for.
+    """
+
+    def __init__(self, fetch_quotes: Callable, window: float = 0.005, max_symbols: int = 300,
+                 max_length: int = 2000) -> None:
+        """Initalizes the `QuoteBatcher`.
+
+        Arguments:
+        ----
+        fetch_quotes {Callable} -- The function that fetches the quotes for
+            a list of symbols, in a single request.
+
+        Keyword Arguments:
+        ----
+        window {float} -- The number of seconds a batch stays open for other
+            callers. (default: {0.005})
+
+        max_symbols {int} -- The maximum number of symbols in a single request. (default: {300})
+
+        max_length {int} -- The maximum length of the comma separated symbol
+            list in a single request. (default: {2000})
+        """
+
+        self.fetch_quotes = fetch_quotes
+        self.window = window
+        self.max_symbols = max_symbols
+        self.max_length = max_length
+
+        self._lock = threading.Lock()
+        self._pending: _QuoteBatch = None
+
+        self._calls = 0
+        self._batches = 0
+        self._requests = 0
+
+    def _chunk_symbols(self, symbols: List[str]) -> List[List[str]]:
+        """Splits symbols into chunks that fit in a single request.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols to split.
+
+        Returns:
+        ----
+        List[List[str]] -- The symbol chunks.
+        """
+
+        chunks = []
+        chunk = []
+        chunk_length = 0
+
+        for symbol in symbols:
+
+            # The length of the symbol plus the comma in front of it.
+            symbol_length = len(symbol) + 1
+
+            if chunk and (len(chunk) >= self.max_symbols or chunk_length + symbol_length > self.max_length):
+                chunks.append(chunk)
+                chunk = []
+                chunk_length = 0
+
+            chunk.append(symbol)
+            chunk_length += symbol_length
+
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    def _normalize_symbols(self, instruments: List[str]) -> List[str]:
+        """Upper cases and strips the symbols, the way the API keys its quotes.
+
+        Arguments:
+        ----
+        instruments {List[str]} -- The symbols as the caller spelled them.
+
+        Returns:
+        ----
+        List[str] -- The symbols, as they're batched and looked up.
+        """
+
+        return [symbol.strip().upper() for symbol in instruments]
+
+    def _join_batch(self, instruments: List[str]) -> tuple:
+        """Adds the symbols to the open batch, or opens a new one.
+
+        Returns:
+        ----
+        tuple -- The batch, and `True` if the caller is its leader.
+        """
+
+        with self._lock:
+
+            self._calls += 1
+
+            if self._pending is None:
+                self._pending = _QuoteBatch()
+                leader = True
+            else:
+                leader = False
+
+            batch = self._pending
+            batch.symbols.update(instruments)
+
+        return batch, leader
+
+    def _close_batch(self, batch: '_QuoteBatch') -> List[List[str]]:
+        """Closes a batch to new callers and returns its request chunks."""
+
+        with self._lock:
+
+            if self._pending is batch:
+                self._pending = None
+
+            chunks = self._chunk_symbols(symbols=sorted(batch.symbols))
+
+            self._batches += 1
+            self._requests += len(chunks)
+
+        return chunks
+
+    def _filter_quotes(self, batch: '_QuoteBatch', instruments: List[str]) -> Dict:
+        """Returns only the quotes the caller asked for."""
+
+        if batch.error is not None:
+            raise batch.error
+
+        return {symbol: batch.quotes[symbol] for symbol in instruments if symbol in batch.quotes}
+
+    def get_quotes(self, instruments: List[str]) -> Dict:
+        """Grabs quotes, sharing the request with other concurrent callers.
+
+        Arguments:
+        ----
+        instruments {List[str]} -- A list of different financial instruments.
+
+        Returns:
+        ----
+        Dict -- The quotes of the requested instruments.
+        """
+
+        instruments = self._normalize_symbols(instruments=instruments)
+        batch, leader = self._join_batch(instruments=instruments)
+
+        if leader:
+
+            # Give the other callers a chance to join.
+            time.sleep(self.window)
+
+            try:
+                for chunk in self._close_batch(batch=batch):
+                    batch.quotes.update(self.fetch_quotes(chunk))
+            except Exception as error:
+                batch.error = error
+            finally:
+                batch.done.set()
+
+        else:
+            batch.done.wait()
+
+        return self._filter_quotes(batch=batch, instruments=instruments)
+
+    @property
+    def stats(self) -> dict:
+        """Returns the batching counters.
+
+        Returns:
+        ----
+        dict -- The number of `get_quotes` calls, batches and requests
+            that were actually sent.
+        """
+
+        with self._lock:
+            return {
+                'calls': self._calls,
+                'batches': self._batches,
+                'requests': self._requests
+            }
+
+
+class AsyncQuoteBatcher(QuoteBatcher):
+
+    """
+    The `asyncio` version of the `QuoteBatcher`, where `fetch_quotes` is
+    a coroutine function. Callers on the same event loop share a request.
+    """
+
+    async def get_quotes(self, instruments: List[str]) -> Dict:
+        """Grabs quotes, sharing the request with other concurrent callers.
+
+        Arguments:
+        ----
+        instruments {List[str]} -- A list of different financial instruments.
+
+        Returns:
+        ----
+        Dict -- The quotes of the requested instruments.
+        """
+
+        instruments = self._normalize_symbols(instruments=instruments)
+        batch, leader = self._join_batch(instruments=instruments)
+
+        if leader:
+
+            batch.done_async = asyncio.Event()
+
+            # Give the other callers a chance to join.
+            await asyncio.sleep(self.window)
+
+            try:
+                chunks = self._close_batch(batch=batch)
+                results = await asyncio.gather(
+                    *[self.fetch_quotes(chunk) for chunk in chunks]
+                )
+                for result in results:
+                    batch.quotes.update(result)
+            except Exception as error:
+                batch.error = error
+            finally:
+                batch.done.set()
+                batch.done_async.set()
+
+        else:
+            await batch.done_async.wait()
+
+        return self._filter_quotes(batch=batch, instruments=instruments)
+
+
+class _QuoteBatch():
+
+    """The symbols, result and completion flags of a single batch."""
+
+    def __init__(self) -> None:
+        self.symbols = set()
+        self.quotes = {}
+        self.error: Exception = None
+        self.done = threading.Event()
+        self.done_async: asyncio.Event = None
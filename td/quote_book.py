@@ -0,0 +1,330 @@
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+from td.records import get_service_decoder
+
+
+# The services that only send the fields that changed.
+LEVEL_ONE_SERVICES = [
+    'QUOTE',
+    'OPTION',
+    'LEVELONE_FUTURES',
+    'LEVELONE_FOREX',
+    'LEVELONE_FUTURES_OPTIONS'
+]
+
+
+class QuoteTable():
+
+    """
+    The latest full quote of every symbol of a level one service.
+
+    Each symbol owns a fixed row with one slot per field, level one updates
+    are written into the slots of the fields they carry, so no dictionaries
+    are merged and reading the latest quote of a symbol is a single lookup.
+    """
+
+    def __init__(self, service: str) -> None:
+        """Initalizes the `QuoteTable`.
+
+        Arguments:
+        ----
+        service {str} -- The level one service, for example `QUOTE`.
+        """
+
+        self.service = service
+        self.decoder = get_service_decoder(service=service)
+
+        # field id -> slot, and field name -> slot.
+        self._slots = {field_id: slot for slot, field_id in enumerate(self.decoder.field_ids)}
+        self._name_slots = {name: slot for slot, name in enumerate(self.decoder.field_names)}
+
+        self._rows: Dict[str, list] = {}
+
+        # field id -> the watchers of that field.
+        self._watchers: Dict[str, list] = {}
+
+        # The watcher calls that raised, and the last error.
+        self.errors = 0
+        self.error: Exception = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    @property
+    def symbols(self) -> List[str]:
+        """Returns the symbols in the table."""
+
+        return list(self._rows)
+
+    def update(self, content: List[dict]) -> None:
+        """Applies the content of a level one message.
+
+        Arguments:
+        ----
+        content {List[dict]} -- The content section of a data message.
+        """
+
+        slots = self._slots
+        rows = self._rows
+        watchers = self._watchers
+        field_count = len(slots)
+
+        for content_entry in content:
+
+            symbol = content_entry['key']
+            row = rows.get(symbol)
+
+            if row is None:
+                row = rows[symbol] = [None] * field_count
+
+            for field_id, field_value in content_entry.items():
+                slot = slots.get(field_id)
+                if slot is not None:
+                    row[slot] = field_value
+
+            if watchers:
+                self._notify(symbol=symbol, row=row, content_entry=content_entry)
+
+    def _notify(self, symbol: str, row: list, content_entry: dict) -> None:
+        """Calls the watchers of the fields an update changed."""
+
+        # A watcher of several fields is only called once.
+        notified = {}
+
+        for field_id in content_entry:
+            for watcher in self._watchers.get(field_id, ()):
+                if watcher[1] is None or symbol in watcher[1]:
+                    notified[id(watcher)] = watcher
+
+        if notified:
+            record = self.decoder.record_class._make(row)
+            for watcher in notified.values():
+
+                # A failing watcher mustn't stop the stream, or the other watchers.
+                try:
+                    watcher[0](record)
+                except Exception as watcher_error:
+                    self.errors += 1
+                    self.error = watcher_error
+
+    def get(self, symbol: str) -> tuple:
+        """Returns the latest full quote of a symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol to look up.
+
+        Returns:
+        ----
+        tuple -- The quote record, or `None` if the symbol wasn't streamed yet.
+        """
+
+        row = self._rows.get(symbol)
+
+        if row is None:
+            return None
+
+        return self.decoder.record_class._make(row)
+
+    def get_field(self, symbol: str, field: str) -> object:
+        """Returns the latest value of a single field.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol to look up.
+
+        field {str} -- The field name, for example `bid_price`.
+
+        Returns:
+        ----
+        object -- The value, or `None` if it wasn't streamed yet.
+        """
+
+        row = self._rows.get(symbol)
+
+        if row is None:
+            return None
+
+        return row[self._name_slots[field]]
+
+    def watch(self, callback: Callable[[tuple], None], fields: Iterable[str], symbols: Iterable[str] = None) -> tuple:
+        """Calls a function whenever one of a set of fields is updated.
+
+        Arguments:
+        ----
+        callback {Callable[[tuple], None]} -- Called with the full quote record.
+
+        fields {Iterable[str]} -- The field names to watch, for example `['bid_price', 'ask_price']`.
+
+        Keyword Arguments:
+        ----
+        symbols {Iterable[str]} -- Only watch these symbols, all of them if
+            not provided. (default: {None})
+
+        Returns:
+        ----
+        tuple -- The watcher, used to stop watching.
+        """
+
+        fields = list(fields)
+        unknown_fields = [field for field in fields if field not in self._name_slots]
+
+        if unknown_fields:
+            raise ValueError('Invalid fields for the {service} service: {fields}'.format(
+                service=self.service,
+                fields=', '.join(unknown_fields)
+            ))
+
+        watcher = (callback, frozenset(symbols) if symbols is not None else None)
+
+        for field in fields:
+            field_id = self.decoder.field_ids[self._name_slots[field]]
+            self._watchers.setdefault(field_id, []).append(watcher)
+
+        return watcher
+
+    def unwatch(self, watcher: tuple) -> None:
+        """Stops calling a watcher.
+
+        Arguments:
+        ----
+        watcher {tuple} -- The watcher returned by `watch`.
+        """
+
+        for field_id in list(self._watchers):
+
+            field_watchers = [other for other in self._watchers[field_id] if other is not watcher]
+
+            if field_watchers:
+                self._watchers[field_id] = field_watchers
+            else:
+                del self._watchers[field_id]
+
+    def clear(self) -> None:
+        """Removes every symbol from the table."""
+
+        self._rows.clear()
+
+
+class QuoteBook():
+
+    """
+    Keeps the latest full quote of every streamed level one symbol.
+
+    The book is fed by the `TDStreamerClient`, which applies every level
+    one message to the table of its service.
+    """
+
+    def __init__(self) -> None:
+        """Initalizes the `QuoteBook`."""
+
+        self.tables: Dict[str, QuoteTable] = {}
+
+    @property
+    def errors(self) -> int:
+        """Returns the number of watcher calls that raised, the errors are kept on each table."""
+
+        return sum(quote_table.errors for quote_table in self.tables.values())
+
+    def table(self, service: str = 'QUOTE') -> QuoteTable:
+        """Returns the table of a service, creating it the first time.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The level one service. (default: {'QUOTE'})
+
+        Returns:
+        ----
+        QuoteTable -- The quotes of the service.
+        """
+
+        quote_table = self.tables.get(service)
+
+        if quote_table is None:
+
+            if service not in LEVEL_ONE_SERVICES:
+                raise ValueError('Invalid service, please choose a valid one: {}'.format(', '.join(LEVEL_ONE_SERVICES)))
+
+            quote_table = self.tables[service] = QuoteTable(service=service)
+
+        return quote_table
+
+    def get(self, symbol: str, service: str = 'QUOTE') -> tuple:
+        """Returns the latest full quote of a symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol to look up.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The level one service. (default: {'QUOTE'})
+
+        Returns:
+        ----
+        tuple -- The quote record, or `None` if the symbol wasn't streamed yet.
+        """
+
+        return self.table(service=service).get(symbol=symbol)
+
+    def watch(self, callback: Callable[[tuple], None], fields: Iterable[str], symbols: Iterable[str] = None,
+              service: str = 'QUOTE') -> tuple:
+        """Calls a function whenever one of a set of fields is updated.
+
+        Arguments:
+        ----
+        callback {Callable[[tuple], None]} -- Called with the full quote record.
+
+        fields {Iterable[str]} -- The field names to watch.
+
+        Keyword Arguments:
+        ----
+        symbols {Iterable[str]} -- Only watch these symbols, all of them if
+            not provided. (default: {None})
+
+        service {str} -- The level one service. (default: {'QUOTE'})
+
+        Returns:
+        ----
+        tuple -- The watcher, used to stop watching.
+        """
+
+        return self.table(service=service).watch(callback=callback, fields=fields, symbols=symbols)
+
+    def unwatch(self, watcher: tuple, service: str = 'QUOTE') -> None:
+        """Stops calling a watcher.
+
+        Arguments:
+        ----
+        watcher {tuple} -- The watcher returned by `watch`.
+
+        Keyword Arguments:
+        ----
+        service {str} -- The level one service. (default: {'QUOTE'})
+        """
+
+        self.table(service=service).unwatch(watcher=watcher)
+
+    def update_from_message(self, message: dict) -> None:
+        """Applies the level one data of a decoded stream message.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        for service_result in message.get('data', ()):
+            if service_result.get('service') in LEVEL_ONE_SERVICES:
+                self.table(service=service_result['service']).update(content=service_result['content'])
+
+    def clear(self) -> None:
+        """Removes every symbol from the book."""
+
+        for quote_table in self.tables.values():
+            quote_table.clear()
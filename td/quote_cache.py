@@ -0,0 +1,274 @@
+import threading
+import time
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+from td.enums import LEVEL_ONE_QUOTE_REST_KEYS
+
+
+def _normalize_symbol(symbol: str) -> str:
+    """Upper cases and strips a symbol, the way the API keys its quotes."""
+
+    return symbol.strip().upper()
+
+
+class QuoteCache():
+
+    """
+    An in-memory quote cache that sits in front of `TDClient.get_quotes`.
+
+    Quotes fetched over REST are kept for `ttl` seconds. Symbols with an active
+    `level_one_quotes` subscription are kept up to date by the `TDStreamerClient`
+    and don't expire while the subscription is active, so reads for them never
+    leave the process. The stream only fills in the fields it carries, so a
+    symbol is only served from the cache once a REST quote was stored for it.
+    """
+
+    def __init__(self, ttl: float = 1.0) -> None:
+        """Initalizes the `QuoteCache`.
+
+        Keyword Arguments:
+        ----
+        ttl {float} -- The number of seconds a REST quote stays fresh. (default: {1.0})
+        """
+
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+
+        # symbol -> [quote, time updated, has a REST quote]
+        self._quotes: Dict[str, list] = {}
+
+        # Symbols with an active stream subscription, and the ones that already got stream data.
+        self._subscribed = set()
+        self._live = set()
+
+        self._hits = 0
+        self._live_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._total_age = 0.0
+        self._max_age = 0.0
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def __contains__(self, symbol: str) -> bool:
+        return _normalize_symbol(symbol) in self._quotes
+
+    def get_many(self, symbols: List[str]) -> Tuple[Dict, List[str]]:
+        """Grabs the fresh quotes for a list of symbols.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols to look up, in any case.
+
+        Returns:
+        ----
+        Tuple[Dict, List[str]] -- The cached quotes, and the symbols that
+            were missing or stale and need to be fetched, both upper cased
+            like the keys of a `get_quotes` response.
+        """
+
+        quotes = {}
+        missing = []
+        now = time.monotonic()
+
+        with self._lock:
+
+            for symbol in map(_normalize_symbol, symbols):
+
+                entry = self._quotes.get(symbol)
+
+                # Only the streamed fields, the rest of the quote has to be fetched.
+                if entry is None or not entry[2]:
+                    self._misses += 1
+                    missing.append(symbol)
+                    continue
+
+                age = now - entry[1]
+
+                if symbol in self._live:
+                    self._live_hits += 1
+                elif age > self.ttl:
+                    self._expired += 1
+                    self._misses += 1
+                    missing.append(symbol)
+                    continue
+
+                self._hits += 1
+                self._total_age += age
+                self._max_age = max(self._max_age, age)
+
+                quotes[symbol] = dict(entry[0])
+
+        return quotes, missing
+
+    def get(self, symbol: str) -> dict:
+        """Grabs the fresh quote for a single symbol.
+
+        Arguments:
+        ----
+        symbol {str} -- The symbol to look up.
+
+        Returns:
+        ----
+        dict -- The quote, or `None` if it's missing or stale.
+        """
+
+        quotes, _ = self.get_many(symbols=[symbol])
+
+        return quotes.get(_normalize_symbol(symbol))
+
+    def put_many(self, quotes: Dict[str, dict]) -> None:
+        """Stores the quotes of a `get_quotes` response.
+
+        Arguments:
+        ----
+        quotes {Dict[str, dict]} -- The `get_quotes` response.
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+            for symbol, quote in quotes.items():
+
+                symbol = _normalize_symbol(symbol)
+                entry = self._quotes.get(symbol)
+
+                # Keep the fields the stream already filled in.
+                if entry is not None and symbol in self._live:
+                    entry[0] = dict(quote, **entry[0])
+                    entry[2] = True
+                else:
+                    self._quotes[symbol] = [dict(quote), now, True]
+
+    def subscribe(self, symbols: List[str]) -> None:
+        """Marks symbols as streamed, so they're kept fresh by the stream.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols of a `level_one_quotes` subscription.
+        """
+
+        with self._lock:
+            self._subscribed.update(map(_normalize_symbol, symbols))
+
+    def unsubscribe(self, symbols: List[str] = None) -> None:
+        """Marks symbols as no longer streamed, they expire normally again.
+
+        Keyword Arguments:
+        ----
+        symbols {List[str]} -- The symbols to unsubscribe, all of
+            them if not provided. (default: {None})
+        """
+
+        now = time.monotonic()
+
+        with self._lock:
+
+            if symbols is None:
+                symbols = list(self._subscribed)
+
+            for symbol in map(_normalize_symbol, symbols):
+
+                self._subscribed.discard(symbol)
+
+                # Start the TTL from now, the quote was fresh until the stream stopped.
+                if symbol in self._live:
+                    self._live.discard(symbol)
+                    self._quotes[symbol][1] = now
+
+    def interrupt(self) -> None:
+        """Marks the streamed symbols as not live, while the stream is down.
+
+        Their quotes age from their last stream update again, so they're
+        fetched over REST once they're stale, and they're live again with
+        the next stream update.
+        """
+
+        with self._lock:
+            self._live.clear()
+
+    def update_from_stream(self, content: List[dict]) -> None:
+        """Merges the content of a LEVELONE_QUOTES message into the cache.
+
+        Stream messages only carry the fields that changed, so they are merged
+        into the existing quote using the `get_quotes` field names.
+
+        Arguments:
+        ----
+        content {List[dict]} -- The content section of a `QUOTE` service message.
+        """
+
+        rest_keys = LEVEL_ONE_QUOTE_REST_KEYS
+        now = time.monotonic()
+
+        with self._lock:
+            for quote_update in content:
+
+                symbol = quote_update['key']
+
+                if symbol not in self._subscribed:
+                    continue
+
+                entry = self._quotes.get(symbol)
+                if entry is None:
+                    entry = self._quotes[symbol] = [{}, now, False]
+
+                quote = entry[0]
+                for field_key, field_value in quote_update.items():
+                    rest_key = rest_keys.get(field_key)
+                    if rest_key is not None:
+                        quote[rest_key] = field_value
+
+                entry[1] = now
+                self._live.add(symbol)
+
+    def update_from_message(self, message: dict) -> None:
+        """Feeds a decoded stream message to the cache.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        for service_result in message.get('data', ()):
+            if service_result.get('service') == 'QUOTE':
+                self.update_from_stream(content=service_result['content'])
+
+    def clear(self) -> None:
+        """Removes every quote from the cache."""
+
+        with self._lock:
+            self._quotes.clear()
+            self._live.clear()
+
+    @property
+    def stats(self) -> dict:
+        """Returns the cache counters, used to tune the TTL.
+
+        Returns:
+        ----
+        dict -- The number of hits, the hits served by the stream, the misses,
+            the misses caused by an expired quote, the hit rate, and the average
+            and maximum age in seconds of the quotes that were served.
+        """
+
+        with self._lock:
+
+            lookups = self._hits + self._misses
+
+            return {
+                'hits': self._hits,
+                'live_hits': self._live_hits,
+                'misses': self._misses,
+                'expired': self._expired,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'average_age': self._total_age / self._hits if self._hits else 0.0,
+                'max_age': self._max_age,
+                'size': len(self._quotes),
+                'live_symbols': len(self._live)
+            }
@@ -0,0 +1,216 @@
+import re
+
+from collections import namedtuple
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+from td.enums import CSV_FIELD_KEYS
+from td.enums import STREAM_FIELD_IDS
+
+
+# Where the field ids of each service are defined, the level one and
+# equity chart ids come from the subscription fields, the others from
+# the fields the CSV writer knows about.
+SERVICE_FIELD_IDS = {
+    'QUOTE': STREAM_FIELD_IDS['level_one_quote'],
+    'OPTION': STREAM_FIELD_IDS['level_one_option'],
+    'LEVELONE_FUTURES': STREAM_FIELD_IDS['level_one_futures'],
+    'LEVELONE_FOREX': STREAM_FIELD_IDS['level_one_forex'],
+    'LEVELONE_FUTURES_OPTIONS': STREAM_FIELD_IDS['level_one_futures_options'],
+    'CHART_EQUITY': STREAM_FIELD_IDS['chart_equity'],
+    'CHART_FUTURES': CSV_FIELD_KEYS['CHART_FUTURES'],
+    'CHART_OPTIONS': CSV_FIELD_KEYS['CHART_OPTIONS'],
+    'NEWS_HEADLINE': CSV_FIELD_KEYS['NEWS_HEADLINE'],
+    'TIMESALE_EQUITY': CSV_FIELD_KEYS['TIMESALE_EQUITY'],
+    'TIMESALE_FUTURES': CSV_FIELD_KEYS['TIMESALE_FUTURES'],
+    'TIMESALE_FOREX': CSV_FIELD_KEYS['TIMESALE_FOREX'],
+    'TIMESALE_OPTIONS': CSV_FIELD_KEYS['TIMESALE_OPTIONS']
+}
+
+# The type of the numeric fields, by record field name, as the streaming API
+# documents them. Fields that aren't listed are kept as they came in.
+FIELD_TYPES = {
+    **dict.fromkeys([
+        'bid_price', 'ask_price', 'last_price', 'open_price', 'high_price', 'low_price', 'close_price',
+        'net_change', 'percent_change', 'future_percent_change', 'mark', 'volatility', 'week_high_52',
+        'week_low_52', 'pe_ratio', 'dividend_amount', 'dividend_yield', 'nav', 'fund_price',
+        'regular_market_last_price', 'regular_market_net_change', 'strike_price', 'money_intrinsic_value',
+        'time_value', 'delta', 'gamma', 'theta', 'vega', 'rho', 'theoretical_option_value', 'underlying_price',
+        'multiplier', 'future_multiplier', 'future_settlement_price', 'tick', 'tick_amount', 'bid_size',
+        'ask_size', 'last_size', 'island_bid_size', 'island_ask_size', 'regular_market_last_size', 'volume'
+    ], float),
+    **dict.fromkeys([
+        'total_volume', 'island_volume', 'open_interest', 'quote_time', 'trade_time', 'quote_time_in_long',
+        'trade_time_in_long', 'regular_market_trade_time', 'regular_market_trade_time_in_long', 'chart_time',
+        'quote_day', 'trade_day', 'chart_day', 'regular_market_trade_day', 'expiration_year', 'expiration_month',
+        'expiration_day', 'days_to_expiration', 'digits', 'sequence', 'chart_sequence', 'last_sequence'
+    ], int)
+}
+
+
+def field_name(name: str) -> str:
+    """Converts a field name from `td.enums` to a python identifier.
+
+    Arguments:
+    ----
+    name {str} -- The field name, for example `bid-price` or `52-week-high`.
+
+    Returns:
+    ----
+    str -- The identifier, for example `bid_price` or `week_high_52`.
+    """
+
+    parts = re.sub('([a-z])([A-Z])', r'\1_\2', name).lower().replace('-', '_').split('_')
+
+    # Identifiers can't start with a number.
+    if parts[0].isdigit():
+        parts = parts[1:] + parts[:1]
+
+    return '_'.join(parts)
+
+
+class ServiceDecoder():
+
+    """
+    Decodes the content of a streaming service into records.
+
+    The field ids of the service are resolved to names once, and each content
+    entry becomes a named tuple with one attribute per field. Fields that weren't
+    part of the entry, like the ones a level one update didn't change, are `None`.
+    Numeric fields are converted to the type listed in `FIELD_TYPES`, a value
+    that can't be converted is kept as it came in.
+    """
+
+    def __init__(self, service: str) -> None:
+        """Initalizes the `ServiceDecoder`.
+
+        Arguments:
+        ----
+        service {str} -- The name of the service, for example `QUOTE`.
+        """
+
+        if service not in SERVICE_FIELD_IDS:
+            raise ValueError('Invalid service, please choose a valid one: {}'.format(', '.join(SERVICE_FIELD_IDS)))
+
+        self.service = service
+
+        field_ids = dict(SERVICE_FIELD_IDS[service])
+
+        # The level one services send a few extra fields by name.
+        for field_id, name in CSV_FIELD_KEYS.get(service, {}).items():
+            if not field_id.isdigit():
+                field_ids.setdefault(field_id, name)
+
+        # The symbol always comes in as the `key`.
+        field_ids = {field_id: name for field_id, name in field_ids.items() if name not in ('symbol', 'key')}
+        field_ids = dict({'key': 'symbol'}, **field_ids)
+
+        self.field_ids: Tuple[str] = tuple(field_ids)
+        self.field_names: Tuple[str] = tuple(field_name(name) for name in field_ids.values())
+        self.field_types: Tuple[Tuple[int, type]] = tuple(
+            (index, FIELD_TYPES[name]) for index, name in enumerate(self.field_names) if name in FIELD_TYPES
+        )
+
+        record_name = ''.join(part.title() for part in service.replace('LEVELONE', 'LEVEL_ONE').split('_')) + 'Record'
+        self.record_class = namedtuple(record_name, self.field_names, defaults=(None,) * len(self.field_names))
+
+    def __repr__(self) -> str:
+        return '<ServiceDecoder (service={service}, fields={fields})>'.format(service=self.service, fields=len(self.field_ids))
+
+    def decode(self, content_entry: dict) -> tuple:
+        """Decodes a single content entry.
+
+        Arguments:
+        ----
+        content_entry {dict} -- One entry of the `content` of a data message.
+
+        Returns:
+        ----
+        tuple -- The record, a named tuple with a field for each field id.
+        """
+
+        return self._make(values=map(content_entry.get, self.field_ids))
+
+    def decode_content(self, content: List[dict]) -> List[tuple]:
+        """Decodes the content of a data message.
+
+        Arguments:
+        ----
+        content {List[dict]} -- The `content` of a data message.
+
+        Returns:
+        ----
+        List[tuple] -- One record for each content entry.
+        """
+
+        make = self._make
+        field_ids = self.field_ids
+
+        return [make(values=map(content_entry.get, field_ids)) for content_entry in content]
+
+    def _make(self, values: Iterable[object]) -> tuple:
+        """Makes a record, converting the numeric fields that came in as another type.
+
+        Arguments:
+        ----
+        values {Iterable[object]} -- The raw value of each field, in field order.
+
+        Returns:
+        ----
+        tuple -- The record.
+        """
+
+        values = list(values)
+
+        for index, field_type in self.field_types:
+
+            value = values[index]
+
+            if value is None or value.__class__ is field_type:
+                continue
+
+            try:
+                values[index] = field_type(value)
+            except (TypeError, ValueError):
+                pass
+
+        return self.record_class._make(values)
+
+    def to_dict(self, record: tuple) -> Dict[str, object]:
+        """Converts a record back to a dictionary, without the missing fields.
+
+        Arguments:
+        ----
+        record {tuple} -- A record made by this decoder.
+
+        Returns:
+        ----
+        Dict[str, object] -- The fields that were part of the content entry.
+        """
+
+        return {name: value for name, value in zip(self.field_names, record) if value is not None}
+
+
+_service_decoders: Dict[str, ServiceDecoder] = {}
+
+
+def get_service_decoder(service: str) -> ServiceDecoder:
+    """Returns the decoder of a service, creating it the first time.
+
+    Arguments:
+    ----
+    service {str} -- The name of the service, for example `QUOTE`.
+
+    Returns:
+    ----
+    ServiceDecoder -- The decoder of the service.
+    """
+
+    service_decoder = _service_decoders.get(service)
+
+    if service_decoder is None:
+        service_decoder = _service_decoders[service] = ServiceDecoder(service=service)
+
+    return service_decoder
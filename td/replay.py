@@ -0,0 +1,421 @@
+import asyncio
+import glob
+import json
+import os
+import time
+
+from typing import Dict
+from typing import List
+from typing import Set
+from typing import Tuple
+
+import websockets
+
+from td.stream import TDStreamerClient
+
+
+# The sample stream messages that ship with the repo.
+SAMPLES_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'samples', 'responses')
+
+# The commands that start sending the data of a service.
+SUBSCRIBE_COMMANDS = ['SUBS', 'ADD', 'GET', 'VIEW']
+
+# The services whose data comes back in the `snapshot` section.
+SNAPSHOT_SERVICES = ['CHART_HISTORY_FUTURES']
+
+# The user principals handed to the stream clients of a `ReplayServer`, only
+# the fields used by the login and the requests are needed.
+REPLAY_USER_PRINCIPALS = {
+    'accounts': [
+        {
+            'accountId': '000000000',
+            'company': 'AMER',
+            'segment': 'AMER',
+            'accountCdDomainId': 'A000000000000000'
+        }
+    ],
+    'streamerInfo': {
+        'streamerSocketUrl': 'localhost',
+        'token': 'replay',
+        'tokenTimestamp': '2020-01-01T00:00:00+0000',
+        'userGroup': 'ACCT',
+        'accessLevel': 'ACCT',
+        'acl': 'replay',
+        'appId': 'replay'
+    }
+}
+
+# A replayed frame, its offset in seconds from the start of the session,
+# the frame, and the services with data in it.
+ReplayFrame = Tuple[float, str, frozenset]
+
+
+class ReplayServer():
+
+    """
+    A local stand-in for the TD streamer, which plays back a recorded session.
+
+    The server speaks the `ADMIN` protocol of the streamer, it answers the
+    `LOGIN`, `QOS`, `SUBS` and `UNSUBS` requests sent by the `TDStreamerClient`,
+    and once a service is subscribed, sends the recorded data of that service
+    with the timing it was recorded with, sped up `speed` times, or as fast as
+    possible. Each connection gets its own playback, so several clients can
+    be measured at once. The data is filtered by service only, the keys of a
+    subscription are not checked.
+    """
+
+    def __init__(self, frames: List[Tuple[float, str]], speed: float = 1.0, repeat: bool = False,
+                 heartbeat_interval: float = 10.0, close_when_done: bool = True) -> None:
+        """Initalizes the `ReplayServer`.
+
+        Arguments:
+        ----
+        frames {List[Tuple[float, str]]} -- The frames to replay, with the time
+            they were received, in seconds, only the intervals between them matter.
+
+        Keyword Arguments:
+        ----
+        speed {float} -- How many times faster than recorded the frames are
+            sent, `None` sends them as fast as possible. (default: {1.0})
+
+        repeat {bool} -- `True` to start over once every frame was sent. (default: {False})
+
+        heartbeat_interval {float} -- The seconds between two heartbeats, `None`
+            for no heartbeats. (default: {10.0})
+
+        close_when_done {bool} -- `True` to close the connection once every frame
+            was sent, which ends the stream of the client. (default: {True})
+        """
+
+        if speed is not None and speed <= 0:
+            raise ValueError('The speed needs to be a positive number, or None to replay as fast as possible.')
+
+        self.frames = self._prepare_frames(frames=frames)
+        self.speed = speed
+        self.repeat = repeat
+        self.heartbeat_interval = heartbeat_interval
+        self.close_when_done = close_when_done
+
+        self.server: websockets.WebSocketServer = None
+        self.url: str = None
+
+        self._connections = 0
+        self._frames_sent = 0
+        self._requests = 0
+
+    @classmethod
+    def from_recording(cls, file_path: str, **kwargs) -> 'ReplayServer':
+        """Creates a server replaying a session recorded with `TDStreamerClient.record_frames`.
+
+        Arguments:
+        ----
+        file_path {str} -- The recording, one `[time received, frame]` JSON list per line.
+
+        Returns:
+        ----
+        ReplayServer -- The server, the keyword arguments are passed on to it.
+        """
+
+        with open(file=file_path, mode='r') as recording:
+            frames = [tuple(json.loads(line)) for line in recording if line.strip()]
+
+        return cls(frames=frames, **kwargs)
+
+    @classmethod
+    def from_samples(cls, directory: str = SAMPLES_DIRECTORY, interval: float = 0.1, **kwargs) -> 'ReplayServer':
+        """Creates a server replaying the sample stream messages.
+
+        Each message of the `*.json` files is sent as one frame, `interval`
+        seconds apart, the bare service sections are wrapped in a message
+        like the streamer would send them.
+
+        Keyword Arguments:
+        ----
+        directory {str} -- The directory with the samples. (default: {SAMPLES_DIRECTORY})
+
+        interval {float} -- The seconds between two frames. (default: {0.1})
+
+        Returns:
+        ----
+        ReplayServer -- The server, the keyword arguments are passed on to it.
+        """
+
+        frames = []
+
+        for file_path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+
+            with open(file=file_path, mode='r') as sample_file:
+                sample = json.load(sample_file)
+
+            for message in (sample if isinstance(sample, list) else [sample]):
+
+                if 'service' in message:
+                    section = 'snapshot' if message['service'] in SNAPSHOT_SERVICES else 'data'
+                    message = {section: [message]}
+
+                frames.append((len(frames) * interval, json.dumps(message)))
+
+        return cls(frames=frames, **kwargs)
+
+    def _prepare_frames(self, frames: List[Tuple[float, str]]) -> List[ReplayFrame]:
+        """Finds the services of each frame, and keeps the data frames only.
+
+        The responses and heartbeats of a recording are left out, the server
+        sends its own.
+        """
+
+        prepared = []
+        start = None
+
+        for received, frame in frames:
+
+            message = json.loads(frame)
+            services = frozenset(
+                service_result.get('service')
+                for section in ('data', 'snapshot')
+                for service_result in message.get(section, ())
+            )
+
+            if not services:
+                continue
+
+            if start is None:
+                start = received
+
+            prepared.append((received - start, frame, services))
+
+        return prepared
+
+    @property
+    def duration(self) -> float:
+        """Returns the seconds it takes to replay every frame once, at the recorded speed."""
+
+        return self.frames[-1][0] if self.frames else 0.0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Starts listening for connections.
+
+        Keyword Arguments:
+        ----
+        host {str} -- The host to listen on. (default: {'127.0.0.1'})
+
+        port {int} -- The port to listen on, `0` picks a free one. (default: {0})
+
+        Returns:
+        ----
+        str -- The websocket URL of the server.
+        """
+
+        self.server = await websockets.serve(self._serve, host, port)
+        self.url = 'ws://{}:{}'.format(host, self.server.sockets[0].getsockname()[1])
+
+        return self.url
+
+    async def stop(self) -> None:
+        """Closes every connection and stops the server."""
+
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def __aenter__(self) -> 'ReplayServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def create_stream_client(self) -> TDStreamerClient:
+        """Creates a `TDStreamerClient` connected to this server.
+
+        Returns:
+        ----
+        TDStreamerClient -- A stream client, used just like one created with
+            `TDClient.create_streaming_session`.
+
+        Usage:
+        ----
+            >>> replay_server = ReplayServer.from_samples(speed=None)
+            >>> await replay_server.start()
+            >>> td_stream_session = replay_server.create_stream_client()
+            >>> td_stream_session.level_one_quotes(symbols=['MSFT'], fields=list(range(0, 10)))
+            >>> await td_stream_session.build_pipeline()
+            >>> data = await td_stream_session.start_pipeline()
+        """
+
+        if self.url is None:
+            raise ValueError('The server needs to be started before creating a stream client.')
+
+        stream_client = TDStreamerClient(
+            websocket_url='localhost',
+            user_principal_data=REPLAY_USER_PRINCIPALS,
+            credentials={'userid': REPLAY_USER_PRINCIPALS['accounts'][0]['accountId'], 'token': 'replay'}
+        )
+        stream_client.websocket_url = self.url
+
+        return stream_client
+
+    @property
+    def stats(self) -> dict:
+        """Returns the server counters.
+
+        Returns:
+        ----
+        dict -- The number of connections, requests answered and frames sent.
+        """
+
+        return {
+            'connections': self._connections,
+            'requests': self._requests,
+            'frames_sent': self._frames_sent
+        }
+
+    async def _serve(self, websocket: websockets.WebSocketServerProtocol, path: str = None) -> None:
+        """Answers the requests of a connection, and replays the data it subscribed to."""
+
+        self._connections += 1
+
+        services: Set[str] = set()
+        logged_in = False
+        heartbeat_task: asyncio.Task = None
+        replay_task: asyncio.Task = None
+
+        try:
+            async for frame in websocket:
+
+                # The client sends a `ping` as its heartbeat.
+                try:
+                    requests = json.loads(frame)['requests']
+                except (ValueError, TypeError, KeyError):
+                    continue
+
+                responses = []
+
+                for request in requests:
+
+                    command = request.get('command')
+                    service = request.get('service')
+
+                    if command == 'LOGIN':
+                        logged_in = True
+                        code, msg = 0, 'Replay session started'
+                        if self.heartbeat_interval is not None and heartbeat_task is None:
+                            heartbeat_task = asyncio.ensure_future(self._heartbeat(websocket=websocket))
+                    elif not logged_in:
+                        code, msg = 3, 'Login required'
+                    elif command == 'QOS':
+                        qos_level = request.get('parameters', {}).get('qoslevel')
+                        code, msg = 0, 'QoS command succeeded. Set qoslevel={}'.format(qos_level)
+                    elif command in SUBSCRIBE_COMMANDS:
+                        services.add(service)
+                        code, msg = 0, '{} command succeeded'.format(command)
+                    elif command == 'UNSUBS':
+                        services.discard(service)
+                        code, msg = 0, 'UNSUBS command succeeded'
+                    else:
+                        code, msg = 0, '{} command succeeded'.format(command)
+
+                    responses.append(self._response(request=request, code=code, msg=msg))
+
+                if responses:
+                    self._requests += len(responses)
+                    await websocket.send(json.dumps({'response': responses}))
+
+                # The playback starts with the first subscription.
+                if services and replay_task is None:
+                    replay_task = asyncio.ensure_future(self._replay(websocket=websocket, services=services))
+
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+        finally:
+            for task in (heartbeat_task, replay_task):
+                if task is not None:
+                    task.cancel()
+
+    def _response(self, request: dict, code: int, msg: str) -> dict:
+        """Builds the response to a request."""
+
+        return {
+            'service': request.get('service'),
+            'requestid': str(request.get('requestid')),
+            'command': request.get('command'),
+            'timestamp': int(time.time() * 1000),
+            'content': {
+                'code': code,
+                'msg': msg
+            }
+        }
+
+    async def _heartbeat(self, websocket: websockets.WebSocketServerProtocol) -> None:
+        """Sends a heartbeat every `heartbeat_interval` seconds."""
+
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            await websocket.send(json.dumps({'notify': [{'heartbeat': str(int(time.time() * 1000))}]}))
+
+    async def _replay(self, websocket: websockets.WebSocketServerProtocol, services: Set[str]) -> None:
+        """Sends the frames of the subscribed services, with their recorded timing.
+
+        The set of services is shared with the connection, so a service that's
+        unsubscribed stops being sent right away.
+        """
+
+        loop = asyncio.get_running_loop()
+        frames = self.frames
+        speed = self.speed
+
+        # The frames of another cycle start one average interval after the last one.
+        cycle = self.duration + (self.duration / (len(frames) - 1) if len(frames) > 1 else 0.0)
+        start = loop.time()
+        offset = 0.0
+
+        try:
+            while frames:
+
+                for received, frame, frame_services in frames:
+
+                    if speed is not None:
+                        delay = start + (offset + received) / speed - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+
+                    if frame_services <= services:
+                        await websocket.send(frame)
+                    elif frame_services & services:
+                        await websocket.send(self._filter_frame(frame=frame, services=services))
+                    else:
+                        continue
+
+                    self._frames_sent += 1
+
+                if not self.repeat:
+                    break
+
+                offset += cycle
+
+                # Let the connection breathe when replaying as fast as possible.
+                await asyncio.sleep(0)
+
+            if self.close_when_done:
+                await websocket.close()
+
+        except websockets.exceptions.ConnectionClosed:
+            pass
+
+    def _filter_frame(self, frame: str, services: Set[str]) -> str:
+        """Keeps the data of the subscribed services in a frame."""
+
+        message: Dict[str, list] = json.loads(frame)
+
+        for section in ('data', 'snapshot'):
+            if section in message:
+                message[section] = [
+                    service_result for service_result in message[section]
+                    if service_result.get('service') in services
+                ]
+                if not message[section]:
+                    del message[section]
+
+        return json.dumps(message)
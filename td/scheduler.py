@@ -0,0 +1,297 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+
+from typing import Dict
+from typing import Union
+
+
+# Lower numbers are served first.
+PRIORITY_LANES = {
+    'orders': 0,
+    'quotes': 1,
+    'default': 2,
+    'history': 3
+}
+
+
+class RequestScheduler():
+
+    """
+    A token bucket request scheduler used to stay under the TD Ameritrade
+    API quota. Callers that are over the quota wait for their turn instead of
+    getting an `ExdLmtError`, and waiting callers are served by lane priority:
+    orders first, then quotes, then everything else, then history backfills.
+
+    The scheduler is thread safe. If `multiprocessing_safe` is `True` the bucket
+    itself lives in shared memory, so every process forked from the one that
+    created the scheduler draws from the same quota. Priority is only enforced
+    between the waiters of a single process.
+    """
+
+    def __init__(self, requests_per_minute: int = 120, burst: int = 10, multiprocessing_safe: bool = False) -> None:
+        """Initalizes the `RequestScheduler`.
+
+        The bucket starts full with `burst` tokens and refills so that no 60 second
+        window can ever see more than `requests_per_minute` requests.
+
+        Arguments:
+        ----
+        requests_per_minute {int} -- The request quota. (default: {120})
+
+        burst {int} -- The number of requests that can be sent back to back
+            when the bucket is full. (default: {10})
+
+        multiprocessing_safe {bool} -- Share the bucket across processes. (default: {False})
+        """
+
+        if burst >= requests_per_minute:
+            raise ValueError('The burst must be smaller than the number of requests per minute.')
+
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.refill_rate = (requests_per_minute - burst) / 60.0
+        self.multiprocessing_safe = multiprocessing_safe
+
+        # The waiters are kept in a heap of (priority, sequence) tickets.
+        self._condition = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+
+        if multiprocessing_safe:
+            import multiprocessing as mp
+            self._bucket_lock = mp.Lock()
+            self._tokens = mp.Value('d', float(burst), lock=False)
+            self._last_refill = mp.Value('d', time.time(), lock=False)
+        else:
+            self._bucket_lock = threading.Lock()
+            self._tokens = _Cell(float(burst))
+            self._last_refill = _Cell(time.time())
+
+        self._stats = {
+            lane: {'requests': 0, 'throttled': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+            for lane in PRIORITY_LANES
+        }
+        self._rate_limited = 0
+
+    def _take_token(self) -> float:
+        """Attempts to take a token from the bucket.
+
+        Returns:
+        ----
+        float -- `0.0` if a token was taken, otherwise the number of seconds
+            until the next token is available.
+        """
+
+        with self._bucket_lock:
+
+            # Refill the bucket. Wall clock time is used because it's shared across processes.
+            now = time.time()
+            elapsed = max(now - self._last_refill.value, 0.0)
+            self._tokens.value = min(self._tokens.value + elapsed * self.refill_rate, float(self.burst))
+            self._last_refill.value = now
+
+            if self._tokens.value >= 1.0:
+                self._tokens.value -= 1.0
+                return 0.0
+
+            return (1.0 - self._tokens.value) / self.refill_rate
+
+    def _new_ticket(self, lane: str) -> tuple:
+        """Creates a ticket and puts it in the waiting line."""
+
+        if lane not in PRIORITY_LANES:
+            raise ValueError('Invalid lane, please choose a valid lane: {}'.format(', '.join(PRIORITY_LANES)))
+
+        ticket = (PRIORITY_LANES[lane], next(self._sequence))
+        heapq.heappush(self._waiters, ticket)
+
+        return ticket
+
+    def _remove_ticket(self, ticket: tuple) -> None:
+        """Removes a ticket that is no longer waiting."""
+
+        if self._waiters and self._waiters[0] == ticket:
+            heapq.heappop(self._waiters)
+        elif ticket in self._waiters:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+
+        self._condition.notify_all()
+
+    def _record(self, lane: str, wait_time: float, throttled: bool) -> None:
+        """Updates the counters of a lane."""
+
+        lane_stats = self._stats[lane]
+        lane_stats['requests'] += 1
+        lane_stats['total_wait'] += wait_time
+        lane_stats['max_wait'] = max(lane_stats['max_wait'], wait_time)
+
+        if throttled:
+            lane_stats['throttled'] += 1
+
+    def acquire(self, lane: str = 'default') -> float:
+        """Blocks until a request in the given lane is allowed to go out.
+
+        Arguments:
+        ----
+        lane {str} -- The priority lane of the request, one of the
+            keys of `PRIORITY_LANES`. (default: {'default'})
+
+        Returns:
+        ----
+        float -- The number of seconds the caller waited.
+        """
+
+        start = time.monotonic()
+        throttled = False
+
+        with self._condition:
+
+            ticket = self._new_ticket(lane=lane)
+
+            try:
+                while True:
+
+                    # Only the caller at the front of the line can take a token.
+                    if self._waiters[0] == ticket:
+                        wait_time = self._take_token()
+                        if wait_time == 0.0:
+                            break
+                        self._condition.wait(timeout=wait_time)
+                    else:
+                        self._condition.wait(timeout=1.0 / self.refill_rate)
+
+                    throttled = True
+            finally:
+                self._remove_ticket(ticket=ticket)
+
+            waited = time.monotonic() - start
+            self._record(lane=lane, wait_time=waited, throttled=throttled)
+
+        return waited
+
+    async def acquire_async(self, lane: str = 'default') -> float:
+        """Waits, without blocking the event loop, until a request is allowed to go out.
+
+        Arguments:
+        ----
+        lane {str} -- The priority lane of the request, one of the
+            keys of `PRIORITY_LANES`. (default: {'default'})
+
+        Returns:
+        ----
+        float -- The number of seconds the caller waited.
+        """
+
+        start = time.monotonic()
+        throttled = False
+
+        with self._condition:
+            ticket = self._new_ticket(lane=lane)
+
+        try:
+            while True:
+
+                with self._condition:
+                    if self._waiters[0] == ticket:
+                        wait_time = self._take_token()
+                        if wait_time == 0.0:
+                            break
+                    else:
+                        wait_time = 1.0 / self.refill_rate
+
+                throttled = True
+                await asyncio.sleep(wait_time)
+        finally:
+            with self._condition:
+                self._remove_ticket(ticket=ticket)
+
+        waited = time.monotonic() - start
+
+        with self._condition:
+            self._record(lane=lane, wait_time=waited, throttled=throttled)
+
+        return waited
+
+    def penalize(self, retry_after: Union[str, float] = None) -> None:
+        """Empties the bucket after the server answered with a 429.
+
+        Arguments:
+        ----
+        retry_after {Union[str, float]} -- The value of the `Retry-After` header, in
+            seconds, if the server sent one. (default: {None})
+        """
+
+        try:
+            retry_after = float(retry_after) if retry_after is not None else 0.0
+        except ValueError:
+            retry_after = 0.0
+
+        with self._bucket_lock:
+
+            # A negative balance makes everybody wait out the `Retry-After` period.
+            self._tokens.value = min(self._tokens.value, 0.0) - retry_after * self.refill_rate
+            self._last_refill.value = time.time()
+
+        with self._condition:
+            self._rate_limited += 1
+
+    @property
+    def queue_depth(self) -> Dict[str, int]:
+        """Returns the number of callers waiting in each lane.
+
+        Returns:
+        ----
+        Dict[str, int] -- The lane names and their waiting callers.
+        """
+
+        lane_names = {priority: lane for lane, priority in PRIORITY_LANES.items()}
+        depth = {lane: 0 for lane in PRIORITY_LANES}
+
+        with self._condition:
+            for priority, _ in self._waiters:
+                depth[lane_names[priority]] += 1
+
+        return depth
+
+    @property
+    def stats(self) -> dict:
+        """Returns the scheduler counters.
+
+        Returns:
+        ----
+        dict -- The queue depth, the number of `429` responses and, for each lane,
+            the number of requests, how many had to wait and the total, average
+            and maximum wait times in seconds.
+        """
+
+        queue_depth = self.queue_depth
+
+        with self._condition:
+
+            lanes = {}
+            for lane, lane_stats in self._stats.items():
+                lanes[lane] = dict(lane_stats)
+                lanes[lane]['average_wait'] = (
+                    lane_stats['total_wait'] / lane_stats['requests'] if lane_stats['requests'] else 0.0
+                )
+                lanes[lane]['queue_depth'] = queue_depth[lane]
+
+            return {
+                'queue_depth': sum(queue_depth.values()),
+                'rate_limited': self._rate_limited,
+                'lanes': lanes
+            }
+
+
+class _Cell():
+
+    """A stand-in for `multiprocessing.Value` when the bucket isn't shared."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: float) -> None:
+        self.value = value
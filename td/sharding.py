@@ -0,0 +1,558 @@
+import asyncio
+import heapq
+import itertools
+import multiprocessing
+import queue
+import time
+import zlib
+
+from typing import AsyncIterator
+from typing import Callable
+from typing import List
+
+from td.handlers import Handler
+from td.stream import TDStreamerClient
+
+
+def shard_for(symbol: str, shards: int) -> int:
+    """Returns the shard a symbol is streamed on.
+
+    The hash is stable across processes and sessions, so a symbol always
+    lands on the same shard.
+
+    Arguments:
+    ----
+    symbol {str} -- The symbol, for example `MSFT`.
+
+    shards {int} -- The number of shards.
+
+    Returns:
+    ----
+    int -- The index of the shard.
+    """
+
+    return zlib.crc32(symbol.encode('utf-8')) % shards
+
+
+def message_timestamp(message: dict) -> int:
+    """Returns the timestamp of a data message, or `None` for any other message."""
+
+    data = message.get('data') if isinstance(message, dict) else None
+
+    if not data:
+        return None
+
+    return data[0].get('timestamp')
+
+
+def _forward_results(handler: Handler, shard: int, output_queue: multiprocessing.Queue) -> Callable:
+    """Wraps the function of a handler, so what it returns is sent to the parent with its timestamp."""
+
+    callback = handler.callback
+
+    def forward(argument: object, result: object) -> None:
+        if result is not None:
+            timestamp = argument.get('timestamp') if isinstance(argument, dict) else None
+            output_queue.put((shard, timestamp, result))
+
+    if handler.is_async:
+
+        async def forward_async(argument: object) -> None:
+            forward(argument, await callback(argument))
+
+        return forward_async
+
+    def forward_sync(argument: object) -> None:
+        forward(argument, callback(argument))
+
+    return forward_sync
+
+
+def _run_shard(shard: int, websocket_url: str, user_principal_data: dict, credentials: dict, data_requests: dict,
+               queue_size: int, overflow: str, handlers: List[Handler], shard_setup: Callable[[TDStreamerClient], None],
+               output_queue: multiprocessing.Queue) -> None:
+    """Streams a shard in a worker process.
+
+    The decoded messages stay in the worker, they're handed to the handlers and
+    the sinks of the shard, and only what the handlers return goes to the parent.
+    """
+
+    async def stream_shard():
+
+        stream_client = TDStreamerClient(websocket_url='', user_principal_data=user_principal_data, credentials=credentials)
+        stream_client.websocket_url = websocket_url
+        stream_client.data_requests = data_requests
+        stream_client.configure_dispatch(queue_size=queue_size, overflow=overflow)
+        stream_client.print_to_console = False
+
+        for handler in handlers:
+            stream_client.add_handler(
+                service=handler.service,
+                callback=_forward_results(handler=handler, shard=shard, output_queue=output_queue),
+                symbols=handler.symbols,
+                offload=handler.offload
+            )
+
+        if shard_setup is not None:
+            shard_setup(stream_client)
+
+        await stream_client.build_pipeline()
+
+        while True:
+
+            message = await stream_client.start_pipeline()
+
+            if message is None:
+                break
+
+    try:
+        asyncio.run(stream_shard())
+    finally:
+        output_queue.put((shard, None, None))
+
+
+class ShardMerger():
+
+    """
+    Merges the messages of several shards into one stream ordered by timestamp.
+
+    Each shard is ordered on its own, so a data message is released once every
+    shard that's still open has sent something at least as recent, or once it
+    waited `max_delay` seconds, so a quiet shard never holds the others up.
+    Other messages, like responses and gaps, are released right away.
+    """
+
+    def __init__(self, shards: int, max_delay: float = 0.05) -> None:
+        """Initalizes the `ShardMerger`.
+
+        Arguments:
+        ----
+        shards {int} -- The number of shards.
+
+        Keyword Arguments:
+        ----
+        max_delay {float} -- The maximum number of seconds a message is held
+            back waiting for the other shards. (default: {0.05})
+        """
+
+        self.max_delay = max_delay
+        self.watermarks = {shard: None for shard in range(shards)}
+
+        # (timestamp, order, time held, message)
+        self._heap = []
+        self._order = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, shard: int, message: dict, timestamp: int = None) -> List[dict]:
+        """Adds a message of a shard.
+
+        Arguments:
+        ----
+        shard {int} -- The shard the message came from.
+
+        message {dict} -- A decoded stream message, or `None` once the shard is closed.
+
+        Keyword Arguments:
+        ----
+        timestamp {int} -- The timestamp the message is ordered by, read from
+            the data of the message if not given. (default: {None})
+
+        Returns:
+        ----
+        List[dict] -- The messages that can be released, in order.
+        """
+
+        if message is None:
+            self.watermarks.pop(shard, None)
+            return self.release()
+
+        if timestamp is None:
+            timestamp = message_timestamp(message=message)
+
+        if timestamp is None:
+            return [message] + self.release()
+
+        self.watermarks[shard] = timestamp
+        heapq.heappush(self._heap, (timestamp, next(self._order), time.monotonic(), message))
+
+        return self.release()
+
+    def release(self) -> List[dict]:
+        """Returns the messages that no shard can come before anymore, in order."""
+
+        heap = self._heap
+        released = []
+
+        if not heap:
+            return released
+
+        watermarks = self.watermarks.values()
+        watermark = None if None in watermarks else min(watermarks, default=float('inf'))
+        deadline = time.monotonic() - self.max_delay
+
+        while heap and ((watermark is not None and heap[0][0] <= watermark) or heap[0][2] <= deadline):
+            released.append(heapq.heappop(heap)[3])
+
+        return released
+
+    def drain(self) -> List[dict]:
+        """Returns every held message, in order."""
+
+        released = [entry[3] for entry in sorted(self._heap)]
+        self._heap = []
+
+        return released
+
+
+class ShardedStreamer():
+
+    """
+    Spreads the subscriptions of a stream session over several connections.
+
+    Symbols are assigned to a shard by a stable hash, and every shard has its
+    own connection and decodes its own messages. The shards can run on the event
+    loop of the caller, or each in its own process, so the decoding is spread
+    over the cores. On the loop, their messages are merged back into a single
+    stream, ordered by timestamp, which is read with `messages` or handed to a
+    callback by `run`.
+
+    In a process the messages stay where they're decoded, copying them to the
+    parent would cost as much as decoding them. Each worker runs the handlers
+    added with `add_handler`, and the sinks opened by `shard_setup`, and only
+    what the handlers return is merged into the stream instead.
+    """
+
+    def __init__(self, stream_client: TDStreamerClient, shards: int = 4, processes: bool = False, max_delay: float = 0.05,
+                 shard_setup: Callable[[TDStreamerClient], None] = None) -> None:
+        """Initalizes the `ShardedStreamer`.
+
+        Arguments:
+        ----
+        stream_client {TDStreamerClient} -- The stream session the shards are
+            copied from, created with `TDClient.create_streaming_session`.
+
+        Keyword Arguments:
+        ----
+        shards {int} -- The number of connections. (default: {4})
+
+        processes {bool} -- `True` to run each shard in its own process, `False`
+            to run them all on the event loop. (default: {False})
+
+        max_delay {float} -- The maximum number of seconds a message is held
+            back to keep the merged stream in order. (default: {0.05})
+
+        shard_setup {Callable[[TDStreamerClient], None]} -- Called with the stream
+            session of each shard before it connects, in its process if `processes`
+            is `True`, to open its sinks, like `write_behavior` or `tick_store`.
+            (default: {None})
+
+        Usage:
+        ----
+            >>> td_stream_session = td_session.create_streaming_session()
+            >>> sharded_stream = ShardedStreamer(stream_client=td_stream_session, shards=4, processes=True)
+            >>> sharded_stream.subscribe('level_one_options', symbols=option_symbols, fields=list(range(0, 42)))
+            >>> sharded_stream.add_handler(service='OPTION', callback=option_count)
+            >>> sharded_stream.run(callback=print)
+        """
+
+        if shards < 1:
+            raise ValueError('Invalid number of shards, please choose at least 1.')
+
+        self.stream_client = stream_client
+        self.shards = shards
+        self.processes = processes
+        self.max_delay = max_delay
+        self.shard_setup = shard_setup
+
+        self.clients: List[TDStreamerClient] = []
+
+        for _ in range(shards):
+
+            shard_client = TDStreamerClient(
+                websocket_url='',
+                user_principal_data=stream_client.user_principal_data,
+                credentials=stream_client.credentials
+            )
+
+            shard_client.websocket_url = stream_client.websocket_url
+            shard_client.configure_dispatch(queue_size=stream_client.queue_size, overflow=stream_client.overflow)
+            shard_client.print_to_console = False
+
+            self.clients.append(shard_client)
+
+        self._workers: List[multiprocessing.Process] = []
+        self._closing = False
+
+    def partition(self, symbols: List[str]) -> List[List[str]]:
+        """Splits symbols by shard.
+
+        Arguments:
+        ----
+        symbols {List[str]} -- The symbols to split.
+
+        Returns:
+        ----
+        List[List[str]] -- The symbols of each shard.
+        """
+
+        partitions = [[] for _ in range(self.shards)]
+
+        for symbol in symbols:
+            partitions[shard_for(symbol=symbol, shards=self.shards)].append(symbol)
+
+        return partitions
+
+    def subscribe(self, method: str, symbols: List[str] = None, **kwargs) -> None:
+        """Subscribes to a service, with its symbols spread over the shards.
+
+        Arguments:
+        ----
+        method {str} -- The name of the `TDStreamerClient` subscription
+            method, for example `level_one_quotes` or `timesale`.
+
+        Keyword Arguments:
+        ----
+        symbols {List[str]} -- The symbols to subscribe to, a service without
+            symbols goes to the first shard. (default: {None})
+
+        **kwargs -- The other arguments of the subscription method.
+
+        Usage:
+        ----
+            >>> sharded_stream.subscribe('level_one_quotes', symbols=['MSFT', 'AAPL'], fields=list(range(0, 10)))
+            >>> sharded_stream.subscribe('timesale', service='TIMESALE_EQUITY', symbols=['MSFT'], fields=[0, 1, 2])
+        """
+
+        if method.startswith('_') or not callable(getattr(self.clients[0], method, None)):
+            raise ValueError('Invalid subscription method: {}'.format(method))
+
+        if symbols is None:
+            getattr(self.clients[0], method)(**kwargs)
+            return
+
+        for shard_client, shard_symbols in zip(self.clients, self.partition(symbols=symbols)):
+            if shard_symbols:
+                getattr(shard_client, method)(symbols=shard_symbols, **kwargs)
+
+    def add_handler(self, service: str, callback: Callable, symbols: List[str] = None, offload: bool = False) -> List[Handler]:
+        """Calls a function with the messages of a service, on every shard.
+
+        The function runs where the shard is decoded, in its process if
+        `processes` is `True`. There, anything it returns other than `None`
+        is sent back and merged into the stream, ordered by the timestamp of
+        the message it was called with. The function, like `shard_setup`,
+        has to be importable by the workers if they're spawned.
+
+        Arguments:
+        ----
+        service {str} -- The service, for example `QUOTE` or `TIMESALE_EQUITY`,
+            `*` for every service, or one of `response`, `notify` or `gap`.
+
+        callback {Callable} -- A function or a coroutine, see `TDStreamerClient.add_handler`.
+
+        Keyword Arguments:
+        ----
+        symbols {List[str]} -- Only call the function for these symbols, it's
+            only added to their shards. (default: {None})
+
+        offload {bool} -- `True` to run the function in the thread pool of the
+            shard. (default: {False})
+
+        Returns:
+        ----
+        List[Handler] -- The handler of each shard it was added to.
+        """
+
+        if symbols is None:
+            shard_clients = self.clients
+        else:
+            shard_clients = [
+                shard_client for shard_client, shard_symbols in zip(self.clients, self.partition(symbols=symbols))
+                if shard_symbols
+            ]
+
+        return [
+            shard_client.add_handler(service=service, callback=callback, symbols=symbols, offload=offload)
+            for shard_client in shard_clients
+        ]
+
+    def quality_of_service(self, qos_level: str) -> None:
+        """Sets the quality of service of every shard.
+
+        Arguments:
+        ----
+        qos_level {str} -- The quality of service level, see `TDStreamerClient.quality_of_service`.
+        """
+
+        for shard_client in self.clients:
+            shard_client.quality_of_service(qos_level=qos_level)
+
+    def _active_shards(self) -> List[int]:
+        """Returns the shards with at least one subscription."""
+
+        return [
+            shard for shard, shard_client in enumerate(self.clients)
+            if any(request['service'] != 'ADMIN' for request in shard_client.data_requests['requests'])
+        ]
+
+    async def messages(self) -> AsyncIterator[dict]:
+        """Streams the merged messages of every shard.
+
+        Yields:
+        ----
+        dict -- The decoded messages, ordered by timestamp across the shards,
+            or with `processes`, what the handlers of the workers returned.
+        """
+
+        self._closing = False
+
+        shards = self._active_shards()
+        merger = ShardMerger(shards=self.shards, max_delay=self.max_delay)
+        merged_queue = asyncio.Queue()
+
+        # Shards without subscriptions never send anything.
+        for shard in range(self.shards):
+            if shard not in shards:
+                merger.push(shard=shard, message=None)
+
+        if self.processes:
+            feeders = self._start_processes(shards=shards, merged_queue=merged_queue)
+        else:
+            for shard in shards:
+                if self.shard_setup is not None:
+                    self.shard_setup(self.clients[shard])
+            feeders = [asyncio.ensure_future(self._stream_shard(shard=shard, merged_queue=merged_queue)) for shard in shards]
+
+        open_shards = len(shards)
+
+        try:
+            while open_shards:
+
+                try:
+                    shard, timestamp, message = await asyncio.wait_for(merged_queue.get(), timeout=self.max_delay)
+                except asyncio.TimeoutError:
+                    released = merger.release()
+                else:
+                    if message is None:
+                        open_shards -= 1
+                    released = merger.push(shard=shard, message=message, timestamp=timestamp)
+
+                for merged_message in released:
+                    yield merged_message
+
+            for merged_message in merger.drain():
+                yield merged_message
+
+        finally:
+            for feeder in feeders:
+                feeder.cancel()
+            await self.close()
+
+    async def stream(self, callback: Callable[[dict], None]) -> None:
+        """Hands the merged messages of every shard to a function.
+
+        Arguments:
+        ----
+        callback {Callable[[dict], None]} -- Called with every message yielded by `messages`.
+        """
+
+        async for message in self.messages():
+            callback(message)
+
+    def run(self, callback: Callable[[dict], None]) -> None:
+        """Streams until every shard is closed, blocking the caller.
+
+        Arguments:
+        ----
+        callback {Callable[[dict], None]} -- Called with every message yielded by `messages`.
+        """
+
+        asyncio.run(self.stream(callback=callback))
+
+    async def close(self) -> None:
+        """Closes the connections of the shards and stops the workers."""
+
+        self._closing = True
+
+        for shard_client in self.clients:
+            shard_client._stop_dispatch()
+            if shard_client.connection is not None:
+                await shard_client.connection.close()
+
+        for worker in self._workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+        self._workers = []
+
+    async def _stream_shard(self, shard: int, merged_queue: asyncio.Queue) -> None:
+        """Streams a shard on the event loop."""
+
+        shard_client = self.clients[shard]
+
+        try:
+            await shard_client.build_pipeline()
+
+            while True:
+
+                message = await shard_client.start_pipeline()
+
+                if message is None:
+                    break
+
+                await merged_queue.put((shard, None, message))
+
+        finally:
+            await merged_queue.put((shard, None, None))
+
+    def _start_processes(self, shards: List[int], merged_queue: asyncio.Queue) -> List[asyncio.Future]:
+        """Starts a worker process per shard, and a thread that reads what their handlers return."""
+
+        loop = asyncio.get_running_loop()
+        output_queue = multiprocessing.Queue()
+
+        for shard in shards:
+
+            shard_client = self.clients[shard]
+
+            worker = multiprocessing.Process(
+                target=_run_shard,
+                name='TDStreamShard-{}'.format(shard),
+                args=(
+                    shard,
+                    shard_client.websocket_url,
+                    shard_client.user_principal_data,
+                    shard_client.credentials,
+                    shard_client.data_requests,
+                    shard_client.queue_size,
+                    shard_client.overflow,
+                    shard_client.handlers.handlers,
+                    self.shard_setup,
+                    output_queue
+                ),
+                daemon=True
+            )
+
+            worker.start()
+            self._workers.append(worker)
+
+        def read_workers():
+
+            open_shards = len(shards)
+
+            while open_shards and not self._closing:
+
+                try:
+                    shard, timestamp, result = output_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if result is None:
+                    open_shards -= 1
+
+                loop.call_soon_threadsafe(merged_queue.put_nowait, (shard, timestamp, result))
+
+        return [loop.run_in_executor(None, read_workers)]
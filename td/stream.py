@@ -1,13 +1,17 @@
 import asyncio
-import csv
 import io
 import json
 import os
+import random
 import textwrap
+import time
 import unicodedata
 import urllib
 
+from typing import Callable
+from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
 
 import websockets
@@ -15,6 +19,26 @@ import websockets.client
 from td.enums import CSV_FIELD_KEYS
 from td.enums import CSV_FIELD_KEYS_LEVEL_2
 from td.enums import STREAM_FIELD_IDS
+from td.quote_cache import QuoteCache
+from td.quote_book import QuoteBook
+from td.order_book import OrderBooks
+from td.tick_store import TickWriter
+from td.parquet_sink import ParquetSink
+from td.persistence import CsvSink
+from td.persistence import FrameSink
+from td.persistence import PersistenceWriter
+from td.persistence import PERSISTENCE_OVERFLOW_POLICIES
+from td.json_backend import default_decoder
+from td.dispatch import StreamQueue
+from td.dispatch import OVERFLOW_POLICIES
+from td.dispatch import message_key
+from td.dispatch import merge_messages
+from td.records import ServiceDecoder
+from td.handlers import Handler
+from td.handlers import HandlerRegistry
+from td.subscribers import StreamSubscriber
+from td.records import SERVICE_FIELD_IDS
+from td.records import get_service_decoder
 
 
 class TDStreamerClient():
@@ -61,6 +85,8 @@ class TDStreamerClient():
         self.connection: websockets.WebSocketClientProtocol = None
         self.file_stream_level_1: io.TextIOWrapper = None
         self.file_stream_level_2: io.TextIOWrapper = None
+        self.tick_writer: TickWriter = None
+        self.parquet_sink: ParquetSink = None
 
         # this will hold all of our requests
         self.data_requests = {"requests": []}
@@ -77,12 +103,94 @@ class TDStreamerClient():
 
         try:
             self.loop = asyncio.get_event_loop()
-        except websockets.WebSocketException:
+        except (websockets.WebSocketException, RuntimeError):
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
 
         self.unsubscribe_count = 0
 
+        # Only a loop started by `stream` is stopped by `close_stream`.
+        self._owns_loop = False
+
+        # A `QuoteCache` kept fresh by the LEVELONE_QUOTES messages.
+        self.quote_cache = None
+
+        # The latest full quote of every streamed level one symbol.
+        self.quote_book = QuoteBook()
+
+        # The order book of every streamed level two symbol.
+        self.order_books = OrderBooks()
+
+        # The functions called with the messages of each service.
+        self.handlers = HandlerRegistry()
+
+        # The `async for` readers of the stream, and the task feeding them.
+        self.subscribers: List[StreamSubscriber] = []
+        self._receive_task: asyncio.Task = None
+
+        # Decodes the messages, swap it to pick another JSON library.
+        self.json_decoder = default_decoder
+
+        # The reader only queues frames, decoding and handling happen in their own tasks.
+        self.queue_size = 1000
+        self.overflow = 'block'
+        self._frame_queue: StreamQueue = None
+        self._message_queue: StreamQueue = None
+        self._reader_task: asyncio.Task = None
+        self._decoder_task: asyncio.Task = None
+        self._frames_received = 0
+        self._decode_errors = 0
+
+        # Reconnects after a dropped connection, when turned on with `configure_reconnect`.
+        self.reconnect = False
+        self.reconnect_attempts: int = None
+        self.reconnect_delay = 1.0
+        self.reconnect_max_delay = 60.0
+        self.login_timeout = 10.0
+        self.reconnects = 0
+        self.gaps: List[dict] = []
+
+        # The number of data requests when each service was last unsubscribed,
+        # the requests that came before aren't sent again after a reconnect.
+        self._unsubscribed_services: Dict[str, int] = {}
+
+        # The record decoders of the subscribed services.
+        self.service_decoders: Dict[str, ServiceDecoder] = {}
+
+        # The CSV and Parquet files are written by a thread, never by the loop.
+        self.persistence: PersistenceWriter = None
+        self.persistence_capacity = 10000
+        self.persistence_flush_interval = 0.5
+        self.persistence_overflow = 'block'
+
+        # Records the raw frames, when turned on with `record_frames`.
+        self.frame_recorder: PersistenceWriter = None
+
+    def attach_quote_cache(self, quote_cache: QuoteCache) -> None:
+        """Keeps a `QuoteCache` up to date with the LEVELONE_QUOTES messages.
+
+        Every symbol subscribed through `level_one_quotes` is fed to the cache
+        while the subscription is active, so `get_quotes` calls for it are served
+        without a request.
+
+        Arguments:
+        ----
+        quote_cache {QuoteCache} -- The cache to keep up to date.
+
+        Usage:
+        ----
+            >>> td_session.enable_quote_cache(ttl=1.0)
+            >>> td_stream_session = td_session.create_streaming_session()
+            >>> td_stream_session.level_one_quotes(symbols=['MSFT'], fields=list(range(0, 53)))
+        """
+
+        self.quote_cache = quote_cache
+
+        # Catch up with the subscriptions that were made before.
+        for request in self.data_requests['requests']:
+            if request['service'] == 'QUOTE' and request['command'] == 'SUBS':
+                self.quote_cache.subscribe(symbols=request['parameters']['keys'].split(','))
+
     def write_behavior(self, file_path: str, write: str = 'csv', append_mode: bool = True) -> None:        
         """Sets the csv dump location and the append mode.
 
@@ -95,8 +203,10 @@ class TDStreamerClient():
         Keyword Arguments:
         ----
         
-        write {str} -- Defines where you want to write the streaming data to. Right now can only specify
-            'csv'. (default: {'csv'})
+        write {str} -- Defines where you want to write the streaming data to. Can be either 'csv', or
+            'binary' to write a binary tick store to the `file_path` directory, which can be read
+            back with `td.tick_store.TickReader`, or 'parquet' to write a Parquet dataset, partitioned
+            by service and date, to the `file_path` directory. (default: {'csv'})
 
         append_mode {bool} -- Defines whether the write mode should be append or new. If append-mode is True, 
             then all CSV data will go to the existing file. Can either be `True` or `False`. (default: {True})
@@ -111,8 +221,23 @@ class TDStreamerClient():
             >>> td_session.login()
             >>> td_stream_session = td_session.create_streaming_session()
             >>> td_stream_session.write_behavior(file_path='data_dump.csv')
+            >>> td_stream_session.write_behavior(file_path='data_dump', write='binary')
+            >>> td_stream_session.write_behavior(file_path='data_dump', write='parquet')
         """
 
+        if write == 'binary':
+            self.tick_writer = TickWriter(
+                directory=file_path,
+                append_mode=append_mode,
+                capacity=self.persistence_capacity,
+                flush_interval=self.persistence_flush_interval,
+                overflow=self.persistence_overflow
+            )
+
+        if write == 'parquet':
+            self.parquet_sink = ParquetSink(directory=file_path)
+            self._persistence_writer().add_sink(sink=self.parquet_sink)
+
         if write == 'csv':
             self.CSV_PATH = file_path
             self.CSV_PATH_STREAM = self.CSV_PATH.replace(".csv", "_level_2.csv")
@@ -123,19 +248,109 @@ class TDStreamerClient():
             elif append_mode == False:
                 self.CSV_APPEND_MODE = 'w+'
 
-            self.file_stream_level_1 = open(
-                file=self.CSV_PATH, 
-                mode=self.CSV_APPEND_MODE, 
-                newline=''
+            csv_sink = CsvSink(file_path=self.CSV_PATH, rows=self._csv_rows, append_mode=append_mode)
+            self._persistence_writer().add_sink(sink=csv_sink)
+
+            self.file_stream_level_1 = csv_sink.file_level_1
+            self.file_stream_level_2 = csv_sink.file_level_2
+
+            self.write_flag = True
+
+    def configure_persistence(self, capacity: int = 10000, flush_interval: float = 0.5, overflow: str = 'block') -> None:
+        """Defines how the CSV and Parquet files, and the tick store, are written.
+
+        The messages are handed to a writer thread through a bounded buffer,
+        the thread writes everything that's waiting in a single commit, so the
+        loop reading the websocket never waits on the disk. Needs to be called
+        before `write_behavior`.
+
+        Keyword Arguments:
+        ----
+        capacity {int} -- The maximum number of messages waiting to be
+            written. (default: {10000})
+
+        flush_interval {float} -- The minimum number of seconds between two
+            commits. (default: {0.5})
+
+        overflow {str} -- What happens when the buffer is full, can be one of the
+            following: ['block', 'drop_oldest']. `block` waits for the writer to
+            catch up, `drop_oldest` drops the oldest waiting message. (default: {'block'})
+
+        Usage:
+        ----
+            >>> td_stream_session.configure_persistence(capacity=50000, flush_interval=1.0)
+            >>> td_stream_session.write_behavior(file_path='data_dump.csv')
+            >>> td_stream_session.stream()
+            >>> td_stream_session.persistence_stats
+        """
+
+        if overflow not in PERSISTENCE_OVERFLOW_POLICIES:
+            raise ValueError(
+                'Invalid overflow policy, please choose a valid one: {}'.format(', '.join(PERSISTENCE_OVERFLOW_POLICIES))
+            )
+
+        self.persistence_capacity = capacity
+        self.persistence_flush_interval = flush_interval
+        self.persistence_overflow = overflow
+
+    @property
+    def persistence_stats(self) -> dict:
+        """Returns the counters of the writers.
+
+        Returns:
+        ----
+        dict -- The counters of the CSV and Parquet writer thread, with its lag
+            in seconds, and the counters of the tick store.
+        """
+
+        return {
+            'writer': self.persistence.stats if self.persistence is not None else None,
+            'tick_store': self.tick_writer.stats if self.tick_writer is not None else None
+        }
+
+    def record_frames(self, file_path: str, append_mode: bool = False) -> None:
+        """Records the raw frames of the stream to a file.
+
+        Every frame is written as it came off the websocket, along with the
+        time it was received, by a writer thread. The recording can be played
+        back with a `ReplayServer`, to test the client without a live session.
+
+        Arguments:
+        ----
+        file_path {str} -- The file the frames are recorded to.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- `True` to add to an existing recording, `False` to
+            start a new one. (default: {False})
+
+        Usage:
+        ----
+            >>> td_stream_session.record_frames(file_path='session.jsonl')
+            >>> td_stream_session.stream()
+            >>> replay_server = ReplayServer.from_recording(file_path='session.jsonl')
+        """
+
+        if self.frame_recorder is None:
+            self.frame_recorder = PersistenceWriter(
+                capacity=self.persistence_capacity,
+                flush_interval=self.persistence_flush_interval,
+                overflow=self.persistence_overflow
             )
 
-            self.file_stream_level_2 = open(
-                file=self.CSV_PATH_STREAM,
-                mode=self.CSV_APPEND_MODE,
-                newline=''
+        self.frame_recorder.add_sink(FrameSink(file_path=file_path, append_mode=append_mode))
+
+    def _persistence_writer(self) -> PersistenceWriter:
+        """Returns the writer thread, starting it the first time."""
+
+        if self.persistence is None:
+            self.persistence = PersistenceWriter(
+                capacity=self.persistence_capacity,
+                flush_interval=self.persistence_flush_interval,
+                overflow=self.persistence_overflow
             )
 
-            self.write_flag = True
+        return self.persistence
 
     def _write_non_chart_services(self, data_content: dict, service_name: str) -> List:
         """Takes a Non-Chart Services and parses the values to write.
@@ -325,15 +540,19 @@ class TDStreamerClient():
         
         return all_data
 
-    async def _write_to_csv(self, data: dict) -> None:
-        """Writes the stream to a CSV file.
+    def _csv_rows(self, data: dict) -> Tuple[List[list], List[list]]:
+        """Builds the CSV rows of a stream message.
 
-        Takes the data from a stream, determines which sections can be
-        written and then writes it to a CSV file for further manipulation.
+        Takes the data from a stream and determines which sections can be
+        written, the rows are written to the CSV files by the writer thread.
 
         Arguments:
         ----
         data {dict} -- The data stream.
+
+        Returns:
+        ----
+        Tuple[List[list], List[list]] -- The level one rows and the level two rows.
         """
 
         # Deterimne what part of the message we need to get.
@@ -342,10 +561,10 @@ class TDStreamerClient():
         elif 'snapshot' in data.keys():
             data = data['snapshot']
         else:
-            return None
+            return [], []
 
-        stream_writer_level_1 = csv.writer(self.file_stream_level_1)
-        stream_writer_level_2 = csv.writer(self.file_stream_level_2)
+        rows_level_1 = []
+        rows_level_2 = []
 
         for service_result in data:
 
@@ -367,7 +586,7 @@ class TDStreamerClient():
 
                 for row in new_data:
                     new_row = [service_timestamp] + row
-                    stream_writer_level_1.writerow(new_row)  
+                    rows_level_1.append(new_row)  
 
             # Write the Chart Services.
             elif approved_level_1 and chart_history_service and active_service == False:
@@ -377,7 +596,7 @@ class TDStreamerClient():
 
                 for row in new_data:
                     new_row = [service_timestamp] + row
-                    stream_writer_level_1.writerow(new_row)  
+                    rows_level_1.append(new_row)  
 
             # Write the Active Services.
             elif approved_level_1 and chart_history_service == False and active_service:
@@ -387,7 +606,7 @@ class TDStreamerClient():
 
                 for row in new_data:
                     new_row = [service_timestamp] + row
-                    stream_writer_level_1.writerow(new_row)  
+                    rows_level_1.append(new_row)  
 
             # Write the Level 2 Services
             elif approved_level_2:
@@ -397,7 +616,9 @@ class TDStreamerClient():
 
                 for row in new_data:
                     new_row = [service_timestamp] + row
-                    stream_writer_level_2.writerow(new_row)
+                    rows_level_2.append(new_row)
+
+        return rows_level_1, rows_level_2
 
     async def unsubscribe(self, service: str) -> dict:
         """Unsubscribe from a service.
@@ -414,6 +635,11 @@ class TDStreamerClient():
         """
 
         self.unsubscribe_count += 1
+        self._unsubscribed_services[service.upper()] = len(self.data_requests['requests'])
+
+        # The quotes are no longer kept fresh by the stream.
+        if self.quote_cache is not None and service.upper() == 'QUOTE':
+            self.quote_cache.unsubscribe()
 
         service_count = len(self.data_requests['requests']) + self.unsubscribe_count
         
@@ -478,8 +704,53 @@ class TDStreamerClient():
 
         """
 
+        # Resolve the fields of each service once, before the data comes in.
+        for request in self.data_requests['requests']:
+            if request['service'] in SERVICE_FIELD_IDS:
+                self.service_decoders[request['service']] = get_service_decoder(service=request['service'])
+
         return json.dumps(self.data_requests)
 
+    def decode_records(self, message: dict) -> Dict[str, List[tuple]]:
+        """Decodes the data of a message into records.
+
+        Each content entry of the `QUOTE`, `OPTION`, `LEVELONE_*`, `CHART_*`,
+        `TIMESALE_*` and `NEWS_HEADLINE` services becomes a named tuple with
+        a field for each field id, for example `record.bid_price` instead of
+        `content['1']`. Other services are left out.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the stream.
+
+        Returns:
+        ----
+        Dict[str, List[tuple]] -- The records of each service in the message.
+
+        Usage:
+        ----
+            >>> data = await td_stream_session.start_pipeline()
+            >>> records = td_stream_session.decode_records(message=data)
+            >>> for quote in records.get('QUOTE', []):
+                    print(quote.symbol, quote.bid_price)
+        """
+
+        records = {}
+
+        for service_result in message.get('data', ()):
+
+            service = service_result.get('service')
+            service_decoder = self.service_decoders.get(service)
+
+            if service_decoder is None:
+                if service not in SERVICE_FIELD_IDS:
+                    continue
+                service_decoder = self.service_decoders[service] = get_service_decoder(service=service)
+
+            records.setdefault(service, []).extend(service_decoder.decode_content(content=service_result['content']))
+
+        return records
+
     async def build_pipeline(self) -> websockets.WebSocketClientProtocol:
         """Builds a data pipeine for processing data.
 
@@ -540,6 +811,7 @@ class TDStreamerClient():
         asyncio.ensure_future(self._receive_message(return_value=False))
 
         # Keep the Loop going, until an exception is reached.
+        self._owns_loop = True
         self.loop.run_forever()
 
     def close_logic(self, logic_type: str) -> bool:
@@ -563,7 +835,30 @@ class TDStreamerClient():
 
     async def close_stream(self) -> None:
         """Closes the connection to the streaming service."""        
-        
+
+        # The quotes are no longer kept fresh by the stream.
+        if self.quote_cache is not None:
+            self.quote_cache.unsubscribe()
+
+        # Stop reading and decoding.
+        self._stop_dispatch()
+        self._close_subscribers()
+
+        # Let the offloaded handlers finish.
+        await asyncio.get_running_loop().run_in_executor(None, self.handlers.close)
+
+        # Write what's left of the tick store, without blocking the loop.
+        if self.tick_writer is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.tick_writer.close)
+
+        # Same for the CSV and Parquet files.
+        if self.persistence is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.persistence.close)
+
+        # And the recorded frames.
+        if self.frame_recorder is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.frame_recorder.close)
+
         # close the connection.
         await self.connection.close()
 
@@ -577,12 +872,16 @@ class TDStreamerClient():
         {lin_brk}
         """).format(lin_brk="="*80)
         
+        # A pipeline runs on the loop of the caller, leave it be.
+        if not self._owns_loop:
+            return
+
         # Shutdown all asynchronus generators.
         await self.loop.shutdown_asyncgens()
 
         # Stop the loop.
         if self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.loop.stop())
+            self.loop.call_soon_threadsafe(self.loop.stop)
             print(message)
             await asyncio.sleep(3)
 
@@ -691,6 +990,423 @@ class TDStreamerClient():
         await self.connection.send(message)
 
 
+    def add_handler(self, service: str, callback: Callable, symbols: List[str] = None, offload: bool = False) -> Handler:
+        """Calls a function with the messages of a service.
+
+        Instead of going through every message of `start_pipeline`, functions
+        can be registered for the services, and the symbols, they care about.
+        Every message handled by the stream is handed to them.
+
+        Arguments:
+        ----
+        service {str} -- The service, for example `QUOTE` or `TIMESALE_EQUITY`,
+            `*` for every service, or one of `response`, `notify` or `gap`.
+
+        callback {Callable} -- A function or a coroutine, called with each
+            service section of a data message, with its `content`, or with each
+            entry of the `response` and `notify` sections.
+
+        Keyword Arguments:
+        ----
+        symbols {List[str]} -- Only call the function for these symbols.
+            (default: {None})
+
+        offload {bool} -- `True` to run the function in a thread pool, so a
+            slow one doesn't hold up the stream. (default: {False})
+
+        Returns:
+        ----
+        Handler -- The handler, used to remove it with `remove_handler`.
+
+        Usage:
+        ----
+            >>> td_stream_session.level_one_quotes(symbols=['MSFT', 'AAPL'], fields=list(range(0, 10)))
+            >>> td_stream_session.add_handler(service='QUOTE', callback=print, symbols=['MSFT'])
+            >>> td_stream_session.add_handler(service='notify', callback=print)
+            >>> td_stream_session.stream(print_to_console=False)
+        """
+
+        return self.handlers.register(service=service, callback=callback, symbols=symbols, offload=offload)
+
+    def remove_handler(self, handler: Handler) -> None:
+        """Stops calling a handler.
+
+        Arguments:
+        ----
+        handler {Handler} -- The handler returned by `add_handler`.
+        """
+
+        self.handlers.remove(handler=handler)
+
+    def add_subscriber(self, service: str = None, symbols: List[str] = None, records: bool = False,
+                       maxsize: int = 1000, overflow: str = 'drop_oldest') -> StreamSubscriber:
+        """Returns an `async for` reader of the stream.
+
+        Each subscriber has its own bounded queue, and they're all handed the
+        same decoded messages and records, so several consumers can read the
+        same connection. Reading a subscriber starts receiving the messages,
+        so it's used instead of `start_pipeline`, after `build_pipeline`.
+
+        Keyword Arguments:
+        ----
+        service {str} -- Only read this service, every message if not provided. (default: {None})
+
+        symbols {List[str]} -- Only read these symbols of the service. (default: {None})
+
+        records {bool} -- `True` to read decoded records, see `decode_records`, or
+            `False` to read the sections of the service. (default: {False})
+
+        maxsize {int} -- The maximum number of items waiting. (default: {1000})
+
+        overflow {str} -- What happens when the queue is full, can be one of the
+            following: ['block', 'drop_oldest', 'conflate']. `block` holds up every
+            other subscriber until there's room. `conflate` queues each symbol on its
+            own and merges its updates while it waits, so a subscriber that falls
+            behind reads the latest state of each symbol. (default: {'drop_oldest'})
+
+        Returns:
+        ----
+        StreamSubscriber -- The subscriber, closed with `remove_subscriber`.
+
+        Usage:
+        ----
+            >>> td_stream_session.level_one_quotes(symbols=['MSFT', 'AAPL'], fields=list(range(0, 10)))
+            >>> await td_stream_session.build_pipeline()
+            >>> async for quote in td_stream_session.add_subscriber(service='QUOTE', records=True):
+                    print(quote.symbol, quote.bid_price)
+            >>> async for quote in td_stream_session.add_subscriber(service='QUOTE', records=True, overflow='conflate'):
+                    await slow_signal_engine(quote)
+        """
+
+        subscriber = StreamSubscriber(
+            service=service,
+            symbols=symbols,
+            records=records,
+            maxsize=maxsize,
+            overflow=overflow,
+            on_start=self._start_receiving,
+            on_close=self._subscriber_closed
+        )
+
+        self.subscribers.append(subscriber)
+
+        return subscriber
+
+    def remove_subscriber(self, subscriber: StreamSubscriber) -> None:
+        """Closes a subscriber, it stops once it read what was already queued.
+
+        Arguments:
+        ----
+        subscriber {StreamSubscriber} -- The subscriber returned by `add_subscriber`.
+        """
+
+        subscriber.close()
+
+    def _subscriber_closed(self, subscriber: StreamSubscriber) -> None:
+        """Stops handing messages to a closed subscriber."""
+
+        self.subscribers = [other for other in self.subscribers if other is not subscriber]
+
+    def _start_receiving(self) -> None:
+        """Receives the messages in a task, so the subscribers are fed."""
+
+        if self._receive_task is None or self._receive_task.done():
+            self._receive_task = asyncio.ensure_future(self._receive_message(return_value=False))
+
+    async def _deliver(self, message: dict) -> None:
+        """Hands a message to every subscriber."""
+
+        subscribers = self.subscribers
+
+        # The records are decoded once, for every subscriber.
+        records = self.decode_records(message=message) if any(subscriber.records for subscriber in subscribers) else None
+
+        for subscriber in subscribers:
+            await subscriber.deliver(message=message, records=records)
+
+    def _close_subscribers(self) -> None:
+        """Closes every subscriber, once there's nothing left to read."""
+
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+
+    async def run_pipeline(self) -> None:
+        """Builds the pipeline and hands every message to the handlers until the stream closes.
+
+        Usage:
+        ----
+            >>> td_stream_session.add_handler(service='QUOTE', callback=on_quote)
+            >>> asyncio.run(td_stream_session.run_pipeline())
+        """
+
+        await self.build_pipeline()
+        await self._receive_message(return_value=False)
+
+    def configure_dispatch(self, queue_size: int = 1000, overflow: str = 'block') -> None:
+        """Defines how messages are queued between the stream and their handling.
+
+        Frames are read off the websocket by a task that does nothing else, and
+        decoded and handled in other tasks, so a slow handler never holds up the
+        connection. If the handling falls behind, the queue fills up and the
+        overflow policy decides what happens to new messages.
+
+        Keyword Arguments:
+        ----
+        queue_size {int} -- The maximum number of messages waiting to be
+            handled. (default: {1000})
+
+        overflow {str} -- What happens when the queue is full, can be one of the
+            following: ['block', 'drop_oldest', 'coalesce']. `block` waits for room,
+            which eventually holds up the websocket, `drop_oldest` drops the oldest
+            message, and `coalesce` merges level one messages into a queued one
+            with the same services so only the latest fields are kept. A merged
+            message keeps its place, ahead of the messages queued after it.
+            (default: {'block'})
+
+        Usage:
+        ----
+            >>> td_stream_session.configure_dispatch(queue_size=500, overflow='coalesce')
+            >>> td_stream_session.stream()
+            >>> td_stream_session.dispatch_stats
+        """
+
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Invalid overflow policy, please choose a valid one: {}'.format(', '.join(OVERFLOW_POLICIES)))
+
+        self.queue_size = queue_size
+        self.overflow = overflow
+
+    def configure_reconnect(self, enabled: bool = True, max_attempts: int = None, initial_delay: float = 1.0,
+                            max_delay: float = 60.0) -> None:
+        """Reconnects the stream when the connection drops.
+
+        Once the connection is lost, new connections are attempted with an
+        exponential backoff and full jitter. On success the login is redone,
+        the subscriptions are sent again, and a `{'gap': {...}}` message is
+        passed on with the interval the stream was down, so the missing data
+        can be backfilled with `get_price_history`. The gaps are also kept
+        in `gaps`.
+
+        Keyword Arguments:
+        ----
+        enabled {bool} -- `True` to reconnect, `False` to close the stream
+            when the connection drops. (default: {True})
+
+        max_attempts {int} -- The number of attempts before giving up, keeps
+            trying if not provided. (default: {None})
+
+        initial_delay {float} -- The upper bound of the first delay, in seconds,
+            it doubles with every attempt. (default: {1.0})
+
+        max_delay {float} -- The upper bound of any delay, in seconds. (default: {60.0})
+
+        Usage:
+        ----
+            >>> td_stream_session.configure_reconnect(max_attempts=10)
+            >>> td_stream_session.stream()
+            >>> td_stream_session.gaps
+        """
+
+        self.reconnect = enabled
+        self.reconnect_attempts = max_attempts
+        self.reconnect_delay = initial_delay
+        self.reconnect_max_delay = max_delay
+
+    @property
+    def dispatch_stats(self) -> dict:
+        """Returns the counters of the receive and dispatch queues.
+
+        Returns:
+        ----
+        dict -- The number of frames received and the ones that couldn't
+            be decoded, along with the counters of the frame queue and the
+            message queue (depth, max depth, dropped and coalesced messages).
+        """
+
+        return {
+            'frames_received': self._frames_received,
+            'decode_errors': self._decode_errors,
+            'frame_queue': self._frame_queue.stats if self._frame_queue is not None else None,
+            'message_queue': self._message_queue.stats if self._message_queue is not None else None
+        }
+
+    def _start_dispatch(self) -> None:
+        """Starts the reader and decoder tasks."""
+
+        # Decoding is cheap, so the frames always wait for the decoder.
+        self._frame_queue = StreamQueue(maxsize=self.queue_size, overflow='block')
+        self._message_queue = StreamQueue(
+            maxsize=self.queue_size,
+            overflow=self.overflow,
+            key=message_key,
+            merge=merge_messages
+        )
+
+        self._reader_task = asyncio.ensure_future(self._read_frames())
+        self._decoder_task = asyncio.ensure_future(self._decode_frames())
+
+    def _stop_dispatch(self) -> None:
+        """Stops the reader and decoder tasks."""
+
+        for task in (self._reader_task, self._decoder_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+        # Wake up anyone waiting on a message.
+        if self._message_queue is not None:
+            self._message_queue.close()
+
+        self._reader_task = None
+        self._decoder_task = None
+
+    async def _read_frames(self) -> None:
+        """Reads the frames off the websocket into the frame queue."""
+
+        frame_queue = self._frame_queue
+        frame_recorder = self.frame_recorder
+
+        while True:
+
+            try:
+                while True:
+                    frame = await self.connection.recv()
+                    self._frames_received += 1
+                    if frame_recorder is not None:
+                        await frame_recorder.append_async(message=(time.time(), frame))
+                    await frame_queue.put(frame)
+            except websockets.exceptions.ConnectionClosed:
+
+                # The quotes aren't kept fresh while the stream is down.
+                if self.quote_cache is not None:
+                    self.quote_cache.interrupt()
+
+                if not self.reconnect or not await self._reconnect():
+                    frame_queue.close()
+                    return
+
+    async def _reconnect(self) -> bool:
+        """Opens a new connection, logs in and sends the subscriptions again.
+
+        Returns:
+        ----
+        bool -- `True` if the stream is back, `False` if it gave up.
+        """
+
+        disconnected = time.time()
+        attempt = 0
+
+        while self.reconnect_attempts is None or attempt < self.reconnect_attempts:
+
+            # Full jitter, so many clients dropped at once don't come back at once.
+            await asyncio.sleep(random.uniform(0, min(self.reconnect_max_delay, self.reconnect_delay * 2 ** attempt)))
+            attempt += 1
+
+            try:
+                connection = await websockets.client.connect(self.websocket_url)
+                await asyncio.wait_for(self._login(connection=connection), timeout=self.login_timeout)
+            except ValueError as login_error:
+                print('Could not reconnect, closing stream: {}'.format(login_error))
+                return False
+            except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException):
+                continue
+
+            replay_request = self._build_replay_request()
+
+            self.connection = connection
+            await self._send_message(replay_request)
+
+            reconnected = time.time()
+
+            gap = {
+                'disconnected': int(disconnected * 1000),
+                'reconnected': int(reconnected * 1000),
+                'duration': reconnected - disconnected,
+                'attempts': attempt,
+                'subscriptions': {
+                    request['service']: request['parameters']['keys'].split(',')
+                    for request in json.loads(replay_request)['requests']
+                    if 'keys' in request.get('parameters', {})
+                }
+            }
+
+            self.reconnects += 1
+            self.gaps.append(gap)
+
+            # The gap goes down the stream like any other message.
+            await self._frame_queue.put({'gap': gap})
+
+            return True
+
+        return False
+
+    async def _login(self, connection: websockets.WebSocketClientProtocol) -> None:
+        """Logs in on a new connection, and waits for the response.
+
+        Arguments:
+        ----
+        connection {websockets.WebSocketClientProtocol} -- The new connection.
+
+        Raises:
+        ----
+        ValueError: The login was rejected.
+        """
+
+        await connection.send(self._build_login_request())
+
+        while True:
+
+            response = self.json_decoder.loads(await connection.recv())
+
+            for r in response.get('response', ()):
+                if r.get('service') == 'ADMIN' and r.get('command') == 'LOGIN':
+                    if r['content']['code'] == 3:
+                        raise ValueError('LOGIN ERROR: ' + r['content']['msg'])
+                    return
+
+    def _build_replay_request(self) -> str:
+        """Builds the data request sent again after a reconnect.
+
+        Returns:
+        ----
+        [str] -- A JSON string with the subscriptions that are still active,
+            a service subscribed again after it was unsubscribed only keeps
+            the requests that came after.
+        """
+
+        return json.dumps({
+            'requests': [
+                request for request_number, request in enumerate(self.data_requests['requests'])
+                if request_number >= self._unsubscribed_services.get(request['service'], 0)
+            ]
+        })
+
+    async def _decode_frames(self) -> None:
+        """Decodes the frames and passes them on to the message queue."""
+
+        frame_queue = self._frame_queue
+        message_queue = self._message_queue
+
+        while True:
+
+            frame = await frame_queue.get()
+
+            if frame is None:
+                message_queue.close()
+                break
+
+            # A gap message is already a dictionary.
+            if isinstance(frame, dict):
+                await message_queue.put(frame)
+                continue
+
+            try:
+                message_decoded = await self._parse_json_message(message=frame)
+            except ValueError:
+                self._decode_errors += 1
+                continue
+
+            await message_queue.put(message_decoded)
+
     async def _receive_message(self, return_value: bool = False) -> dict:
         """Recieves and processes the messages as needed.
 
@@ -704,42 +1420,68 @@ class TDStreamerClient():
         {dict} -- A python dictionary
         """
 
+        if self._reader_task is None:
+            self._start_dispatch()
+
         # Keep going until cancelled.
         while True:
 
-            try:
-                
-                # Grab the Message
-                message = await self.connection.recv()
-
-                # Parse Message
-                message_decoded = await self._parse_json_message(message=message)
-
-                # Write the data if needed.
-                if self.write_flag:
-                    try:
-                        await self._write_to_csv(data = message_decoded)
-                    except:
-                        print('Could not write content to CSV file, closing stream')
-                        await self.close_stream()
-                        break
-
-                if return_value:
-                    return message_decoded
-
-                elif self.print_to_console:
-                    print('='*20)
-                    print('Message Received:')
-                    print('-'*20)
-                    print(message_decoded)
-                    print('-'*20)
-                    print('')         
+            # Grab the next decoded message.
+            message_decoded = await self._message_queue.get()
 
-            except websockets.exceptions.ConnectionClosed:
+            # The connection was closed, unless we closed it ourselves.
+            if message_decoded is None:
+                self._close_subscribers()
+                if self._reader_task is not None:
+                    await self.close_stream()
+                break
 
-                # stop the connection if there is an error.
-                await self.close_stream()
-                break           
+            # Apply the level one and level two updates.
+            self.quote_book.update_from_message(message=message_decoded)
+            self.order_books.update_from_message(message=message_decoded)
+
+            # Keep the quote cache fresh.
+            if self.quote_cache is not None:
+                self.quote_cache.update_from_message(message=message_decoded)
+
+            # Call the registered handlers.
+            if self.handlers.handlers:
+                await self.handlers.dispatch(message=message_decoded)
+
+            # Feed the subscribers.
+            if self.subscribers:
+                await self._deliver(message=message_decoded)
+
+            # Hand the data to the tick store, it's written off the loop.
+            if self.tick_writer is not None:
+
+                if self.tick_writer.failed:
+                    print('Could not write content to the tick store, closing stream')
+                    await self.close_stream()
+                    break
+
+                await self.tick_writer.append_async(message=message_decoded)
+
+            # Same for the CSV and Parquet files.
+            if self.persistence is not None:
+
+                if self.persistence.failed:
+                    print('Could not write content to file, closing stream')
+                    await self.close_stream()
+                    break
+
+                await self.persistence.append_async(message=message_decoded)
+
+            if return_value:
+                return message_decoded
+
+            elif self.print_to_console:
+                print('='*20)
+                print('Message Received:')
+                print('-'*20)
+                print(message_decoded)
+                print('-'*20)
+                print('')         
 
     async def _parse_json_message(self, message: str) -> dict:
         """Parses incoming messages from the stream
@@ -753,13 +1495,7 @@ class TDStreamerClient():
         dict -- A python dictionary containing the original values.
         """
 
-        try:
-            message_decoded = json.loads(message)
-        except:
-            message = message.encode('utf-8').replace(b'\xef\xbf\xbd', bytes('"None"','utf-8')).decode('utf-8')
-            message_decoded = json.loads(message)
-
-        return message_decoded
+        return self.json_decoder.loads(message)
 
     async def heartbeat(self) -> None:
         """Sending heartbeat to server every 5 seconds."""
@@ -769,7 +1505,13 @@ class TDStreamerClient():
                 await self.connection.send('ping')
                 await asyncio.sleep(5)
             except websockets.exceptions.ConnectionClosed:
-                self.close_stream()
+
+                # The reader brings the connection back, keep beating on the new one.
+                if self.reconnect and self._reader_task is not None:
+                    await asyncio.sleep(5)
+                    continue
+
+                await self.close_stream()
                 break
 
     def _new_request_template(self) -> dict:
@@ -1117,6 +1859,9 @@ class TDStreamerClient():
 
         self.data_requests['requests'].append(request)
 
+        if self.quote_cache is not None:
+            self.quote_cache.subscribe(symbols=symbols)
+
     def level_one_options(self, symbols: List[str], fields: Union[List[str], List[int]]) -> None:
         """
             Represents the LEVEL ONE OPTIONS endpoint for the TD Streaming API. This
@@ -0,0 +1,170 @@
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+from td.dispatch import StreamQueue
+from td.dispatch import merge_symbol_items
+from td.dispatch import symbol_key
+
+
+# How a full subscriber queue makes room, or with `conflate`, keeps the latest state of each symbol.
+SUBSCRIBER_OVERFLOW_POLICIES = ['block', 'drop_oldest', 'conflate']
+
+
+class StreamSubscriber():
+
+    """
+    An `async for` view of the stream, with its own bounded queue.
+
+    Every subscriber of a `TDStreamerClient` is handed the same decoded messages,
+    and the same records, so adding a consumer doesn't copy or parse anything
+    again. A subscriber reads either whole messages, the sections of a single
+    service, or the decoded records of a single service, optionally only for
+    some symbols. A slow subscriber only fills its own queue.
+
+    With the `conflate` policy, every symbol of every service is queued on its
+    own, and an update for a symbol that's still waiting is merged into it, so
+    a subscriber that falls behind reads the latest state of each symbol rather
+    than every tick, while one that keeps up still reads every tick.
+    """
+
+    def __init__(self, service: str = None, symbols: Iterable[str] = None, records: bool = False,
+                 maxsize: int = 1000, overflow: str = 'drop_oldest', on_start: Callable[[], None] = None,
+                 on_close: Callable[['StreamSubscriber'], None] = None) -> None:
+        """Initalizes the `StreamSubscriber`.
+
+        Keyword Arguments:
+        ----
+        service {str} -- Only read this service, every message if not provided. (default: {None})
+
+        symbols {Iterable[str]} -- Only read these symbols of the service. (default: {None})
+
+        records {bool} -- `True` to read decoded records, one per content entry,
+            `False` to read the service sections. (default: {False})
+
+        maxsize {int} -- The maximum number of items waiting. (default: {1000})
+
+        overflow {str} -- What to do when the queue is full, one of `block`,
+            `drop_oldest` or `conflate`. `block` holds up the stream, and every
+            other subscriber, until there's room. `conflate` merges the updates
+            of a symbol while it waits, and only drops the oldest item once
+            `maxsize` symbols are waiting. (default: {'drop_oldest'})
+
+        on_start {Callable[[], None]} -- Called whenever the subscriber is read,
+            used by the stream to start receiving. (default: {None})
+
+        on_close {Callable[[StreamSubscriber], None]} -- Called once the subscriber
+            is closed. (default: {None})
+        """
+
+        if overflow not in SUBSCRIBER_OVERFLOW_POLICIES:
+            raise ValueError(
+                'Invalid overflow policy, please choose a valid one: {}'.format(', '.join(SUBSCRIBER_OVERFLOW_POLICIES))
+            )
+
+        if (symbols is not None or records) and service is None:
+            raise ValueError('Symbols and records can only be read for a single service.')
+
+        self.service = service
+        self.symbols = frozenset(symbols) if symbols is not None else None
+        self.records = records
+        self.conflate = overflow == 'conflate'
+
+        if self.conflate:
+            self.queue = StreamQueue(
+                maxsize=maxsize,
+                overflow='coalesce',
+                key=symbol_key,
+                merge=merge_symbol_items,
+                always_merge=True
+            )
+        else:
+            self.queue = StreamQueue(maxsize=maxsize, overflow=overflow)
+
+        self._on_start = on_start
+        self._on_close = on_close
+
+    def __aiter__(self) -> 'StreamSubscriber':
+        return self
+
+    async def __anext__(self) -> Any:
+
+        if self._on_start is not None:
+            self._on_start()
+
+        item = await self.queue.get()
+
+        if item is None:
+            raise StopAsyncIteration
+
+        return item
+
+    async def deliver(self, message: dict, records: Dict[str, List[tuple]] = None) -> None:
+        """Queues the part of a message the subscriber reads.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+
+        Keyword Arguments:
+        ----
+        records {Dict[str, List[tuple]]} -- The records of the message, by
+            service, decoded once for every subscriber. (default: {None})
+        """
+
+        if self.service is None:
+
+            if not self.conflate or 'data' not in message:
+                await self.queue.put(message)
+                return
+
+            # Each symbol is queued on its own, so it can be merged.
+            for service_result in message['data']:
+                for content_entry in service_result['content']:
+                    await self.queue.put({'data': [dict(service_result, content=[content_entry])]})
+
+            return
+
+        symbols = self.symbols
+
+        if self.records:
+            for record in records.get(self.service, ()):
+                if symbols is None or record.symbol in symbols:
+                    await self.queue.put(record)
+            return
+
+        for service_result in message.get('data', ()):
+
+            if service_result.get('service') != self.service:
+                continue
+
+            if symbols is None and not self.conflate:
+                await self.queue.put(service_result)
+                continue
+
+            content = [
+                content_entry for content_entry in service_result['content']
+                if symbols is None or content_entry.get('key') in symbols
+            ]
+
+            if self.conflate:
+                for content_entry in content:
+                    await self.queue.put(dict(service_result, content=[content_entry]))
+            elif content:
+                await self.queue.put(dict(service_result, content=content))
+
+    def close(self) -> None:
+        """Stops the subscriber, the items already queued can still be read."""
+
+        if not self.queue.closed:
+            self.queue.close()
+            if self._on_close is not None:
+                self._on_close(self)
+
+    @property
+    def stats(self) -> dict:
+        """Returns the counters of the subscriber queue."""
+
+        return self.queue.stats
@@ -0,0 +1,554 @@
+import json
+import mmap
+import os
+import pathlib
+import struct
+
+from collections import namedtuple
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from td.records import SERVICE_FIELD_IDS
+from td.records import get_service_decoder
+from td.persistence import PersistenceWriter
+
+
+# timestamp, symbol id, channel id, value kind, padding, value.
+TICK_RECORD = struct.Struct('<qIHBxd')
+
+# The same record, with an integer in the value slot, so it keeps every digit.
+TICK_RECORD_INTEGER = struct.Struct('<qIHBxq')
+
+# The value is a float, the id of a text in the dictionary, or an integer.
+VALUE_NUMBER = 0
+VALUE_TEXT = 1
+VALUE_INTEGER = 2
+
+# Integers outside this range are stored as floats.
+INTEGER_MIN = -2 ** 63
+INTEGER_MAX = 2 ** 63 - 1
+
+# Reinterprets the bits of an integer slot as a float.
+_INTEGER_BITS = struct.Struct('<q')
+_FLOAT_BITS = struct.Struct('<d')
+
+SEGMENT_SUFFIX = '.ticks'
+DICTIONARY_FILE = 'dictionary.jsonl'
+
+Tick = namedtuple('Tick', ['timestamp', 'symbol', 'service', 'field', 'value'])
+
+
+def _segment_path(directory: pathlib.Path, index: int) -> pathlib.Path:
+    """Returns the path of a segment."""
+
+    return directory.joinpath('segment_{index:06d}{suffix}'.format(index=index, suffix=SEGMENT_SUFFIX))
+
+
+def _trim_segment(path: pathlib.Path) -> None:
+    """Cuts a record left half-written by a crash off the end of a segment."""
+
+    size = path.stat().st_size
+
+    if size % TICK_RECORD.size:
+        os.truncate(path, size - size % TICK_RECORD.size)
+
+
+def _trim_dictionary(path: pathlib.Path) -> None:
+    """Cuts a line left half-written by a crash off the end of the dictionary."""
+
+    with open(file=path, mode='rb+') as dictionary_file:
+
+        content = dictionary_file.read()
+
+        if content and not content.endswith(b'\n'):
+            dictionary_file.truncate(content.rfind(b'\n') + 1)
+
+
+class TickDictionary():
+
+    """
+    The symbols, channels and texts referenced by the tick records.
+
+    Records only hold fixed width ids, the dictionary maps them back to strings.
+    It's stored next to the segments as an append-only file of `[kind, id, value]`
+    lines, where a channel is a `[service, field id]` pair.
+    """
+
+    kinds = ('symbol', 'channel', 'text')
+
+    def __init__(self) -> None:
+        """Initalizes the `TickDictionary`."""
+
+        self.ids: Dict[str, Dict[object, int]] = {kind: {} for kind in self.kinds}
+        self.values: Dict[str, List[object]] = {kind: [] for kind in self.kinds}
+        self.pending: List[list] = []
+
+    def load(self, path: pathlib.Path) -> None:
+        """Loads the entries of a dictionary file.
+
+        Arguments:
+        ----
+        path {pathlib.Path} -- The dictionary file.
+        """
+
+        if not path.exists():
+            return
+
+        with open(file=path, mode='r') as dictionary_file:
+            for line in dictionary_file:
+
+                # A line cut short by a crash was never referenced by a record.
+                try:
+                    kind, entry_id, value = json.loads(line)
+                except ValueError:
+                    break
+
+                if isinstance(value, list):
+                    value = tuple(value)
+
+                self.ids[kind][value] = entry_id
+                self.values[kind].append(value)
+
+    def lookup(self, kind: str, value: object) -> int:
+        """Returns the id of a value, adding it if it's new.
+
+        Arguments:
+        ----
+        kind {str} -- One of `symbol`, `channel` or `text`.
+
+        value {object} -- The value to look up.
+
+        Returns:
+        ----
+        int -- The id of the value.
+        """
+
+        entry_id = self.ids[kind].get(value)
+
+        if entry_id is None:
+            entry_id = self.ids[kind][value] = len(self.values[kind])
+            self.values[kind].append(value)
+            self.pending.append([kind, entry_id, value])
+
+        return entry_id
+
+
+class TickSink():
+
+    """
+    Packs decoded stream messages into the records of an append-only binary tick store.
+
+    Every field of every content entry becomes a fixed width record holding the
+    message timestamp, the symbol, the service and field, and the value, with
+    strings kept in a dictionary. Each batch is written with a single call and
+    synced to disk, and a new segment is started once the current one is full.
+    The sink is driven by the `PersistenceWriter` thread of the `TickWriter`.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], append_mode: bool = True,
+                 segment_size: int = 64 * 1024 * 1024) -> None:
+        """Initalizes the `TickSink` and opens the dictionary.
+
+        Arguments:
+        ----
+        directory {Union[str, pathlib.Path]} -- The directory of the tick store.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- `True` to add to an existing store, `False` to
+            start a new one. (default: {True})
+
+        segment_size {int} -- The size in bytes after which a new segment
+            is started. (default: {64 * 1024 * 1024})
+        """
+
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+
+        segment_paths = sorted(self.directory.glob('*' + SEGMENT_SUFFIX))
+        dictionary_path = self.directory.joinpath(DICTIONARY_FILE)
+
+        if not append_mode:
+            for segment_path in segment_paths:
+                segment_path.unlink()
+            if dictionary_path.exists():
+                dictionary_path.unlink()
+            segment_paths = []
+
+        # New records and entries have to start where the last complete ones end.
+        if segment_paths:
+            _trim_segment(path=segment_paths[-1])
+        if dictionary_path.exists():
+            _trim_dictionary(path=dictionary_path)
+
+        self.dictionary = TickDictionary()
+        self.dictionary.load(path=dictionary_path)
+
+        self.segment_index = len(segment_paths) - 1 if segment_paths else 0
+        self._segment_file = None
+        self._dictionary_file = open(file=dictionary_path, mode='a')
+
+        self._channels: Dict[Tuple[str, str], int] = {}
+        self._buffer = bytearray()
+        self._records = 0
+
+        self.records_written = 0
+        self.bytes_written = 0
+        self.batches = 0
+
+    def write(self, messages: List[dict]) -> None:
+        """Packs the records of a batch of messages.
+
+        Arguments:
+        ----
+        messages {List[dict]} -- Decoded messages from the `TDStreamerClient`.
+        """
+
+        for message in messages:
+            self._records += self._pack(message=message, buffer=self._buffer)
+
+    def commit(self) -> None:
+        """Writes the packed records to disk."""
+
+        buffer = self._buffer
+        records = self._records
+
+        if not buffer:
+            return
+
+        # The dictionary goes first, so every id in a record can be resolved.
+        if self.dictionary.pending:
+            self._dictionary_file.write(''.join(json.dumps(entry) + '\n' for entry in self.dictionary.pending))
+            self._dictionary_file.flush()
+            os.fsync(self._dictionary_file.fileno())
+            self.dictionary.pending = []
+
+        self._buffer = bytearray()
+        self._records = 0
+
+        segment_file = self._current_segment()
+        segment_file.write(buffer)
+        segment_file.flush()
+        os.fsync(segment_file.fileno())
+
+        self.records_written += records
+        self.bytes_written += len(buffer)
+        self.batches += 1
+
+    def close(self) -> None:
+        """Closes the open segment and the dictionary."""
+
+        self._segment_file_close()
+        self._dictionary_file.close()
+
+    def _pack(self, message: dict, buffer: bytearray) -> int:
+        """Packs the records of a message at the end of the buffer."""
+
+        pack_number = TICK_RECORD.pack
+        pack_integer = TICK_RECORD_INTEGER.pack
+        lookup = self.dictionary.lookup
+        channels = self._channels
+        records = 0
+
+        for service_result in message['data']:
+
+            service = service_result.get('service')
+            timestamp = service_result.get('timestamp', 0)
+
+            for content_entry in service_result.get('content', ()):
+
+                symbol_id = lookup('symbol', content_entry.get('key', ''))
+
+                for field_id, field_value in content_entry.items():
+
+                    if field_id == 'key':
+                        continue
+
+                    if isinstance(field_value, str):
+                        kind = VALUE_TEXT
+                        field_value = lookup('text', field_value)
+                    elif isinstance(field_value, int) and INTEGER_MIN <= field_value <= INTEGER_MAX:
+                        kind = VALUE_INTEGER
+                    elif isinstance(field_value, (int, float)):
+                        kind = VALUE_NUMBER
+                    else:
+                        continue
+
+                    channel_id = channels.get((service, field_id))
+                    if channel_id is None:
+                        channel_id = channels[(service, field_id)] = lookup('channel', (service, field_id))
+
+                    if kind == VALUE_INTEGER:
+                        buffer += pack_integer(timestamp, symbol_id, channel_id, kind, field_value)
+                    else:
+                        buffer += pack_number(timestamp, symbol_id, channel_id, kind, field_value)
+
+                    records += 1
+
+        return records
+
+    def _current_segment(self):
+        """Returns the open segment, starting a new one if it's full."""
+
+        if self._segment_file is None:
+            self._segment_file = open(file=_segment_path(self.directory, self.segment_index), mode='ab')
+
+        if self._segment_file.tell() >= self.segment_size:
+            self._segment_file_close()
+            self.segment_index += 1
+            self._segment_file = open(file=_segment_path(self.directory, self.segment_index), mode='ab')
+
+        return self._segment_file
+
+    def _segment_file_close(self) -> None:
+        """Closes the open segment."""
+
+        if self._segment_file is not None:
+            self._segment_file.close()
+            self._segment_file = None
+
+
+class TickWriter(PersistenceWriter):
+
+    """
+    Writes decoded stream messages to an append-only binary tick store.
+
+    A `PersistenceWriter` with a `TickSink`, so messages go through the same
+    bounded ring buffer and writer thread as the CSV and Parquet files, and
+    a failed write shows up in `failed` instead of stopping the thread.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path], append_mode: bool = True,
+                 segment_size: int = 64 * 1024 * 1024, flush_interval: float = 0.5,
+                 capacity: int = 10000, overflow: str = 'block') -> None:
+        """Initalizes the `TickWriter` and starts its thread.
+
+        Arguments:
+        ----
+        directory {Union[str, pathlib.Path]} -- The directory of the tick store.
+
+        Keyword Arguments:
+        ----
+        append_mode {bool} -- `True` to add to an existing store, `False` to
+            start a new one. (default: {True})
+
+        segment_size {int} -- The size in bytes after which a new segment
+            is started. (default: {64 * 1024 * 1024})
+
+        flush_interval {float} -- The minimum number of seconds between two
+            writes, messages that come in meanwhile go in the same write. (default: {0.5})
+
+        capacity {int} -- The maximum number of messages waiting to be
+            written. (default: {10000})
+
+        overflow {str} -- What to do when the ring buffer is full, one of
+            `block` or `drop_oldest`. (default: {'block'})
+        """
+
+        self.tick_sink = TickSink(directory=directory, append_mode=append_mode, segment_size=segment_size)
+        self.directory = self.tick_sink.directory
+        self.segment_size = segment_size
+
+        super().__init__(capacity=capacity, flush_interval=flush_interval, overflow=overflow)
+
+        self.add_sink(sink=self.tick_sink)
+
+    @property
+    def dictionary(self) -> TickDictionary:
+        """Returns the dictionary of the store."""
+
+        return self.tick_sink.dictionary
+
+    def append(self, message: dict) -> None:
+        """Queues a decoded stream message to be written, only data messages are kept.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+        """
+
+        if 'data' in message:
+            super().append(message=message)
+
+    def try_append(self, message: dict) -> bool:
+        """Queues a decoded stream message if there's room, only data messages are kept.
+
+        Arguments:
+        ----
+        message {dict} -- A decoded message from the `TDStreamerClient`.
+
+        Returns:
+        ----
+        bool -- `False` if the message has to wait for room.
+        """
+
+        if 'data' not in message:
+            return True
+
+        return super().try_append(message=message)
+
+    @property
+    def stats(self) -> dict:
+        """Returns the writer counters.
+
+        Returns:
+        ----
+        dict -- The counters of the `PersistenceWriter`, with the number of records
+            and bytes written, the number of writes and the number of segments.
+        """
+
+        stats = super().stats
+
+        stats.update({
+            'records_written': self.tick_sink.records_written,
+            'bytes_written': self.tick_sink.bytes_written,
+            'batches': self.tick_sink.batches,
+            'segments': self.tick_sink.segment_index + 1
+        })
+
+        return stats
+
+
+class TickReader():
+
+    """
+    Reads a tick store written by the `TickWriter`.
+
+    Segments are memory mapped and unpacked with `struct.iter_unpack`, the
+    filters are resolved to ids once, so scanning doesn't touch any strings
+    until a record matches.
+    """
+
+    def __init__(self, directory: Union[str, pathlib.Path]) -> None:
+        """Initalizes the `TickReader`.
+
+        Arguments:
+        ----
+        directory {Union[str, pathlib.Path]} -- The directory of the tick store.
+        """
+
+        self.directory = pathlib.Path(directory)
+        self.dictionary = TickDictionary()
+        self.dictionary.load(path=self.directory.joinpath(DICTIONARY_FILE))
+
+        # channel id -> (service, field name)
+        self._channel_names = []
+
+        for service, field_id in self.dictionary.values['channel']:
+            field = field_id
+            if service in SERVICE_FIELD_IDS:
+                service_decoder = get_service_decoder(service=service)
+                if field_id in service_decoder.field_ids:
+                    field = service_decoder.field_names[service_decoder.field_ids.index(field_id)]
+            self._channel_names.append((service, field))
+
+    @property
+    def segments(self) -> List[pathlib.Path]:
+        """Returns the segments, oldest first."""
+
+        return sorted(self.directory.glob('*' + SEGMENT_SUFFIX))
+
+    @property
+    def symbols(self) -> List[str]:
+        """Returns the symbols in the store."""
+
+        return list(self.dictionary.values['symbol'])
+
+    def _segment_records(self, segment_path: pathlib.Path) -> Iterator[tuple]:
+        """Unpacks the raw records of a segment."""
+
+        with open(file=segment_path, mode='rb') as segment_file:
+
+            size = os.fstat(segment_file.fileno()).st_size
+
+            # A record cut short by a crash is left out.
+            size -= size % TICK_RECORD.size
+
+            if size == 0:
+                return
+
+            # The map is released with the iterator, so a scan can stop early.
+            segment_map = mmap.mmap(segment_file.fileno(), length=size, access=mmap.ACCESS_READ)
+
+        yield from TICK_RECORD_INTEGER.iter_unpack(segment_map)
+
+    def scan(self, service: str = None, symbols: List[str] = None) -> Iterator[Tick]:
+        """Scans the ticks of the store, oldest first.
+
+        Keyword Arguments:
+        ----
+        service {str} -- Only return the ticks of this service, for
+            example `TIMESALE_EQUITY`. (default: {None})
+
+        symbols {List[str]} -- Only return the ticks of these symbols. (default: {None})
+
+        Returns:
+        ----
+        Iterator[Tick] -- The ticks, with the field names of `td.records`
+            when the service has a decoder.
+        """
+
+        symbol_ids = None
+        channel_ids = None
+
+        if symbols is not None:
+            symbol_ids = {
+                self.dictionary.ids['symbol'][symbol] for symbol in symbols if symbol in self.dictionary.ids['symbol']
+            }
+
+        if service is not None:
+            channel_ids = {channel_id for channel_id, names in enumerate(self._channel_names) if names[0] == service}
+
+        symbol_values = self.dictionary.values['symbol']
+        text_values = self.dictionary.values['text']
+        channel_names = self._channel_names
+        integer_bits = _INTEGER_BITS.pack
+        float_value = _FLOAT_BITS.unpack
+
+        for segment_path in self.segments:
+            for timestamp, symbol_id, channel_id, kind, value in self._segment_records(segment_path=segment_path):
+
+                if channel_ids is not None and channel_id not in channel_ids:
+                    continue
+                if symbol_ids is not None and symbol_id not in symbol_ids:
+                    continue
+
+                # Only integers are kept in the slot as they are.
+                if kind != VALUE_INTEGER:
+                    value = float_value(integer_bits(value))[0]
+                    if kind == VALUE_TEXT:
+                        value = text_values[int(value)]
+
+                service_name, field = channel_names[channel_id]
+
+                yield Tick(timestamp, symbol_values[symbol_id], service_name, field, value)
+
+    def to_numpy(self, segment_path: pathlib.Path) -> Any:
+        """Maps a segment to a NumPy structured array, without copying it.
+
+        Arguments:
+        ----
+        segment_path {pathlib.Path} -- One of the `segments`.
+
+        Returns:
+        ----
+        numpy.ndarray -- The records, with the `timestamp`, `symbol`, `channel`,
+            `kind` and `value` fields, and `integer_value`, the same slot read
+            as an integer, for the records of the `VALUE_INTEGER` kind.
+        """
+
+        import numpy
+
+        dtype = numpy.dtype({
+            'names': ['timestamp', 'symbol', 'channel', 'kind', 'padding', 'value', 'integer_value'],
+            'formats': ['<i8', '<u4', '<u2', 'u1', 'u1', '<f8', '<i8'],
+            'offsets': [0, 8, 12, 14, 15, 16, 16],
+            'itemsize': TICK_RECORD.size
+        })
+
+        return numpy.memmap(segment_path, dtype=dtype, mode='r')
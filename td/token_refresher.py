@@ -0,0 +1,98 @@
+import threading
+import time
+
+
+class TokenRefresher():
+
+    """
+    Refreshes the tokens of a `TDClient` ahead of time, in a thread.
+
+    The client keeps the time each token needs refreshing as a monotonic
+    deadline. The refresher sleeps until `lead_time` seconds before the
+    earliest one, and refreshes the tokens that are due then, so requests
+    never find a token that needs refreshing, and never wait for one.
+    """
+
+    def __init__(self, td_client: object, lead_time: float = 600.0, retry_delay: float = 30.0) -> None:
+        """Initalizes the `TokenRefresher` and starts its thread.
+
+        Arguments:
+        ----
+        td_client {TDClient} -- The client whose tokens are refreshed.
+
+        Keyword Arguments:
+        ----
+        lead_time {float} -- The number of seconds before the client would
+            refresh a token on its own that the refresher does it. (default: {600.0})
+
+        retry_delay {float} -- The number of seconds to wait after a refresh
+            that didn't go through. (default: {30.0})
+        """
+
+        self.td_client = td_client
+        self.lead_time = lead_time
+        self.retry_delay = retry_delay
+
+        self.refreshes = 0
+        self.errors = 0
+        self.error: Exception = None
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+        self._thread = threading.Thread(target=self._run, name='TokenRefresher', daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        """Makes the refresher look at the deadlines again, after they changed."""
+
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stops the thread."""
+
+        self._stop.set()
+        self._wake.set()
+
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def running(self) -> bool:
+        """Returns `True` while the thread runs."""
+
+        return self._thread.is_alive()
+
+    def _delay(self) -> float:
+        """Returns the seconds until the next refresh is due, `None` if there are no tokens."""
+
+        if not self.td_client.token_deadlines_known:
+            return None
+
+        return self.td_client._token_deadline - self.lead_time - time.monotonic()
+
+    def _run(self) -> None:
+        """Waits for the next deadline, and refreshes the tokens due."""
+
+        while not self._stop.is_set():
+
+            delay = self._delay()
+
+            if delay is None or delay > 0:
+                self._wake.wait(timeout=delay if delay is not None else self.retry_delay)
+                self._wake.clear()
+                continue
+
+            try:
+                self.td_client._refresh_tokens(ahead=self.lead_time)
+                self.refreshes += 1
+            except Exception as refresh_error:
+                self.errors += 1
+                self.error = refresh_error
+
+            delay = self._delay()
+
+            # The refresh didn't go through, try again later.
+            if delay is not None and delay <= 0:
+                self._wake.wait(timeout=self.retry_delay)
+                self._wake.clear()
@@ -0,0 +1,132 @@
+import json
+import time
+import multiprocessing as mp
+
+from typing import Tuple
+
+
+# The number of times a reader copies the state before it waits for the lock.
+READ_RETRIES = 1000
+
+
+class SharedTokenStore():
+
+    """
+    Shares the token state of a `TDClient` between processes.
+
+    The state is kept as JSON in shared memory, so every process forked from
+    the one that created the store sees the same tokens. Writers take a lock,
+    so only one process refreshes the tokens at a time, and bump a sequence
+    number before and after each write. Readers don't take the lock: they copy
+    the state and retry if the sequence number was odd or moved while they
+    copied it, and only wait for the lock if that keeps failing, so a writer
+    that died in the middle of a write can't make them spin forever. A reader
+    that passes the version it last saw gets nothing back unless the state
+    changed, which costs a single read of shared memory.
+    """
+
+    def __init__(self, capacity: int = 16384) -> None:
+        """Initalizes the `SharedTokenStore`.
+
+        Keyword Arguments:
+        ----
+        capacity {int} -- The number of bytes the JSON state can take. (default: {16384})
+        """
+
+        self.capacity = capacity
+
+        # Held by the process writing to the store, it's reentrant so a
+        # process refreshing the tokens can save them.
+        self.lock = mp.RLock()
+
+        self._sequence = mp.RawValue('Q', 0)
+        self._length = mp.RawValue('I', 0)
+        self._buffer = mp.RawArray('c', capacity)
+
+    @property
+    def version(self) -> int:
+        """Returns the version of the state, it changes with every write."""
+
+        return self._sequence.value
+
+    def write(self, state: dict) -> int:
+        """Saves the state to the store.
+
+        Arguments:
+        ----
+        state {dict} -- The state of the client.
+
+        Returns:
+        ----
+        int -- The version of the state written.
+        """
+
+        payload = json.dumps(state).encode('utf-8')
+
+        if len(payload) > self.capacity:
+            raise ValueError('The state takes {} bytes, the store only holds {}.'.format(len(payload), self.capacity))
+
+        with self.lock:
+            self._sequence.value += 1
+            self._length.value = len(payload)
+            self._buffer[:len(payload)] = payload
+            self._sequence.value += 1
+
+            return self._sequence.value
+
+    def read(self, since: int = None, timeout: float = 5.0) -> Tuple[int, dict]:
+        """Reads the state from the store, without taking the lock if it can.
+
+        Keyword Arguments:
+        ----
+        since {int} -- The version the reader already has. (default: {None})
+
+        timeout {float} -- The number of seconds to wait for the lock, once
+            copying the state without it failed `READ_RETRIES` times. (default: {5.0})
+
+        Raises:
+        ----
+        TimeoutError -- The lock is still held, the writer holding it most
+            likely died in the middle of a write.
+
+        Returns:
+        ----
+        Tuple[int, dict] -- The version and the state, the state is `None` if it's
+            still at version `since`, and empty if nothing was written yet.
+        """
+
+        for _ in range(READ_RETRIES):
+
+            version = self._sequence.value
+
+            # A write is in progress.
+            if version & 1:
+                time.sleep(0)
+                continue
+
+            if version == since:
+                return version, None
+
+            payload = self._buffer[:self._length.value]
+
+            # The state was rewritten while it was copied.
+            if self._sequence.value != version:
+                continue
+
+            return version, json.loads(payload) if payload else {}
+
+        if not self.lock.acquire(timeout=timeout):
+            raise TimeoutError('The token store is still being written after {} seconds.'.format(timeout))
+
+        try:
+            version = self._sequence.value
+
+            if version == since:
+                return version, None
+
+            payload = self._buffer[:self._length.value]
+
+            return version, json.loads(payload) if payload else {}
+
+        finally:
+            self.lock.release()
@@ -0,0 +1,257 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import aiohttp.test_utils
+import aiohttp.web
+
+from typing import List
+from unittest import TestCase
+from td.async_client import AsyncTDClient
+from td.exceptions import ExdLmtError
+from td.exceptions import ForbidError
+from td.exceptions import NotFndError
+from td.exceptions import NotNulError
+from td.exceptions import ServerError
+from td.mock_api import MockTDServer
+
+
+def create_async_client(url: str, credentials_path: str) -> AsyncTDClient:
+    """Creates an `AsyncTDClient` that talks to a local server, already logged in."""
+
+    td_client = AsyncTDClient(
+        client_id='MOCK_CLIENT_ID',
+        redirect_uri='http://localhost/callback',
+        credentials_path=credentials_path,
+        _do_init=False
+    )
+    td_client.config['api_endpoint'] = url
+
+    now = time.time()
+
+    td_client.state.update({
+        'access_token': 'MOCK_ACCESS_TOKEN',
+        'refresh_token': 'MOCK_REFRESH_TOKEN',
+        'access_token_expires_at': now + 1800,
+        'refresh_token_expires_at': now + 7776000,
+        'logged_in': True
+    })
+    td_client._update_token_deadlines()
+    td_client.authstate = True
+
+    return td_client
+
+
+class TDAsyncClient(TestCase):
+
+    """Will perform a unit test for the `AsyncTDClient` against the mock API."""
+
+    def setUp(self) -> None:
+        """Start the mock server."""
+
+        self.directory = tempfile.mkdtemp()
+
+        self.mock_server = MockTDServer()
+        self.mock_server.start()
+
+        self.td_client = create_async_client(
+            url=self.mock_server.url,
+            credentials_path=os.path.join(self.directory, 'td_state.json')
+        )
+        self.td_client.configure_rate_limit(enabled=False)
+
+    def tearDown(self) -> None:
+        """Stop the mock server."""
+
+        self.mock_server.stop()
+        shutil.rmtree(self.directory)
+
+    def run_client(self, coroutine) -> object:
+        """Runs a coroutine, then closes the session of the client on the same loop."""
+
+        async def run():
+            try:
+                return await coroutine
+            finally:
+                await self.td_client.close()
+
+        return asyncio.run(run())
+
+    def test_endpoints(self):
+        """Test that the endpoint methods answer with the samples."""
+
+        async def call_endpoints():
+            quotes = await self.td_client.get_quotes(instruments=['MSFT', 'SQ'])
+            accounts = await self.td_client.get_accounts()
+            return quotes, accounts
+
+        quotes, accounts = self.run_client(call_endpoints())
+
+        self.assertEqual(sorted(quotes), ['MSFT', 'SQ'])
+        self.assertIsInstance(accounts, list)
+        self.assertEqual(self.mock_server.stats['requests'], 2)
+
+    def test_not_found(self):
+        """Test that an unknown endpoint raises a `NotFndError`."""
+
+        with self.assertRaises(NotFndError):
+            self.run_client(self.td_client._make_request(method='get', endpoint='marketdata/unknown'))
+
+    def test_quote_cache_and_batching(self):
+        """Test that concurrent calls share a request, and fresh quotes come from the cache."""
+
+        self.td_client.enable_quote_cache(ttl=60.0)
+        self.td_client.enable_quote_batching(window=0.05)
+
+        async def get_quotes():
+            quotes = await asyncio.gather(
+                self.td_client.get_quotes(instruments=['MSFT']),
+                self.td_client.get_quotes(instruments=['sq'])
+            )
+            requests = self.mock_server.stats['requests']
+            cached_quotes = await self.td_client.get_quotes(instruments=[' msft', 'SQ'])
+            return quotes, requests, cached_quotes
+
+        quotes, requests, cached_quotes = self.run_client(get_quotes())
+
+        self.assertEqual([list(symbol_quotes) for symbol_quotes in quotes], [['MSFT'], ['SQ']])
+        self.assertEqual(requests, 1)
+        self.assertEqual(sorted(cached_quotes), ['MSFT', 'SQ'])
+        self.assertEqual(self.mock_server.stats['requests'], 1)
+
+    def test_token_refresh(self):
+        """Test that a due access token is refreshed in the executor, before the request."""
+
+        self.td_client.state['access_token_expires_at'] = time.time()
+        self.td_client._update_token_deadlines()
+
+        threads = []
+        validate_token = self.td_client.validate_token
+
+        def record_thread():
+            threads.append(threading.current_thread())
+            return validate_token()
+
+        self.td_client.validate_token = record_thread
+
+        self.run_client(self.td_client.get_accounts())
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+        self.assertEqual(self.mock_server.stats['requests'], 2)
+        self.assertGreater(self.td_client._access_token_deadline, time.monotonic() + 1000)
+
+    def test_prepare_params(self):
+        """Test that the params are dropped when `None` and sent as strings otherwise."""
+
+        self.assertEqual(
+            self.td_client._prepare_params(params={'symbol': 'MSFT', 'needExtendedHoursData': True, 'period': None}),
+            {'symbol': 'MSFT', 'needExtendedHoursData': 'True'}
+        )
+        self.assertIsNone(self.td_client._prepare_params(params=None))
+
+    def test_close(self):
+        """Test that closing the client closes its session, and a new one is made for the next request."""
+
+        async def close_and_reopen():
+            await self.td_client.get_accounts()
+            async_session = self.td_client.async_session
+            await self.td_client.close()
+            closed = async_session.closed and self.td_client._async_session is None
+            await self.td_client.get_accounts()
+            return closed, self.td_client.async_session is not async_session
+
+        self.assertEqual(self.run_client(close_and_reopen()), (True, True))
+
+
+class TDAsyncClientErrors(TestCase):
+
+    """Will perform a unit test for the error handling of the `AsyncTDClient`."""
+
+    def setUp(self) -> None:
+        """Set up the client."""
+
+        self.directory = tempfile.mkdtemp()
+        self.status_codes: List[int] = []
+        self.requests = 0
+
+    def tearDown(self) -> None:
+        """Remove the credentials."""
+
+        shutil.rmtree(self.directory)
+
+    async def handle(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Answers with the next status code, and a 200 once they're used up."""
+
+        self.requests += 1
+        status_code = self.status_codes.pop(0) if self.status_codes else 200
+
+        return aiohttp.web.json_response({'status': status_code}, status=status_code, headers={'Retry-After': '0'})
+
+    def request(self, status_codes: List[int], rate_limit: bool = False) -> tuple:
+        """Makes a request to a server answering with the status codes.
+
+        Returns:
+        ----
+        tuple -- The response, and the client.
+        """
+
+        self.status_codes = list(status_codes)
+
+        async def make_request():
+
+            application = aiohttp.web.Application()
+            application.router.add_route('*', '/{path:.*}', self.handle)
+
+            test_server = aiohttp.test_utils.TestServer(application)
+            await test_server.start_server()
+
+            td_client = create_async_client(
+                url=str(test_server.make_url('')).rstrip('/'),
+                credentials_path=os.path.join(self.directory, 'td_state.json')
+            )
+            td_client.configure_rate_limit(requests_per_minute=60000, enabled=rate_limit, retries=2)
+
+            try:
+                return await td_client._make_request(method='get', endpoint='accounts'), td_client
+            finally:
+                await td_client.close()
+                await test_server.close()
+
+        return asyncio.run(make_request())
+
+    def test_status_codes(self):
+        """Test that the error status codes raise the matching exceptions."""
+
+        for status_code, error in ((400, NotNulError), (403, ForbidError), (500, ServerError), (503, ServerError)):
+            with self.assertRaises(error):
+                self.request(status_codes=[status_code])
+
+    def test_rate_limit_retry(self):
+        """Test that a throttled request is retried once the scheduler was penalized."""
+
+        response, td_client = self.request(status_codes=[429, 429], rate_limit=True)
+
+        self.assertEqual(response, {'status': 200})
+        self.assertEqual(self.requests, 3)
+        self.assertEqual(td_client.request_scheduler.stats['rate_limited'], 2)
+
+    def test_rate_limit_exceeded(self):
+        """Test that a request still throttled after its retries raises an `ExdLmtError`."""
+
+        with self.assertRaises(ExdLmtError):
+            self.request(status_codes=[429, 429, 429], rate_limit=True)
+
+        self.assertEqual(self.requests, 3)
+
+        # Without the rate limiter, a 429 isn't retried.
+        with self.assertRaises(ExdLmtError):
+            self.request(status_codes=[429])
+
+
+if __name__ == '__main__':
+    unittest.main()
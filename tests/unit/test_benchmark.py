@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import unittest
+
+from unittest import TestCase
+from td.benchmark import BENCHMARK_SERVICES
+from td.benchmark import benchmark_service
+from td.benchmark import main
+from td.benchmark import synthetic_frames
+from td.stream import TDStreamerClient
+
+
+class TDBenchmark(TestCase):
+
+    """Will perform a unit test for the streaming benchmarks."""
+
+    def test_synthetic_frames(self):
+        """Test that the frames are stream messages the client can write, and repeatable."""
+
+        stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+
+        for service in BENCHMARK_SERVICES:
+
+            frames = synthetic_frames(service=service, count=3, symbols=2)
+            rows_level_1, rows_level_2 = stream_client._csv_rows(data=json.loads(frames[0]))
+
+            self.assertEqual(frames, synthetic_frames(service=service, count=3, symbols=2))
+            self.assertTrue(rows_level_1 or rows_level_2, service)
+
+    def test_benchmark_service(self):
+        """Test that each step of a service is measured."""
+
+        frames = synthetic_frames(service='QUOTE', count=50)
+        results = benchmark_service(service='QUOTE', frames=frames)
+
+        self.assertEqual(list(results), ['parse', 'service_rows', 'csv_rows', 'records', 'message'])
+        self.assertEqual(results['parse']['frames'], 50)
+        self.assertLessEqual(results['parse']['latency_us']['p50'], results['parse']['latency_us']['p99'])
+        self.assertGreater(results['records']['allocations']['bytes_per_frame'], 0)
+
+    def test_command_line(self):
+        """Test that the command line writes a JSON report."""
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            file_path = os.path.join(directory, 'report.json')
+            main([
+                '--frames', '20',
+                '--services', 'LISTED_BOOK', 'ACTIVES_NASDAQ',
+                '--stages', 'parse', 'csv_rows',
+                '--output', file_path
+            ])
+
+            with open(file_path, 'r') as report_file:
+                report = json.load(report_file)
+
+        self.assertEqual(list(report['services']), ['LISTED_BOOK', 'ACTIVES_NASDAQ'])
+        self.assertEqual(list(report['services']['LISTED_BOOK']['stages']), ['parse', 'csv_rows'])
+        self.assertIn('json_backend', report['environment'])
+
+    def test_invalid_arguments(self):
+        """Test that unknown services and steps are rejected."""
+
+        with self.assertRaises(ValueError):
+            synthetic_frames(service='LEVELONE_CRYPTO')
+
+        with self.assertRaises(ValueError):
+            benchmark_service(service='QUOTE', frames=[], stages=['send'])
+
+
+if __name__ == '__main__':
+    unittest.main()
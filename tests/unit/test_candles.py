@@ -0,0 +1,84 @@
+import json
+import unittest
+
+from unittest import TestCase
+from td.candles import Candles
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TDCandles(TestCase):
+
+    """Will perform a unit test for the columnar `Candles`."""
+
+    def setUp(self) -> None:
+        """Set up the Candles."""
+
+        with open('samples/responses/sample_historical_prices.jsonc', 'rb') as history_file:
+            self.content = history_file.read()
+
+        self.response = json.loads(self.content)
+
+    def test_decode_from_bytes(self):
+        """Test that decoding the raw body matches decoding the JSON."""
+
+        candles = Candles.from_json(content=self.content)
+
+        self.assertEqual(candles.symbol, self.response['symbol'])
+        self.assertEqual(len(candles), len(self.response['candles']))
+        self.assertEqual(candles, Candles.from_response(response=self.response))
+        self.assertEqual(candles.to_response(), self.response)
+
+    def test_decode_other_layout(self):
+        """Test that a body with the fields in another order still decodes."""
+
+        content = b'{"candles":[{"datetime":1,"volume":3,"open":1.5,"high":2,"low":0,"close":1}],"symbol":"MSFT"}'
+        candles = Candles.from_json(content=content)
+
+        self.assertEqual(
+            candles.to_candles(),
+            [{'open': 1.5, 'high': 2.0, 'low': 0.0, 'close': 1.0, 'volume': 3, 'datetime': 1}]
+        )
+
+    def test_decode_empty(self):
+        """Test that an empty response decodes to empty columns."""
+
+        candles = Candles.from_json(content=b'{"candles":[],"symbol":"MSFT","empty":true}')
+
+        self.assertTrue(candles.empty)
+        self.assertEqual(candles.symbol, 'MSFT')
+
+    def test_between(self):
+        """Test that a date range only keeps the candles inside it."""
+
+        candles = Candles.from_json(content=self.content)
+        datetimes = candles['datetime']
+
+        selected = candles.between(start=datetimes[1], end=datetimes[3])
+
+        self.assertEqual(list(selected['datetime']), list(datetimes[1:4]))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed.')
+    def test_to_numpy(self):
+        """Test that the NumPy arrays share memory with the columns."""
+
+        candles = Candles.from_json(content=self.content)
+        arrays = candles.to_numpy()
+
+        candles['close'][0] = -1.0
+
+        self.assertEqual(arrays['close'][0], -1.0)
+        self.assertEqual(arrays['datetime'].dtype, numpy.dtype('datetime64[ms]'))
+
+    def tearDown(self) -> None:
+        """Teardown the Candles."""
+
+        self.content = None
+        self.response = None
+
+
+if __name__ == '__main__':
+    unittest.main()
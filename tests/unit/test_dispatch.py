@@ -0,0 +1,161 @@
+import asyncio
+import unittest
+
+from unittest import TestCase
+from td.dispatch import StreamQueue
+from td.dispatch import message_key
+from td.dispatch import merge_messages
+
+
+def quote_message(timestamp: int, content: list) -> dict:
+    """Builds a LEVELONE_QUOTES data message."""
+
+    return {'data': [{'service': 'QUOTE', 'timestamp': timestamp, 'command': 'SUBS', 'content': content}]}
+
+
+class TDStreamQueue(TestCase):
+
+    """Will perform a unit test for the `StreamQueue`."""
+
+    def test_drop_oldest(self):
+        """Test that a full queue drops its oldest item."""
+
+        async def run_queue():
+            stream_queue = StreamQueue(maxsize=2, overflow='drop_oldest')
+            for item in range(5):
+                await stream_queue.put(item)
+            stream_queue.close()
+            return [await stream_queue.get(), await stream_queue.get(), await stream_queue.get()], stream_queue.stats
+
+        items, stats = asyncio.run(run_queue())
+
+        self.assertEqual(items, [3, 4, None])
+        self.assertEqual(stats['dropped'], 3)
+        self.assertEqual(stats['max_depth'], 2)
+
+    def test_block(self):
+        """Test that a full queue waits for room."""
+
+        async def run_queue():
+            stream_queue = StreamQueue(maxsize=1, overflow='block')
+            await stream_queue.put(1)
+            put_task = asyncio.ensure_future(stream_queue.put(2))
+            await asyncio.sleep(0.01)
+            blocked = not put_task.done()
+            first = await stream_queue.get()
+            await put_task
+            return blocked, first, await stream_queue.get()
+
+        self.assertEqual(asyncio.run(run_queue()), (True, 1, 2))
+
+    def test_created_outside_the_loop(self):
+        """Test that a queue made before the loop runs waits on events of the running loop."""
+
+        stream_queue = StreamQueue(maxsize=1, overflow='block')
+
+        async def run_queue():
+            get_task = asyncio.ensure_future(stream_queue.get())
+            await asyncio.sleep(0.01)
+            await stream_queue.put(1)
+            await stream_queue.put(2)
+            stream_queue.close()
+            return await get_task, await stream_queue.get(), await stream_queue.get()
+
+        self.assertEqual(asyncio.run(run_queue()), (1, 2, None))
+
+        # Closing a queue that was never waited on doesn't need a loop.
+        StreamQueue().close()
+
+    def test_coalesce(self):
+        """Test that level one messages are merged per symbol once the queue is full."""
+
+        async def run_queue():
+            stream_queue = StreamQueue(maxsize=2, overflow='coalesce', key=message_key, merge=merge_messages)
+            await stream_queue.put(quote_message(1, [{'key': 'MSFT', '1': 1.0, '2': 2.0}]))
+            await stream_queue.put({'notify': [{'heartbeat': '1'}]})
+            await stream_queue.put(quote_message(2, [{'key': 'MSFT', '1': 1.5}, {'key': 'AAPL', '1': 3.0}]))
+            return await stream_queue.get(), await stream_queue.get(), stream_queue.stats
+
+        merged, notify, stats = asyncio.run(run_queue())
+
+        self.assertEqual(
+            merged,
+            quote_message(2, [{'key': 'MSFT', '1': 1.5, '2': 2.0}, {'key': 'AAPL', '1': 3.0}])
+        )
+        self.assertIn('notify', notify)
+        self.assertEqual(stats['coalesced'], 1)
+
+    def test_coalesce_with_room(self):
+        """Test that messages keep their order while the queue has room."""
+
+        async def run_queue():
+            stream_queue = StreamQueue(maxsize=3, overflow='coalesce', key=message_key, merge=merge_messages)
+            await stream_queue.put(quote_message(1, [{'key': 'MSFT', '1': 1.0}]))
+            await stream_queue.put({'notify': [{'heartbeat': '1'}]})
+            await stream_queue.put(quote_message(2, [{'key': 'MSFT', '1': 1.5}]))
+
+            # Full now, so the next message merges into the newest queued one.
+            await stream_queue.put(quote_message(3, [{'key': 'MSFT', '1': 2.0}]))
+            stream_queue.close()
+            return [await stream_queue.get() for _ in range(4)], stream_queue.stats
+
+        items, stats = asyncio.run(run_queue())
+
+        self.assertEqual(items, [
+            quote_message(1, [{'key': 'MSFT', '1': 1.0}]),
+            {'notify': [{'heartbeat': '1'}]},
+            quote_message(3, [{'key': 'MSFT', '1': 2.0}]),
+            None
+        ])
+        self.assertEqual(stats['coalesced'], 1)
+
+    def test_always_merge(self):
+        """Test that an `always_merge` queue merges even when there's room."""
+
+        async def run_queue():
+            stream_queue = StreamQueue(
+                maxsize=10,
+                overflow='coalesce',
+                key=message_key,
+                merge=merge_messages,
+                always_merge=True
+            )
+            await stream_queue.put(quote_message(1, [{'key': 'MSFT', '1': 1.0}]))
+            await stream_queue.put(quote_message(2, [{'key': 'MSFT', '1': 1.5}]))
+            return len(stream_queue), await stream_queue.get()
+
+        self.assertEqual(asyncio.run(run_queue()), (1, quote_message(2, [{'key': 'MSFT', '1': 1.5}])))
+
+    def test_close_while_blocked(self):
+        """Test that a put waiting for room drops its item once the queue is closed."""
+
+        async def run_queue():
+            stream_queue = StreamQueue(maxsize=1, overflow='block')
+            await stream_queue.put(1)
+            put_task = asyncio.ensure_future(stream_queue.put(2))
+            await asyncio.sleep(0.01)
+            stream_queue.close()
+            await put_task
+            return await stream_queue.get(), await stream_queue.get()
+
+        self.assertEqual(asyncio.run(run_queue()), (1, None))
+
+    def test_only_level_one_coalesces(self):
+        """Test that only level one data messages have a key."""
+
+        self.assertEqual(message_key(quote_message(1, [])), ('QUOTE',))
+        self.assertIsNone(message_key({'data': [{'service': 'TIMESALE_EQUITY', 'content': []}]}))
+        self.assertIsNone(message_key({'response': []}))
+
+    def test_invalid_policy(self):
+        """Test that unknown policies and incomplete coalescing are rejected."""
+
+        with self.assertRaises(ValueError):
+            StreamQueue(overflow='drop_newest')
+
+        with self.assertRaises(ValueError):
+            StreamQueue(overflow='coalesce')
+
+
+if __name__ == '__main__':
+    unittest.main()
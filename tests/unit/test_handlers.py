@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import unittest
+
+from unittest import TestCase
+from td.handlers import HandlerRegistry
+from td.stream import TDStreamerClient
+
+
+def quote_message() -> dict:
+    """Builds a LEVELONE_QUOTES data message with two symbols."""
+
+    return {
+        'data': [
+            {
+                'service': 'QUOTE',
+                'timestamp': 1,
+                'command': 'SUBS',
+                'content': [{'key': 'MSFT', '1': 183.63}, {'key': 'AAPL', '1': 320.1}]
+            },
+            {'service': 'TIMESALE_EQUITY', 'timestamp': 1, 'command': 'SUBS', 'content': [{'key': 'MSFT', '2': 183.6}]}
+        ]
+    }
+
+
+class TDHandlerRegistry(TestCase):
+
+    """Will perform a unit test for the `HandlerRegistry`."""
+
+    def setUp(self) -> None:
+        """Set up the Registry."""
+
+        self.handler_registry = HandlerRegistry()
+        self.calls = []
+
+    def test_service(self):
+        """Test that a handler only gets its service."""
+
+        self.handler_registry.register(service='QUOTE', callback=self.calls.append)
+
+        asyncio.run(self.handler_registry.dispatch(message=quote_message()))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.calls[0]['service'], 'QUOTE')
+
+    def test_symbols(self):
+        """Test that a symbol handler only gets the entries of its symbols."""
+
+        self.handler_registry.register(service='QUOTE', callback=self.calls.append, symbols=['AAPL'])
+
+        asyncio.run(self.handler_registry.dispatch(message=quote_message()))
+
+        self.assertEqual(self.calls[0]['content'], [{'key': 'AAPL', '1': 320.1}])
+        self.assertEqual(self.calls[0]['timestamp'], 1)
+
+    def test_every_service(self):
+        """Test that a `*` handler gets every service, but not the responses."""
+
+        self.handler_registry.register(service='QUOTE', callback=lambda service_result: None)
+        self.handler_registry.register(service='*', callback=self.calls.append)
+
+        asyncio.run(self.handler_registry.dispatch(message=quote_message()))
+        asyncio.run(self.handler_registry.dispatch(message={'response': [{'service': 'ADMIN'}]}))
+
+        self.assertEqual([call['service'] for call in self.calls], ['QUOTE', 'TIMESALE_EQUITY'])
+
+    def test_coroutine(self):
+        """Test that coroutines are awaited."""
+
+        async def on_notify(entry):
+            self.calls.append(entry)
+
+        self.handler_registry.register(service='notify', callback=on_notify)
+
+        asyncio.run(self.handler_registry.dispatch(message={'notify': [{'heartbeat': '1'}, {'heartbeat': '2'}]}))
+
+        self.assertEqual(self.calls, [{'heartbeat': '1'}, {'heartbeat': '2'}])
+
+    def test_offload(self):
+        """Test that an offloaded handler runs in the thread pool."""
+
+        threads = []
+
+        handler = self.handler_registry.register(
+            service='QUOTE',
+            callback=lambda service_result: threads.append(threading.current_thread().name),
+            offload=True
+        )
+
+        asyncio.run(self.handler_registry.dispatch(message=quote_message()))
+        self.handler_registry.close()
+
+        self.assertTrue(threads[0].startswith('TDHandler'))
+        self.assertEqual(self.handler_registry.stats['offloaded'], 1)
+
+        self.handler_registry.remove(handler=handler)
+        self.assertEqual(len(self.handler_registry), 0)
+
+    def test_failing_handler(self):
+        """Test that errors of inline and awaited handlers are recorded, and dispatching goes on."""
+
+        async def on_notify(entry):
+            raise RuntimeError('Handler failed.')
+
+        def on_quote(service_result):
+            raise KeyError('bid_price')
+
+        self.handler_registry.register(service='QUOTE', callback=on_quote)
+        self.handler_registry.register(service='*', callback=self.calls.append)
+        self.handler_registry.register(service='notify', callback=on_notify)
+
+        asyncio.run(self.handler_registry.dispatch(message=quote_message()))
+
+        self.assertEqual(self.handler_registry.stats['errors'], 1)
+        self.assertIsInstance(self.handler_registry.error, KeyError)
+
+        asyncio.run(self.handler_registry.dispatch(message={'notify': [{'heartbeat': '1'}]}))
+
+        self.assertEqual([call['service'] for call in self.calls], ['QUOTE', 'TIMESALE_EQUITY'])
+        self.assertEqual(self.handler_registry.stats['errors'], 2)
+        self.assertIsInstance(self.handler_registry.error, RuntimeError)
+
+    def test_invalid_handler(self):
+        """Test that coroutines can't be offloaded, and kinds can't take symbols."""
+
+        async def on_quote(service_result):
+            pass
+
+        with self.assertRaises(ValueError):
+            self.handler_registry.register(service='QUOTE', callback=on_quote, offload=True)
+
+        with self.assertRaises(ValueError):
+            self.handler_registry.register(service='notify', callback=print, symbols=['MSFT'])
+
+    def test_stream_handlers(self):
+        """Test that the stream client hands its messages to the handlers."""
+
+        async def receive():
+
+            stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+            stream_client.add_handler(service='TIMESALE_EQUITY', callback=self.calls.append)
+
+            stream_client._reader_task = asyncio.ensure_future(asyncio.sleep(0))
+            stream_client._message_queue = asyncio.Queue()
+            await stream_client._message_queue.put(quote_message())
+
+            return await stream_client._receive_message(return_value=True)
+
+        asyncio.run(receive())
+
+        self.assertEqual(self.calls[0]['service'], 'TIMESALE_EQUITY')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import json
+import shutil
+import tempfile
+import unittest
+
+from array import array
+from unittest import TestCase
+from td.candles import Candles
+from td.exceptions import TknExpError
+from td.history import CandleCache
+from td.history import PriceHistoryDownloader
+from td.history import merge_ranges
+from td.history import missing_ranges
+
+
+class TDPriceHistoryCache(TestCase):
+
+    """Will perform a unit test for the price history cache."""
+
+    def setUp(self) -> None:
+        """Set up the Cache."""
+
+        self.cache_directory = tempfile.mkdtemp()
+        self.candle_cache = CandleCache(cache_directory=self.cache_directory)
+
+    def test_missing_ranges(self):
+        """Test that only the gaps of a range are reported as missing."""
+
+        coverage = [[10, 20], [30, 40]]
+
+        self.assertEqual(missing_ranges(coverage=coverage, start=0, end=50), [[0, 10], [20, 30], [40, 50]])
+        self.assertEqual(missing_ranges(coverage=coverage, start=12, end=18), [])
+        self.assertEqual(missing_ranges(coverage=coverage, start=15, end=35), [[20, 30]])
+        self.assertEqual(missing_ranges(coverage=[], start=0, end=5), [[0, 5]])
+
+    def test_merge_ranges(self):
+        """Test that overlapping ranges are merged."""
+
+        coverage = merge_ranges(coverage=[[10, 20], [30, 40]], new_range=[15, 32])
+
+        self.assertEqual(coverage, [[10, 40]])
+        self.assertEqual(merge_ranges(coverage=coverage, new_range=[50, 60]), [[10, 40], [50, 60]])
+
+    def test_store_and_load(self):
+        """Test that a candle series survives a round trip to disk."""
+
+        columns = {
+            'open': array('d', [1.0, 2.0]),
+            'high': array('d', [1.5, 2.5]),
+            'low': array('d', [0.5, 1.5]),
+            'close': array('d', [1.2, 2.2]),
+            'volume': array('q', [100, 200]),
+            'datetime': array('q', [1594378800000, 1594378860000])
+        }
+
+        self.candle_cache.store('/ES', 'minute', 1, True, columns, [[1594378800000, 1594378860000]])
+
+        loaded_columns, coverage = self.candle_cache.load('/ES', 'minute', 1, True)
+
+        self.assertEqual(loaded_columns, columns)
+        self.assertEqual(coverage, [[1594378800000, 1594378860000]])
+
+    def test_load_missing_series(self):
+        """Test that a series that was never stored is empty."""
+
+        columns, coverage = self.candle_cache.load('MSFT', 'daily', 1, False)
+
+        self.assertEqual(len(columns['datetime']), 0)
+        self.assertEqual(coverage, [])
+
+    def tearDown(self) -> None:
+        """Teardown the Cache."""
+
+        shutil.rmtree(self.cache_directory)
+
+
+class _PriceHistoryClient():
+
+    """Answers `get_price_history` with the given responses, in order."""
+
+    def __init__(self, responses: list) -> None:
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get_price_history(self, **kwargs) -> Candles:
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TDPriceHistoryDownloader(TestCase):
+
+    """Will perform a unit test for the `PriceHistoryDownloader` retries."""
+
+    def setUp(self) -> None:
+        """Set up the candles."""
+
+        self.cache_directory = tempfile.mkdtemp()
+
+        self.candles = Candles(symbol='MSFT')
+        self.candles.append(open=1.0, high=1.5, low=0.5, close=1.2, volume=100, datetime=1594378800000)
+
+    def _download(self, responses: list) -> tuple:
+        """Downloads a range with a client that gives the responses, and returns it with the cached coverage."""
+
+        td_client = _PriceHistoryClient(responses=responses)
+        downloader = PriceHistoryDownloader(td_client=td_client, cache_directory=self.cache_directory, retries=2, backoff=0.0)
+
+        try:
+            candles = downloader.download_symbol('MSFT', 'minute', 1, 1594378800000, 1594378860000, columnar=True)
+        finally:
+            _, coverage = downloader.cache.load('MSFT', 'minute', 1, True)
+
+        return candles, coverage, td_client.calls
+
+    def test_retries_missing_response(self):
+        """Test that a request answered with a token refresh is asked again."""
+
+        candles, coverage, calls = self._download(responses=[None, self.candles])
+
+        self.assertEqual(candles, self.candles)
+        self.assertEqual(coverage, [[1594378800000, 1594378860000]])
+        self.assertEqual(calls, 2)
+
+    def test_missing_response_isnt_covered(self):
+        """Test that a range that never got an answer isn't marked as covered."""
+
+        with self.assertRaises(TknExpError):
+            self._download(responses=[None, None, None])
+
+        _, coverage = CandleCache(cache_directory=self.cache_directory).load('MSFT', 'minute', 1, True)
+
+        self.assertEqual(coverage, [])
+
+    def test_retries_garbled_response(self):
+        """Test that a body that can't be decoded is asked again."""
+
+        candles, _, calls = self._download(responses=[json.JSONDecodeError('Expecting value', '', 0), self.candles])
+
+        self.assertEqual(candles, self.candles)
+        self.assertEqual(calls, 2)
+
+    def tearDown(self) -> None:
+        """Teardown the Cache."""
+
+        shutil.rmtree(self.cache_directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from unittest import TestCase
+from td.json_backend import StreamDecoder
+from td.json_backend import available_backends
+
+
+class TDStreamDecoder(TestCase):
+
+    """Will perform a unit test for the `StreamDecoder`."""
+
+    def setUp(self) -> None:
+        """Set up the Decoders."""
+
+        self.decoders = [StreamDecoder(backend=backend) for backend in available_backends()]
+
+    def test_standard_library_is_available(self):
+        """Test that the standard library is always a fallback."""
+
+        self.assertEqual(available_backends()[-1], 'json')
+
+    def test_invalid_backend(self):
+        """Test that an unknown backend is rejected."""
+
+        with self.assertRaises(ValueError):
+            StreamDecoder(backend='yaml')
+
+    def test_decode(self):
+        """Test that every backend decodes text and bytes the same way."""
+
+        message = '{"data": [{"service": "QUOTE", "content": [{"key": "MSFT", "1": 183.63}]}]}'
+
+        for decoder in self.decoders:
+            self.assertEqual(decoder.loads(message)['data'][0]['content'][0]['1'], 183.63)
+            self.assertEqual(decoder.loads(message.encode('utf-8'))['data'][0]['service'], 'QUOTE')
+
+    def test_replacement_characters(self):
+        """Test that bare replacement characters are only replaced on failure."""
+
+        broken_message = '{"content": [{"key": "MSFT", "1": �}]}'
+        valid_message = '{"content": [{"key": "MSFT", "25": "�"}]}'
+
+        for decoder in self.decoders:
+            self.assertEqual(decoder.loads(broken_message)['content'][0]['1'], 'None')
+            self.assertEqual(decoder.loads(broken_message.encode('utf-8'))['content'][0]['1'], 'None')
+            self.assertEqual(decoder.loads(valid_message)['content'][0]['25'], '�')
+
+    def tearDown(self) -> None:
+        """Teardown the Decoders."""
+
+        self.decoders = None
+
+
+if __name__ == '__main__':
+    unittest.main()
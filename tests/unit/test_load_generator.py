@@ -0,0 +1,73 @@
+import unittest
+
+from unittest import TestCase
+from td.exceptions import NotFndError
+from td.load_generator import LoadGenerator
+from td.load_generator import create_mock_client
+from td.mock_api import MockTDServer
+
+
+class TDLoadGenerator(TestCase):
+
+    """Will perform a unit test for the `MockTDServer` and the `LoadGenerator`."""
+
+    def setUp(self) -> None:
+        """Start the mock server."""
+
+        self.mock_server = MockTDServer()
+        self.mock_server.start()
+
+        self.td_client = create_mock_client(url=self.mock_server.url)
+        self.td_client.configure_rate_limit(enabled=False)
+
+    def tearDown(self) -> None:
+        """Stop the mock server."""
+
+        self.td_client.close_session()
+        self.mock_server.stop()
+
+    def test_endpoints(self):
+        """Test that the endpoints answer with the samples."""
+
+        quotes = self.td_client.get_quotes(instruments=['MSFT', 'SQ'])
+        order = self.td_client.place_order(account='000000000', order={'orderType': 'MARKET'})
+        candles = self.td_client.get_price_history(
+            symbol='MSFT',
+            period_type='day',
+            period='1',
+            frequency_type='minute',
+            frequency='1'
+        )
+
+        self.assertEqual(sorted(quotes), ['MSFT', 'SQ'])
+        self.assertEqual(quotes['SQ']['symbol'], 'SQ')
+        self.assertEqual(order['order_id'], '1')
+        self.assertIn('candles', candles)
+
+        with self.assertRaises(NotFndError):
+            self.td_client._make_request(method='get', endpoint='unknown')
+
+    def test_load(self):
+        """Test that a load reuses the connections and times the client steps."""
+
+        load_generator = LoadGenerator(td_client=self.td_client, scenarios=['get_quotes', 'get_movers'], concurrency=2)
+        report = load_generator.run(requests=40)
+
+        self.assertEqual(report['requests'], 40)
+        self.assertEqual(report['errors'], 0)
+        self.assertEqual(report['scenarios']['get_quotes']['requests'], 20)
+        self.assertLessEqual(self.mock_server.stats['connections'], 2)
+        self.assertEqual(report['connections']['requests'], 40)
+        self.assertEqual(report['client_steps']['validate_token']['calls'], 40)
+        self.assertEqual(report['client_steps']['_parse_response']['calls'], 40)
+        self.assertNotIn('validate_token', vars(self.td_client))
+
+    def test_invalid_scenario(self):
+        """Test that unknown scenarios are rejected."""
+
+        with self.assertRaises(ValueError):
+            LoadGenerator(td_client=self.td_client, scenarios=['get_everything'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import copy
+import json
+import unittest
+
+from unittest import TestCase
+from td.order_book import LevelChange
+from td.order_book import OrderBooks
+
+
+class TDOrderBooks(TestCase):
+
+    """Will perform a unit test for the `OrderBooks`."""
+
+    def setUp(self) -> None:
+        """Set up the Books."""
+
+        self.order_books = OrderBooks()
+
+        with open('samples/responses/sample_level_two_quotes.json', 'r') as message_file:
+            self.book_message = json.load(message_file)[0]
+
+        self.order_books.update_from_message(message=self.book_message)
+        self.order_book = self.order_books.get(symbol='IBM', service='LISTED_BOOK')
+
+    def test_best_prices(self):
+        """Test the top of the book."""
+
+        self.assertEqual(self.order_book.best_bid, (146.32, 100))
+        self.assertEqual(self.order_book.best_ask, (146.33, 500))
+        self.assertAlmostEqual(self.order_book.spread, 0.01)
+        self.assertAlmostEqual(self.order_book.mid_price, 146.325)
+
+    def test_levels_are_sorted(self):
+        """Test that bids go down and asks go up."""
+
+        self.assertEqual(list(self.order_book.bids.prices), sorted(self.order_book.bids.prices, reverse=True))
+        self.assertEqual(list(self.order_book.asks.prices), sorted(self.order_book.asks.prices))
+        self.assertEqual(self.order_book.bids.level(1)['entries'], [('NSDQ', 100, 38493325), ('BATX', 100, 38495897)])
+
+    def test_depth_and_imbalance(self):
+        """Test the depth to size and imbalance queries."""
+
+        self.assertEqual(self.order_book.depth_to_size(side='ask', size=500), (146.33, 146.33))
+        self.assertAlmostEqual(self.order_book.depth_to_size(side='ask', size=600)[1], 146.3383333)
+        self.assertIsNone(self.order_book.depth_to_size(side='bid', size=100000))
+        self.assertAlmostEqual(self.order_book.imbalance(levels=1), -4 / 6)
+
+    def test_changes(self):
+        """Test that an update reports the levels that changed."""
+
+        new_message = copy.deepcopy(self.book_message)
+        content_entry = new_message['data'][0]['content'][0]
+        content_entry['2'][0]['1'] = 300
+        content_entry['3'].pop(0)
+
+        self.order_books.update_from_message(message=new_message)
+
+        self.assertEqual(
+            self.order_book.changes,
+            [LevelChange('bid', 146.32, 300, 100), LevelChange('ask', 146.33, 0, 500)]
+        )
+        self.assertEqual(self.order_book.best_ask, (146.38, 200))
+
+        self.order_books.update_from_message(message=new_message)
+
+        self.assertEqual(self.order_book.changes, [])
+        self.assertEqual(self.order_book.updates, 3)
+
+    def test_fractional_sizes(self):
+        """Test that fractional sizes are kept, and whole order counts stored as integers."""
+
+        new_message = copy.deepcopy(self.book_message)
+        content_entry = new_message['data'][0]['content'][0]
+        content_entry['2'][0]['1'] = 0.5
+        content_entry['2'][0]['2'] = 1.0
+
+        self.order_books.update_from_message(message=new_message)
+
+        self.assertEqual(self.order_book.best_bid, (146.32, 0.5))
+        self.assertEqual(self.order_book.bids.level(0)['count'], 1)
+        self.assertEqual(self.order_book.changes, [LevelChange('bid', 146.32, 0.5, 100)])
+
+    def test_unsorted_levels(self):
+        """Test that levels sent out of order are sorted before they're compared."""
+
+        new_message = copy.deepcopy(self.book_message)
+        content_entry = new_message['data'][0]['content'][0]
+        content_entry['2'].reverse()
+        content_entry['3'].reverse()
+
+        self.order_books.update_from_message(message=new_message)
+
+        self.assertEqual(self.order_book.changes, [])
+        self.assertEqual(self.order_book.best_bid, (146.32, 100))
+        self.assertEqual(self.order_book.best_ask, (146.33, 500))
+
+    def tearDown(self) -> None:
+        """Teardown the Books."""
+
+        self.order_books = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from unittest import TestCase
+from td.parquet_sink import ParquetSink
+from td.parquet_sink import ServiceColumns
+
+try:
+    import pyarrow
+    import pyarrow.dataset
+except ImportError:
+    pyarrow = None
+
+
+def timesale_message(sequence: int, symbol: str) -> dict:
+    """Builds a TIMESALE_EQUITY data message."""
+
+    return {
+        'data': [
+            {
+                'service': 'TIMESALE_EQUITY',
+                'timestamp': 1403804712166 + sequence,
+                'command': 'SUBS',
+                'content': [
+                    {'1': 1403804709455 + sequence, '2': 90.2976, '3': 1500, '4': sequence, 'seq': sequence, 'key': symbol}
+                ]
+            }
+        ]
+    }
+
+
+def quote_message(content: dict, timestamp: int) -> dict:
+    """Builds a QUOTE data message for MSFT."""
+
+    return {'data': [{'service': 'QUOTE', 'timestamp': timestamp, 'content': [dict(content, key='MSFT')]}]}
+
+
+class TDServiceColumns(TestCase):
+
+    """Will perform a unit test for the `ServiceColumns`."""
+
+    def test_append(self):
+        """Test that records are split into columns."""
+
+        service_columns = ServiceColumns(service='TIMESALE_EQUITY')
+        service_columns.append(timestamp=10, content=timesale_message(sequence=1, symbol='AAPL')['data'][0]['content'])
+        service_columns.append(timestamp=11, content=timesale_message(sequence=2, symbol='MSFT')['data'][0]['content'])
+
+        self.assertEqual(len(service_columns), 2)
+        self.assertEqual(service_columns.columns['timestamp'], [10, 11])
+        self.assertEqual(service_columns.columns['symbol'], ['AAPL', 'MSFT'])
+        self.assertEqual(service_columns.columns['last_size'], [1500, 1500])
+
+    def test_take(self):
+        """Test that taking the columns empties the buffer."""
+
+        service_columns = ServiceColumns(service='QUOTE')
+        service_columns.append(timestamp=10, content=[{'key': 'MSFT', '1': 183.63}])
+
+        columns = service_columns.take()
+
+        self.assertEqual(columns['bid_price'], [183.63])
+        self.assertEqual(columns['ask_price'], [None])
+        self.assertEqual(len(service_columns), 0)
+        self.assertEqual(service_columns.columns['bid_price'], [])
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed.')
+class TDParquetSink(TestCase):
+
+    """Will perform a unit test for the `ParquetSink`."""
+
+    def setUp(self) -> None:
+        """Set up the Sink."""
+
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        """Remove the dataset."""
+
+        shutil.rmtree(self.directory)
+
+    def test_row_groups(self):
+        """Test that full buffers are written as row groups."""
+
+        parquet_sink = ParquetSink(directory=self.directory, row_group_size=4)
+
+        for sequence in range(10):
+            parquet_sink.append(message=timesale_message(sequence=sequence, symbol='AAPL'))
+
+        self.assertEqual(parquet_sink.stats['rows_written'], 8)
+        self.assertEqual(parquet_sink.stats['row_groups'], 2)
+        self.assertEqual(parquet_sink.stats['rows_buffered'], 2)
+
+        parquet_sink.close()
+
+        table = pyarrow.dataset.dataset(self.directory, format='parquet', partitioning='hive').to_table()
+
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(sorted(table.column('sequence').to_pylist()), [float(sequence) for sequence in range(10)])
+        self.assertEqual(set(table.column('service').to_pylist()), {'TIMESALE_EQUITY'})
+
+    def test_partial_updates(self):
+        """Test that level one updates missing fields stay in the same file."""
+
+        parquet_sink = ParquetSink(directory=self.directory, row_group_size=1)
+
+        parquet_sink.append(message=quote_message(content={'1': 183.63, '25': 'NASDAQ'}, timestamp=1))
+        parquet_sink.append(message=quote_message(content={'2': 183.75}, timestamp=2))
+
+        self.assertEqual(parquet_sink.stats['open_files'], 1)
+        self.assertEqual(parquet_sink.stats['row_groups'], 2)
+
+        parquet_sink.close()
+
+    def test_mixed_types(self):
+        """Test that values of another type are converted to the type of their column."""
+
+        parquet_sink = ParquetSink(directory=self.directory, row_group_size=3)
+
+        for bid_price in (183, '183.5', 'n/a'):
+            parquet_sink.append(message=quote_message(content={'1': bid_price}, timestamp=1))
+
+        parquet_sink.append(message=quote_message(content={'1': 184.0}, timestamp=1))
+        parquet_sink.close()
+
+        table = pyarrow.dataset.dataset(self.directory, format='parquet', partitioning='hive').to_table()
+
+        self.assertEqual(table.column('bid_price').to_pylist(), [183.0, 183.5, None, 184.0])
+        self.assertEqual(parquet_sink.stats['coerced_values'], 2)
+        self.assertEqual(parquet_sink.stats['open_files'], 0)
+        self.assertEqual(len(list(pathlib.Path(self.directory).rglob('*.parquet'))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
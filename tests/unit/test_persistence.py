@@ -0,0 +1,223 @@
+import asyncio
+import csv
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from unittest import TestCase
+from td.persistence import CsvSink
+from td.persistence import PersistenceWriter
+from td.stream import TDStreamerClient
+
+
+def timesale_message(sequence: int, symbol: str) -> dict:
+    """Builds a TIMESALE_EQUITY data message."""
+
+    return {
+        'data': [
+            {
+                'service': 'TIMESALE_EQUITY',
+                'timestamp': 1403804712166 + sequence,
+                'command': 'SUBS',
+                'content': [
+                    {'1': 1403804709455 + sequence, '2': 90.2976, '3': 1500, '4': sequence, 'seq': sequence, 'key': symbol}
+                ]
+            }
+        ]
+    }
+
+
+class ListSink():
+
+    """Keeps the batches it's handed."""
+
+    def __init__(self, release: threading.Event = None) -> None:
+        self.batches = []
+        self.commits = 0
+        self.closed = False
+        self.release = release
+
+    def write(self, messages):
+        if self.release is not None:
+            self.release.wait()
+        self.batches.append(messages)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FailingSink(ListSink):
+
+    """Fails every write."""
+
+    def write(self, messages):
+        raise OSError('No space left on device')
+
+
+class TDPersistenceWriter(TestCase):
+
+    """Will perform a unit test for the `PersistenceWriter`."""
+
+    def test_group_commit(self):
+        """Test that waiting messages are written in a single commit."""
+
+        release = threading.Event()
+        list_sink = ListSink(release=release)
+
+        persistence_writer = PersistenceWriter(flush_interval=0.0)
+        persistence_writer.add_sink(sink=list_sink)
+
+        persistence_writer.append(message={'sequence': 0})
+
+        # The first commit is held up, so the rest piles up behind it.
+        while persistence_writer.stats['depth']:
+            time.sleep(0.01)
+
+        for sequence in range(1, 6):
+            persistence_writer.append(message={'sequence': sequence})
+
+        self.assertEqual(persistence_writer.stats['depth'], 5)
+        self.assertGreaterEqual(persistence_writer.stats['lag'], 0.0)
+
+        release.set()
+        persistence_writer.close()
+
+        self.assertEqual(len(list_sink.batches), 2)
+        self.assertEqual(len(list_sink.batches[1]), 5)
+        self.assertEqual(list_sink.commits, 2)
+        self.assertTrue(list_sink.closed)
+        self.assertEqual(persistence_writer.stats['written'], 6)
+
+    def test_drop_oldest(self):
+        """Test that a full buffer drops its oldest message."""
+
+        release = threading.Event()
+        list_sink = ListSink(release=release)
+
+        persistence_writer = PersistenceWriter(capacity=2, flush_interval=0.0, overflow='drop_oldest')
+        persistence_writer.add_sink(sink=list_sink)
+
+        persistence_writer.append(message={'sequence': 0})
+
+        while persistence_writer.stats['depth']:
+            time.sleep(0.01)
+
+        for sequence in range(1, 5):
+            persistence_writer.append(message={'sequence': sequence})
+
+        release.set()
+        persistence_writer.close()
+
+        self.assertEqual(persistence_writer.stats['dropped'], 2)
+        self.assertEqual(list_sink.batches[1], [{'sequence': 3}, {'sequence': 4}])
+
+    def test_append_async(self):
+        """Test that a full buffer with the block policy doesn't hold up the event loop."""
+
+        release = threading.Event()
+        list_sink = ListSink(release=release)
+
+        persistence_writer = PersistenceWriter(capacity=1, flush_interval=0.0)
+        persistence_writer.add_sink(sink=list_sink)
+
+        persistence_writer.append(message={'sequence': 0})
+
+        while persistence_writer.stats['depth']:
+            time.sleep(0.01)
+
+        persistence_writer.append(message={'sequence': 1})
+
+        self.assertFalse(persistence_writer.try_append(message={'sequence': 2}))
+
+        async def append_and_tick():
+            append = asyncio.ensure_future(persistence_writer.append_async(message={'sequence': 2}))
+
+            # The loop keeps running while the message waits for room.
+            ticks = 0
+            while ticks < 5:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+            self.assertFalse(append.done())
+
+            release.set()
+            await append
+
+            return ticks
+
+        self.assertEqual(asyncio.run(append_and_tick()), 5)
+
+        persistence_writer.close()
+
+        self.assertEqual(persistence_writer.stats['written'], 3)
+        self.assertEqual(persistence_writer.stats['dropped'], 0)
+
+    def test_failed_sink(self):
+        """Test that an error in a sink is kept for the stream."""
+
+        persistence_writer = PersistenceWriter(flush_interval=0.0)
+        persistence_writer.add_sink(sink=FailingSink())
+
+        persistence_writer.append(message={'sequence': 0})
+        persistence_writer.close()
+
+        self.assertTrue(persistence_writer.failed)
+        self.assertEqual(persistence_writer.stats['errors'], 1)
+
+    def test_invalid_overflow(self):
+        """Test that an unknown overflow policy is rejected."""
+
+        with self.assertRaises(ValueError):
+            PersistenceWriter(overflow='coalesce')
+
+
+class TDCsvSink(TestCase):
+
+    """Will perform a unit test for the `CsvSink`."""
+
+    def setUp(self) -> None:
+        """Set up the Stream Client."""
+
+        self.directory = tempfile.mkdtemp()
+        self.stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+
+    def tearDown(self) -> None:
+        """Remove the files."""
+
+        shutil.rmtree(self.directory)
+
+    def test_write(self):
+        """Test that the rows of the stream client are written."""
+
+        file_path = os.path.join(self.directory, 'data_dump.csv')
+
+        csv_sink = CsvSink(file_path=file_path, rows=self.stream_client._csv_rows)
+        csv_sink.write(messages=[timesale_message(sequence=1, symbol='AAPL')])
+        csv_sink.commit()
+        csv_sink.close()
+
+        with open(file_path, 'r', newline='') as csv_file:
+            rows = list(csv.reader(csv_file))
+
+        self.assertIn(['1403804712167', 'TIMESALE_EQUITY', 'key', 'symbol', 'AAPL'], rows)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'data_dump_level_2.csv')))
+
+    def test_write_behavior(self):
+        """Test that the stream client hands the CSV files to the writer thread."""
+
+        self.stream_client.write_behavior(file_path=os.path.join(self.directory, 'data_dump.csv'))
+
+        self.assertTrue(self.stream_client.write_flag)
+        self.assertEqual(len(self.stream_client.persistence.sinks), 1)
+
+        self.stream_client.persistence.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
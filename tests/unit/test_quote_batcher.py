@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import unittest
+
+from unittest import TestCase
+from td.quote_batcher import QuoteBatcher
+from td.quote_batcher import AsyncQuoteBatcher
+
+
+class TDQuoteBatcher(TestCase):
+
+    """Will perform a unit test for the `QuoteBatcher`."""
+
+    def setUp(self) -> None:
+        """Set up the Batcher."""
+
+        self.requests = []
+
+        def fetch_quotes(instruments):
+            self.requests.append(instruments)
+            return {symbol: {'symbol': symbol} for symbol in instruments}
+
+        async def fetch_quotes_async(instruments):
+            return fetch_quotes(instruments)
+
+        self.batcher = QuoteBatcher(fetch_quotes=fetch_quotes, window=0.05)
+        self.async_batcher = AsyncQuoteBatcher(fetch_quotes=fetch_quotes_async, window=0.05)
+
+    def test_concurrent_calls_share_a_request(self):
+        """Test that calls from different threads are merged."""
+
+        results = {}
+
+        def get_quotes(symbols):
+            results[symbols[0]] = self.batcher.get_quotes(instruments=symbols)
+
+        threads = [
+            threading.Thread(target=get_quotes, args=(['MSFT', 'AAPL'],)),
+            threading.Thread(target=get_quotes, args=(['SQ'],)),
+            threading.Thread(target=get_quotes, args=(['AMZN', 'MSFT'],))
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(set(results['MSFT']), {'MSFT', 'AAPL'})
+        self.assertEqual(set(results['SQ']), {'SQ'})
+        self.assertEqual(set(results['AMZN']), {'AMZN', 'MSFT'})
+        self.assertEqual(self.batcher.stats, {'calls': 3, 'batches': 1, 'requests': 1})
+
+    def test_chunks_large_batches(self):
+        """Test that a batch over the symbol limit is split."""
+
+        self.batcher.max_symbols = 2
+
+        quotes = self.batcher.get_quotes(instruments=['A', 'B', 'C', 'D', 'E'])
+
+        self.assertEqual(len(quotes), 5)
+        self.assertEqual([len(chunk) for chunk in self.requests], [2, 2, 1])
+
+    def test_chunks_by_length(self):
+        """Test that a batch over the URL length limit is split."""
+
+        self.batcher.max_length = 10
+
+        self.batcher.get_quotes(instruments=['AAAA', 'BBBB', 'CCCC'])
+
+        self.assertEqual(self.requests, [['AAAA', 'BBBB'], ['CCCC']])
+
+    def test_normalizes_symbols(self):
+        """Test that symbols spelled differently share a quote."""
+
+        quotes = self.batcher.get_quotes(instruments=['msft', ' MSFT ', 'Sq'])
+
+        self.assertEqual(self.requests, [['MSFT', 'SQ']])
+        self.assertEqual(set(quotes), {'MSFT', 'SQ'})
+
+    def test_async_calls_share_a_request(self):
+        """Test that coroutines on the same loop are merged."""
+
+        async def get_quotes():
+            return await asyncio.gather(
+                self.async_batcher.get_quotes(instruments=['MSFT']),
+                self.async_batcher.get_quotes(instruments=['AAPL'])
+            )
+
+        msft_quotes, aapl_quotes = asyncio.run(get_quotes())
+
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(list(msft_quotes), ['MSFT'])
+        self.assertEqual(list(aapl_quotes), ['AAPL'])
+
+    def test_errors_reach_every_caller(self):
+        """Test that an error in the request is raised for every caller."""
+
+        def fetch_quotes(instruments):
+            raise ValueError('Request failed.')
+
+        self.batcher.fetch_quotes = fetch_quotes
+
+        with self.assertRaises(ValueError):
+            self.batcher.get_quotes(instruments=['MSFT'])
+
+    def tearDown(self) -> None:
+        """Teardown the Batcher."""
+
+        self.batcher = None
+        self.async_batcher = None
+
+
+if __name__ == '__main__':
+    unittest.main()
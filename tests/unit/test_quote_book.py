@@ -0,0 +1,103 @@
+import json
+import unittest
+
+from unittest import TestCase
+from td.quote_book import QuoteBook
+
+
+class TDQuoteBook(TestCase):
+
+    """Will perform a unit test for the `QuoteBook`."""
+
+    def setUp(self) -> None:
+        """Set up the Book."""
+
+        self.quote_book = QuoteBook()
+
+        with open('samples/responses/sample_level_one_quotes.json', 'r') as message_file:
+            self.stream_message = {'data': [json.load(message_file)]}
+
+    def test_full_snapshot(self):
+        """Test that a full message fills in the quote."""
+
+        self.quote_book.update_from_message(message=self.stream_message)
+
+        quote = self.quote_book.get(symbol='MSFT')
+
+        self.assertEqual(quote.bid_price, 183.63)
+        self.assertEqual(quote.description, 'Microsoft Corporation - Common Stock')
+
+    def test_deltas_are_merged(self):
+        """Test that partial updates only change the fields they carry."""
+
+        self.quote_book.update_from_message(message=self.stream_message)
+        self.quote_book.update_from_message(
+            message={'data': [{'service': 'QUOTE', 'content': [{'key': 'MSFT', '1': 183.70, '4': 12}]}]}
+        )
+
+        quote = self.quote_book.get(symbol='MSFT')
+
+        self.assertEqual(quote.bid_price, 183.70)
+        self.assertEqual(quote.bid_size, 12)
+        self.assertEqual(quote.ask_price, 183.75)
+        self.assertEqual(self.quote_book.table().get_field(symbol='MSFT', field='ask_price'), 183.75)
+
+    def test_missing_symbol(self):
+        """Test that a symbol that wasn't streamed has no quote."""
+
+        self.assertIsNone(self.quote_book.get(symbol='AAPL'))
+
+    def test_watch_fields(self):
+        """Test that watchers are only called for the fields they watch."""
+
+        bid_updates = []
+        watcher = self.quote_book.watch(callback=bid_updates.append, fields=['bid_price', 'bid_size'], symbols=['MSFT'])
+
+        self.quote_book.update_from_message(message={'data': [{'service': 'QUOTE', 'content': [{'key': 'MSFT', '2': 1.0}]}]})
+        self.quote_book.update_from_message(message={'data': [{'service': 'QUOTE', 'content': [{'key': 'AAPL', '1': 1.0}]}]})
+        self.quote_book.update_from_message(
+            message={'data': [{'service': 'QUOTE', 'content': [{'key': 'MSFT', '1': 2.0, '4': 5}]}]}
+        )
+
+        self.assertEqual(len(bid_updates), 1)
+        self.assertEqual(bid_updates[0].bid_price, 2.0)
+        self.assertEqual(bid_updates[0].ask_price, 1.0)
+
+        self.quote_book.unwatch(watcher=watcher)
+        self.quote_book.update_from_message(message={'data': [{'service': 'QUOTE', 'content': [{'key': 'MSFT', '1': 3.0}]}]})
+
+        self.assertEqual(len(bid_updates), 1)
+
+    def test_failing_watcher(self):
+        """Test that a watcher that raises is recorded, and the others are still called."""
+
+        def failing_watcher(record):
+            raise KeyError('bid_price')
+
+        bid_updates = []
+        self.quote_book.watch(callback=failing_watcher, fields=['bid_price'])
+        self.quote_book.watch(callback=bid_updates.append, fields=['bid_price'])
+
+        self.quote_book.update_from_message(message={'data': [{'service': 'QUOTE', 'content': [{'key': 'MSFT', '1': 1.0}]}]})
+
+        self.assertEqual(len(bid_updates), 1)
+        self.assertEqual(self.quote_book.errors, 1)
+        self.assertIsInstance(self.quote_book.table().error, KeyError)
+
+    def test_invalid_arguments(self):
+        """Test that unknown services and fields are rejected."""
+
+        with self.assertRaises(ValueError):
+            self.quote_book.table(service='LISTED_BOOK')
+
+        with self.assertRaises(ValueError):
+            self.quote_book.watch(callback=print, fields=['bid'])
+
+    def tearDown(self) -> None:
+        """Teardown the Book."""
+
+        self.quote_book = None
+
+
+if __name__ == '__main__':
+    unittest.main()
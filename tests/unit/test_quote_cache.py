@@ -0,0 +1,177 @@
+import json
+import time
+import unittest
+
+from unittest import TestCase
+from td.load_generator import create_mock_client
+from td.mock_api import MockTDServer
+from td.quote_cache import QuoteCache
+
+
+class TDQuoteCache(TestCase):
+
+    """Will perform a unit test for the `QuoteCache`."""
+
+    def setUp(self) -> None:
+        """Set up the Cache."""
+
+        self.quote_cache = QuoteCache(ttl=0.05)
+
+        with open('samples/responses/sample_level_one_quotes.json', 'r') as message_file:
+            self.stream_message = json.load(message_file)
+
+    def test_hits_and_misses(self):
+        """Test that fresh quotes are served and missing ones are reported."""
+
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT', 'lastPrice': 183.63}})
+
+        quotes, missing = self.quote_cache.get_many(symbols=['MSFT', 'AAPL'])
+
+        self.assertEqual(quotes['MSFT']['lastPrice'], 183.63)
+        self.assertEqual(missing, ['AAPL'])
+        self.assertEqual(self.quote_cache.stats['hit_rate'], 0.5)
+
+    def test_symbols_are_normalized(self):
+        """Test that symbols in another case or with spaces find the quotes keyed by the API."""
+
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT', 'assetType': 'EQUITY'}})
+        self.quote_cache.subscribe(symbols=[' msft'])
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+
+        quotes, missing = self.quote_cache.get_many(symbols=['msft', ' MSFT ', 'aapl'])
+
+        self.assertEqual(list(quotes), ['MSFT'])
+        self.assertEqual(missing, ['AAPL'])
+        self.assertEqual(self.quote_cache.stats['live_hits'], 2)
+        self.assertIn('msft', self.quote_cache)
+
+    def test_quotes_expire(self):
+        """Test that a quote older than the TTL is a miss."""
+
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT'}})
+        time.sleep(0.06)
+
+        self.assertIsNone(self.quote_cache.get(symbol='MSFT'))
+        self.assertEqual(self.quote_cache.stats['expired'], 1)
+
+    def test_stream_keeps_quotes_fresh(self):
+        """Test that streamed symbols don't expire while subscribed."""
+
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT', 'assetType': 'EQUITY'}})
+        self.quote_cache.subscribe(symbols=['MSFT'])
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+        time.sleep(0.06)
+
+        quote = self.quote_cache.get(symbol='MSFT')
+
+        self.assertEqual(quote['symbol'], 'MSFT')
+        self.assertEqual(quote['assetType'], 'EQUITY')
+        self.assertEqual(quote['bidPrice'], 183.63)
+        self.assertEqual(quote['52WkLow'], 104.2603)
+        self.assertEqual(self.quote_cache.stats['live_hits'], 1)
+
+    def test_stream_only_quotes_are_misses(self):
+        """Test that a symbol with only streamed fields is fetched over REST."""
+
+        self.quote_cache.subscribe(symbols=['MSFT'])
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+
+        quotes, missing = self.quote_cache.get_many(symbols=['MSFT'])
+
+        self.assertEqual((quotes, missing), ({}, ['MSFT']))
+
+        # The REST quote fills in the fields the stream doesn't carry.
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT', 'bidPrice': 1.0, 'assetType': 'EQUITY'}})
+
+        quote = self.quote_cache.get(symbol='MSFT')
+
+        self.assertEqual(quote['bidPrice'], 183.63)
+        self.assertEqual(quote['assetType'], 'EQUITY')
+
+    def test_interrupted_stream_expires_quotes(self):
+        """Test that streamed quotes expire while the stream is down, and are live again after."""
+
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT'}})
+        self.quote_cache.subscribe(symbols=['MSFT'])
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+        self.quote_cache.interrupt()
+        time.sleep(0.06)
+
+        self.assertIsNone(self.quote_cache.get(symbol='MSFT'))
+
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+        time.sleep(0.06)
+
+        self.assertIsNotNone(self.quote_cache.get(symbol='MSFT'))
+
+    def test_stream_merges_deltas(self):
+        """Test that partial stream updates are merged into the REST quote."""
+
+        self.quote_cache.put_many(quotes={'MSFT': {'symbol': 'MSFT', 'bidPrice': 1.0, 'askPrice': 2.0}})
+        self.quote_cache.subscribe(symbols=['MSFT'])
+        self.quote_cache.update_from_message(
+            message={'data': [{'service': 'QUOTE', 'content': [{'key': 'MSFT', '1': 1.5}]}]}
+        )
+
+        quote = self.quote_cache.get(symbol='MSFT')
+
+        self.assertEqual(quote['bidPrice'], 1.5)
+        self.assertEqual(quote['askPrice'], 2.0)
+
+    def test_unsubscribed_symbols_are_ignored(self):
+        """Test that stream data for symbols that aren't subscribed is ignored."""
+
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+
+        self.assertNotIn('MSFT', self.quote_cache)
+
+    def test_unsubscribe_expires_quotes(self):
+        """Test that quotes expire normally once the subscription ends."""
+
+        self.quote_cache.subscribe(symbols=['MSFT'])
+        self.quote_cache.update_from_stream(content=self.stream_message['content'])
+        self.quote_cache.unsubscribe()
+        time.sleep(0.06)
+
+        self.assertIsNone(self.quote_cache.get(symbol='MSFT'))
+
+    def tearDown(self) -> None:
+        """Teardown the Cache."""
+
+        self.quote_cache = None
+
+
+class TDClientQuoteCache(TestCase):
+
+    """Will perform a unit test for `TDClient.get_quotes` with the quote cache."""
+
+    def setUp(self) -> None:
+        """Start the mock server."""
+
+        self.mock_server = MockTDServer()
+        self.mock_server.start()
+
+        self.td_client = create_mock_client(url=self.mock_server.url)
+        self.td_client.configure_rate_limit(enabled=False)
+        self.td_client.enable_quote_cache(ttl=60.0)
+
+    def tearDown(self) -> None:
+        """Stop the mock server."""
+
+        self.td_client.close_session()
+        self.mock_server.stop()
+
+    def test_symbols_are_normalized(self):
+        """Test that a symbol in another case is served from the cache."""
+
+        self.td_client.get_quotes(instruments=['MSFT', 'SQ'])
+        requests = self.mock_server.stats['requests']
+
+        quotes = self.td_client.get_quotes(instruments=['msft', ' SQ '])
+
+        self.assertEqual(sorted(quotes), ['MSFT', 'SQ'])
+        self.assertEqual(self.mock_server.stats['requests'], requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
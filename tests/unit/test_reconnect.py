@@ -0,0 +1,171 @@
+import asyncio
+import json
+import unittest
+
+import websockets
+
+from unittest import TestCase
+from td.stream import TDStreamerClient
+
+
+LOGIN_RESPONSE = json.dumps({
+    'response': [
+        {'service': 'ADMIN', 'command': 'LOGIN', 'requestid': '0', 'timestamp': 1, 'content': {'code': 0, 'msg': 'ok'}}
+    ]
+})
+
+
+class TDReconnect(TestCase):
+
+    """Will perform a unit test for the stream reconnects."""
+
+    def setUp(self) -> None:
+        """Set up the Stream Client."""
+
+        self.stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+        self.stream_client._build_login_request = lambda: json.dumps({'requests': [{'command': 'LOGIN'}]})
+        self.stream_client.data_requests['requests'] = [
+            {'service': 'QUOTE', 'command': 'SUBS', 'requestid': '1', 'parameters': {'keys': 'MSFT,AAPL', 'fields': '0,1'}},
+            {'service': 'CHART_EQUITY', 'command': 'SUBS', 'requestid': '2', 'parameters': {'keys': 'MSFT', 'fields': '0,1'}}
+        ]
+
+    def test_replay_request(self):
+        """Test that unsubscribed services aren't sent again."""
+
+        self.stream_client._unsubscribed_services['CHART_EQUITY'] = 2
+
+        requests = json.loads(self.stream_client._build_replay_request())['requests']
+
+        self.assertEqual([request['service'] for request in requests], ['QUOTE'])
+
+    def test_reconnect(self):
+        """Test that a dropped connection is replaced and reported as a gap."""
+
+        connections = []
+
+        async def handler(websocket, path=None):
+
+            connections.append(websocket)
+            connection_number = len(connections)
+
+            async for request in websocket:
+
+                if json.loads(request)['requests'][0]['command'] == 'LOGIN':
+                    await websocket.send(LOGIN_RESPONSE)
+                    continue
+
+                await websocket.send(json.dumps({
+                    'data': [{'service': 'QUOTE', 'timestamp': connection_number, 'content': [{'key': 'MSFT', '1': 1.0}]}]
+                }))
+
+                # Drop the first connection once the data went out.
+                if connection_number == 1:
+                    await websocket.close()
+
+        async def run_stream():
+
+            server = await websockets.serve(handler, '127.0.0.1', 0)
+
+            self.stream_client.websocket_url = 'ws://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1])
+            self.stream_client.configure_reconnect(initial_delay=0.01)
+
+            await self.stream_client._connect()
+            await self.stream_client._send_message(self.stream_client._build_data_request())
+
+            messages = [await self.stream_client._receive_message(return_value=True) for _ in range(3)]
+
+            self.stream_client._stop_dispatch()
+            await self.stream_client.connection.close()
+
+            server.close()
+            await server.wait_closed()
+
+            return messages
+
+        messages = asyncio.run(run_stream())
+
+        self.assertEqual(messages[0]['data'][0]['timestamp'], 1)
+        self.assertEqual(messages[1]['gap']['subscriptions'], {'QUOTE': ['MSFT', 'AAPL'], 'CHART_EQUITY': ['MSFT']})
+        self.assertLessEqual(messages[1]['gap']['disconnected'], messages[1]['gap']['reconnected'])
+        self.assertEqual(messages[2]['data'][0]['timestamp'], 2)
+        self.assertEqual(self.stream_client.reconnects, 1)
+        self.assertEqual(len(self.stream_client.gaps), 1)
+
+    def test_resubscribe_reconnect(self):
+        """Test that a service subscribed again after an unsubscribe is sent again after a reconnect."""
+
+        connections = []
+        replayed_requests = []
+
+        async def handler(websocket, path=None):
+
+            connections.append(websocket)
+            connection_number = len(connections)
+
+            async for request in websocket:
+
+                requests = json.loads(request)['requests']
+                command = requests[0]['command']
+
+                if command == 'LOGIN':
+                    await websocket.send(LOGIN_RESPONSE)
+                elif command == 'UNSUBS':
+                    await websocket.send(json.dumps({
+                        'response': [{'service': 'CHART_EQUITY', 'command': 'UNSUBS', 'content': {'code': 0}}]
+                    }))
+                elif connection_number == 2:
+                    replayed_requests.extend(requests)
+                    await websocket.send(json.dumps({
+                        'data': [{'service': 'QUOTE', 'timestamp': 2, 'content': [{'key': 'MSFT', '1': 1.0}]}]
+                    }))
+                elif requests[0]['parameters']['keys'] == 'AAPL':
+                    # Drop the first connection once the service is subscribed again.
+                    await websocket.close()
+
+        async def run_stream():
+
+            server = await websockets.serve(handler, '127.0.0.1', 0)
+
+            self.stream_client.websocket_url = 'ws://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1])
+            self.stream_client.user_principal_data = {'accounts': [{'accountId': '1'}], 'streamerInfo': {'appId': 'test'}}
+            self.stream_client.configure_reconnect(initial_delay=0.01)
+
+            await self.stream_client._connect()
+            await self.stream_client._send_message(self.stream_client._build_data_request())
+
+            await self.stream_client.unsubscribe(service='CHART_EQUITY')
+
+            self.stream_client.chart(service='CHART_EQUITY', symbols=['AAPL'], fields=[0, 1])
+            await self.stream_client._send_message(json.dumps({'requests': self.stream_client.data_requests['requests'][-1:]}))
+
+            messages = [await self.stream_client._receive_message(return_value=True) for _ in range(2)]
+
+            self.stream_client._stop_dispatch()
+            await self.stream_client.connection.close()
+
+            server.close()
+            await server.wait_closed()
+
+            return messages
+
+        messages = asyncio.run(run_stream())
+
+        self.assertEqual(messages[0]['gap']['subscriptions'], {'QUOTE': ['MSFT', 'AAPL'], 'CHART_EQUITY': ['AAPL']})
+        self.assertEqual(
+            [(request['service'], request['parameters']['keys']) for request in replayed_requests],
+            [('QUOTE', 'MSFT,AAPL'), ('CHART_EQUITY', 'AAPL')]
+        )
+        self.assertEqual(messages[1]['data'][0]['timestamp'], 2)
+
+    def test_give_up(self):
+        """Test that the reconnect stops after the last attempt."""
+
+        self.stream_client.websocket_url = 'ws://127.0.0.1:9'
+        self.stream_client.configure_reconnect(max_attempts=2, initial_delay=0.01)
+
+        self.assertFalse(asyncio.run(self.stream_client._reconnect()))
+        self.assertEqual(self.stream_client.gaps, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
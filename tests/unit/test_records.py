@@ -0,0 +1,109 @@
+import json
+import unittest
+
+from unittest import TestCase
+from td.records import field_name
+from td.records import get_service_decoder
+from td.stream import TDStreamerClient
+
+
+class TDServiceDecoder(TestCase):
+
+    """Will perform a unit test for the `ServiceDecoder`."""
+
+    def setUp(self) -> None:
+        """Set up the Decoders."""
+
+        with open('samples/responses/sample_level_one_quotes.json', 'r') as message_file:
+            self.quote_message = json.load(message_file)
+
+        with open('samples/responses/sample_timesale_equity.json', 'r') as message_file:
+            self.timesale_message = json.load(message_file)
+
+    def test_field_name(self):
+        """Test that field names become identifiers."""
+
+        self.assertEqual(field_name('bid-price'), 'bid_price')
+        self.assertEqual(field_name('52-week-high'), 'week_high_52')
+        self.assertEqual(field_name('assetMainType'), 'asset_main_type')
+
+    def test_decode_quote(self):
+        """Test that a level one quote becomes a record."""
+
+        quote_decoder = get_service_decoder(service='QUOTE')
+        record = quote_decoder.decode(content_entry=self.quote_message['content'][0])
+
+        self.assertEqual(type(record).__name__, 'QuoteRecord')
+        self.assertEqual(record.symbol, 'MSFT')
+        self.assertEqual(record.bid_price, 183.63)
+        self.assertEqual(record.week_low_52, 104.2603)
+        self.assertEqual(record.cusip, '594918104')
+
+    def test_partial_update(self):
+        """Test that fields missing from an update are `None`."""
+
+        record = get_service_decoder(service='QUOTE').decode(content_entry={'key': 'MSFT', '2': 183.75})
+
+        self.assertEqual(record.ask_price, 183.75)
+        self.assertIsNone(record.bid_price)
+        self.assertEqual(get_service_decoder(service='QUOTE').to_dict(record), {'symbol': 'MSFT', 'ask_price': 183.75})
+
+    def test_field_types(self):
+        """Test that numeric fields are converted to their documented type."""
+
+        record = get_service_decoder(service='QUOTE').decode(
+            content_entry={'key': 'MSFT', '1': 183, '4': '300', '8': 1200.0, '25': 'Microsoft', '31': 'n/a'}
+        )
+
+        self.assertIs(type(record.bid_price), float)
+        self.assertEqual(record.bid_size, 300.0)
+        self.assertIs(type(record.total_volume), int)
+        self.assertEqual(record.description, 'Microsoft')
+
+        # A value that can't be converted is kept as it came in.
+        self.assertEqual(record.week_low_52, 'n/a')
+
+    def test_decode_timesale(self):
+        """Test that a time and sale entry becomes a record."""
+
+        records = get_service_decoder(service='TIMESALE_EQUITY').decode_content(content=self.timesale_message['content'])
+
+        self.assertEqual(records[0].symbol, 'AAPL')
+        self.assertEqual(records[0].trade_time, 1403804709455)
+        self.assertEqual(records[0].last_size, 1500)
+        self.assertEqual(records[0].sequence, 4)
+
+    def test_decode_chart_equity(self):
+        """Test that an equity candle becomes a record."""
+
+        record = get_service_decoder(service='CHART_EQUITY').decode(
+            content_entry={
+                'seq': 1, 'key': 'MSFT', '1': 183.1, '2': 183.9, '3': 182.8, '4': 183.5,
+                '5': 1200.0, '6': 12, '7': 1581123540000, '8': 18299
+            }
+        )
+
+        self.assertEqual(record.open_price, 183.1)
+        self.assertEqual(record.close_price, 183.5)
+        self.assertEqual(record.chart_time, 1581123540000)
+
+    def test_stream_records(self):
+        """Test that the stream client decodes the services it knows."""
+
+        stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+        message = {'data': [self.quote_message, self.timesale_message, {'service': 'LISTED_BOOK', 'content': []}]}
+
+        records = stream_client.decode_records(message=message)
+
+        self.assertEqual(set(records), {'QUOTE', 'TIMESALE_EQUITY'})
+        self.assertEqual(records['QUOTE'][0].symbol, 'MSFT')
+
+    def test_invalid_service(self):
+        """Test that an unknown service is rejected."""
+
+        with self.assertRaises(ValueError):
+            get_service_decoder(service='LISTED_BOOK')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from unittest import TestCase
+from td.replay import ReplayServer
+
+
+def quote_frame(sequence: int) -> str:
+    """Builds a LEVELONE_QUOTES frame."""
+
+    return json.dumps({
+        'data': [
+            {'service': 'QUOTE', 'timestamp': sequence, 'command': 'SUBS', 'content': [{'key': 'MSFT', '1': 180.0 + sequence}]}
+        ]
+    })
+
+
+async def read_stream(replay_server: ReplayServer, services: list) -> tuple:
+    """Subscribes a client of the server to some services, and reads every message."""
+
+    async with replay_server:
+
+        stream_client = replay_server.create_stream_client()
+
+        for service in services:
+            getattr(stream_client, service)(symbols=['MSFT'], fields=[0, 1, 2])
+
+        await stream_client.build_pipeline()
+
+        messages = []
+
+        while True:
+            message = await stream_client.start_pipeline()
+            if message is None:
+                break
+            messages.append(message)
+
+    return messages, stream_client
+
+
+class TDReplayServer(TestCase):
+
+    """Will perform a unit test for the `ReplayServer`."""
+
+    def test_samples(self):
+        """Test that the samples of the subscribed services are replayed."""
+
+        replay_server = ReplayServer.from_samples(speed=None)
+
+        messages, _ = asyncio.run(read_stream(replay_server=replay_server, services=['level_one_quotes']))
+
+        self.assertEqual(messages[0]['response'][0]['command'], 'SUBS')
+        self.assertEqual(
+            [[service_result['service'] for service_result in message['data']] for message in messages[1:]],
+            [['QUOTE'], ['QUOTE']]
+        )
+        self.assertEqual(replay_server.stats['frames_sent'], 2)
+
+    def test_speed(self):
+        """Test that the frames keep their recorded intervals, sped up."""
+
+        frames = [(sequence * 0.2, quote_frame(sequence=sequence)) for sequence in range(3)]
+
+        start = time.monotonic()
+        replay_server = ReplayServer(frames=frames, speed=2.0)
+        messages, _ = asyncio.run(read_stream(replay_server=replay_server, services=['level_one_quotes']))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(len(messages), 4)
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 1.0)
+
+    def test_unsubscribe(self):
+        """Test that an unsubscribed service stops being sent."""
+
+        frames = [(sequence * 0.05, quote_frame(sequence=sequence)) for sequence in range(100)]
+
+        async def read():
+
+            async with ReplayServer(frames=frames, speed=1.0) as replay_server:
+
+                stream_client = replay_server.create_stream_client()
+                stream_client.level_one_quotes(symbols=['MSFT'], fields=[0, 1])
+
+                await stream_client.build_pipeline()
+                await stream_client.start_pipeline()
+                await stream_client.start_pipeline()
+
+                # A frame sent before the request can still come first.
+                response = await stream_client.unsubscribe(service='QUOTE')
+                while 'response' not in response:
+                    response = await stream_client.start_pipeline()
+
+                frames_sent = replay_server.stats['frames_sent']
+
+                await asyncio.sleep(0.2)
+                await stream_client.connection.close()
+
+                return response, frames_sent, replay_server.stats['frames_sent']
+
+        response, frames_sent, frames_sent_later = asyncio.run(read())
+
+        self.assertEqual(response['response'][0]['command'], 'UNSUBS')
+        self.assertEqual(frames_sent, frames_sent_later)
+
+    def test_recording(self):
+        """Test that a recorded session is replayed as it was received."""
+
+        frames = [(sequence * 0.01, quote_frame(sequence=sequence)) for sequence in range(5)]
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            file_path = os.path.join(directory, 'session.jsonl')
+
+            async def record():
+                async with ReplayServer(frames=frames, speed=None) as replay_server:
+                    stream_client = replay_server.create_stream_client()
+                    stream_client.record_frames(file_path=file_path)
+                    stream_client.level_one_quotes(symbols=['MSFT'], fields=[0, 1])
+                    await stream_client.build_pipeline()
+                    while await stream_client.start_pipeline() is not None:
+                        pass
+
+            asyncio.run(record())
+
+            replay_server = ReplayServer.from_recording(file_path=file_path, speed=None)
+
+        self.assertEqual([frame for _, frame, _ in replay_server.frames], [frame for _, frame in frames])
+
+    def test_login_required(self):
+        """Test that requests before the login are rejected."""
+
+        async def request():
+            async with ReplayServer(frames=[], speed=None) as replay_server:
+                stream_client = replay_server.create_stream_client()
+                subscribe_request = json.dumps({'requests': [{'service': 'QUOTE', 'command': 'SUBS'}]})
+                stream_client._build_login_request = lambda: subscribe_request
+                await stream_client._connect()
+
+        with self.assertRaises(ValueError):
+            asyncio.run(request())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import time
+import asyncio
+import threading
+import unittest
+
+from unittest import TestCase
+from td.scheduler import RequestScheduler
+
+
+class TDRequestScheduler(TestCase):
+
+    """Will perform a unit test for the `RequestScheduler`."""
+
+    def setUp(self) -> None:
+        """Set up the Scheduler."""
+
+        # 2 tokens to start with, then 1 token every 10 milliseconds.
+        self.scheduler = RequestScheduler(requests_per_minute=6002, burst=2)
+
+    def test_burst_is_free(self):
+        """Test that the first requests in a burst don't wait."""
+
+        self.assertLess(self.scheduler.acquire(lane='quotes'), 0.005)
+        self.assertLess(self.scheduler.acquire(lane='quotes'), 0.005)
+
+    def test_throttles_after_burst(self):
+        """Test that a request has to wait once the bucket is empty."""
+
+        for _ in range(2):
+            self.scheduler.acquire(lane='quotes')
+
+        self.assertGreater(self.scheduler.acquire(lane='quotes'), 0.005)
+        self.assertEqual(self.scheduler.stats['lanes']['quotes']['throttled'], 1)
+
+    def test_orders_go_first(self):
+        """Test that waiting orders are served before waiting history requests."""
+
+        # Empty the bucket and make everybody wait a little.
+        self.scheduler.penalize(retry_after=0.1)
+
+        served = []
+
+        def make_request(lane: str):
+            self.scheduler.acquire(lane=lane)
+            served.append(lane)
+
+        threads = [threading.Thread(target=make_request, args=('history',)) for _ in range(3)]
+        threads.append(threading.Thread(target=make_request, args=('orders',)))
+
+        for thread in threads:
+            thread.start()
+            time.sleep(0.005)
+
+        self.assertEqual(self.scheduler.queue_depth['history'], 3)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(served[0], 'orders')
+        self.assertEqual(self.scheduler.stats['rate_limited'], 1)
+
+    def test_acquire_async(self):
+        """Test that async callers share the same bucket."""
+
+        async def make_requests():
+            return await asyncio.gather(
+                *[self.scheduler.acquire_async(lane='quotes') for _ in range(4)]
+            )
+
+        waits = asyncio.run(make_requests())
+
+        self.assertEqual(self.scheduler.stats['lanes']['quotes']['requests'], 4)
+        self.assertGreater(max(waits), 0.005)
+
+    def test_invalid_lane(self):
+        """Test that an unknown lane raises an error."""
+
+        with self.assertRaises(ValueError):
+            self.scheduler.acquire(lane='not-a-lane')
+
+    def tearDown(self) -> None:
+        """Teardown the Scheduler."""
+
+        self.scheduler = None
+
+
+if __name__ == '__main__':
+    unittest.main()
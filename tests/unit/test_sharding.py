@@ -0,0 +1,220 @@
+import asyncio
+import json
+import time
+import unittest
+
+import websockets
+
+from unittest import TestCase
+from td.sharding import ShardMerger
+from td.sharding import ShardedStreamer
+from td.sharding import shard_for
+from td.stream import TDStreamerClient
+
+
+USER_PRINCIPAL_DATA = {'accounts': [{'accountId': '123'}], 'streamerInfo': {'appId': 'app', 'token': 'token'}}
+LOGIN_RESPONSE = json.dumps({
+    'response': [
+        {'service': 'ADMIN', 'command': 'LOGIN', 'requestid': '0', 'timestamp': 1, 'content': {'code': 0, 'msg': 'ok'}}
+    ]
+})
+SYMBOLS = ['MSFT', 'AAPL', 'IBM', 'GOOG', 'TSLA', 'SPY', 'QQQ', 'AMZN']
+
+
+def quote_message(timestamp: int) -> dict:
+    """Builds a LEVELONE_QUOTES data message."""
+
+    return {'data': [{'service': 'QUOTE', 'timestamp': timestamp, 'command': 'SUBS', 'content': []}]}
+
+
+def quote_timestamp(service_result: dict) -> int:
+    """Returns the timestamp of a QUOTE section, run by the shard workers."""
+
+    return service_result['timestamp']
+
+
+class TDShardMerger(TestCase):
+
+    """Will perform a unit test for the `ShardMerger`."""
+
+    def test_ordered(self):
+        """Test that messages wait for the other shards."""
+
+        shard_merger = ShardMerger(shards=2, max_delay=60.0)
+
+        self.assertEqual(shard_merger.push(shard=0, message=quote_message(timestamp=10)), [])
+        self.assertEqual(shard_merger.push(shard=0, message=quote_message(timestamp=30)), [])
+
+        released = shard_merger.push(shard=1, message=quote_message(timestamp=20))
+        self.assertEqual([message['data'][0]['timestamp'] for message in released], [10, 20])
+
+        released = shard_merger.push(shard=1, message=None)
+        self.assertEqual([message['data'][0]['timestamp'] for message in released], [30])
+
+    def test_max_delay(self):
+        """Test that a quiet shard doesn't hold the others up."""
+
+        shard_merger = ShardMerger(shards=2, max_delay=0.01)
+        shard_merger.push(shard=0, message=quote_message(timestamp=10))
+
+        time.sleep(0.02)
+
+        self.assertEqual(len(shard_merger.release()), 1)
+
+    def test_other_messages(self):
+        """Test that messages without data are released right away."""
+
+        shard_merger = ShardMerger(shards=2)
+
+        heartbeat = {'notify': [{'heartbeat': '1'}]}
+
+        self.assertEqual(shard_merger.push(shard=0, message=heartbeat), [heartbeat])
+
+
+class TDShardedStreamer(TestCase):
+
+    """Will perform a unit test for the `ShardedStreamer`."""
+
+    def setUp(self) -> None:
+        """Set up the Sharded Streamer."""
+
+        self.stream_client = TDStreamerClient(
+            websocket_url='localhost',
+            user_principal_data=USER_PRINCIPAL_DATA,
+            credentials={}
+        )
+        self.sharded_stream = ShardedStreamer(stream_client=self.stream_client, shards=3)
+
+        for shard_client in self.sharded_stream.clients:
+            shard_client._build_login_request = lambda: json.dumps({'requests': [{'command': 'LOGIN'}]})
+
+    def test_shard_for(self):
+        """Test that a symbol always goes to the same shard."""
+
+        self.assertEqual(shard_for(symbol='MSFT', shards=4), shard_for(symbol='MSFT', shards=4))
+        self.assertTrue(0 <= shard_for(symbol='MSFT', shards=4) < 4)
+
+    def test_subscribe(self):
+        """Test that the symbols are spread over the shards."""
+
+        self.sharded_stream.subscribe('level_one_quotes', symbols=SYMBOLS, fields=[0, 1])
+
+        shard_symbols = []
+        for shard_client in self.sharded_stream.clients:
+            for request in shard_client.data_requests['requests']:
+                shard_symbols.extend(request['parameters']['keys'].split(','))
+
+        self.assertEqual(sorted(shard_symbols), sorted(SYMBOLS))
+        self.assertEqual(self.sharded_stream.partition(symbols=SYMBOLS)[shard_for(symbol='IBM', shards=3)].count('IBM'), 1)
+
+    def test_subscribe_service_argument(self):
+        """Test that subscription methods with their own `service` argument can be sharded."""
+
+        self.sharded_stream.subscribe('timesale', service='TIMESALE_EQUITY', symbols=SYMBOLS, fields=[0, 1, 2])
+        self.sharded_stream.subscribe('chart', service='CHART_EQUITY', symbols=SYMBOLS, fields=[0, 1, 2])
+
+        services = {}
+        for shard_client in self.sharded_stream.clients:
+            for request in shard_client.data_requests['requests']:
+                services.setdefault(request['service'], []).extend(request['parameters']['keys'].split(','))
+
+        self.assertEqual(sorted(services['TIMESALE_EQUITY']), sorted(SYMBOLS))
+        self.assertEqual(sorted(services['CHART_EQUITY']), sorted(SYMBOLS))
+
+    def test_invalid_service(self):
+        """Test that an unknown subscription method is rejected."""
+
+        with self.assertRaises(ValueError):
+            self.sharded_stream.subscribe('_connect', symbols=SYMBOLS)
+
+    def test_messages(self):
+        """Test that the shards are merged into one ordered stream."""
+
+        async def handler(websocket, path=None):
+
+            async for request in websocket:
+
+                requests = json.loads(request)['requests']
+
+                if requests[0]['command'] == 'LOGIN':
+                    await websocket.send(LOGIN_RESPONSE)
+                    continue
+
+                keys = requests[0]['parameters']['keys'].split(',')
+
+                for sequence in range(20):
+                    await websocket.send(json.dumps(quote_message(timestamp=sequence * 10 + len(keys))))
+
+                await websocket.close()
+
+        async def run_stream():
+
+            server = await websockets.serve(handler, '127.0.0.1', 0)
+
+            for shard_client in self.sharded_stream.clients:
+                shard_client.websocket_url = 'ws://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1])
+
+            self.sharded_stream.subscribe('level_one_quotes', symbols=SYMBOLS, fields=[0, 1])
+
+            timestamps = [message['data'][0]['timestamp'] async for message in self.sharded_stream.messages()]
+
+            server.close()
+            await server.wait_closed()
+
+            return timestamps
+
+        timestamps = asyncio.run(run_stream())
+        active_shards = len([partition for partition in self.sharded_stream.partition(symbols=SYMBOLS) if partition])
+
+        self.assertEqual(len(timestamps), 20 * active_shards)
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_processes(self):
+        """Test that the workers run the handlers, and only their results are merged."""
+
+        self.sharded_stream.processes = True
+
+        async def handler(websocket, path=None):
+
+            async for request in websocket:
+
+                requests = json.loads(request)['requests']
+
+                if requests[0]['command'] == 'LOGIN':
+                    await websocket.send(LOGIN_RESPONSE)
+                    continue
+
+                keys = requests[0]['parameters']['keys'].split(',')
+
+                for sequence in range(20):
+                    await websocket.send(json.dumps(quote_message(timestamp=sequence * 10 + len(keys))))
+
+                await websocket.close()
+
+        async def run_stream():
+
+            server = await websockets.serve(handler, '127.0.0.1', 0)
+
+            for shard_client in self.sharded_stream.clients:
+                shard_client.websocket_url = 'ws://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1])
+
+            self.sharded_stream.subscribe('level_one_quotes', symbols=SYMBOLS, fields=[0, 1])
+            self.sharded_stream.add_handler(service='QUOTE', callback=quote_timestamp)
+
+            results = [result async for result in self.sharded_stream.messages()]
+
+            server.close()
+            await server.wait_closed()
+
+            return results
+
+        results = asyncio.run(run_stream())
+        active_shards = len([partition for partition in self.sharded_stream.partition(symbols=SYMBOLS) if partition])
+
+        self.assertEqual(len(results), 20 * active_shards)
+        self.assertEqual(results, sorted(results))
+        self.assertEqual(self.sharded_stream._workers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import unittest
+
+import websockets
+
+from unittest import TestCase
+from td.stream import TDStreamerClient
+from td.subscribers import StreamSubscriber
+
+
+LOGIN_RESPONSE = json.dumps({
+    'response': [
+        {'service': 'ADMIN', 'command': 'LOGIN', 'requestid': '0', 'timestamp': 1, 'content': {'code': 0, 'msg': 'ok'}}
+    ]
+})
+
+
+def quote_message(sequence: int) -> dict:
+    """Builds a LEVELONE_QUOTES data message with two symbols."""
+
+    return {
+        'data': [
+            {
+                'service': 'QUOTE',
+                'timestamp': sequence,
+                'command': 'SUBS',
+                'content': [{'key': 'MSFT', '1': 180.0 + sequence}, {'key': 'AAPL', '1': 320.0 + sequence}]
+            }
+        ]
+    }
+
+
+def ask_update() -> dict:
+    """Builds a LEVELONE_QUOTES data message that only changes the MSFT ask price."""
+
+    return {'data': [{'service': 'QUOTE', 'timestamp': 2, 'content': [{'key': 'MSFT', '2': 185.0}]}]}
+
+
+class TDStreamSubscriber(TestCase):
+
+    """Will perform a unit test for the `StreamSubscriber`."""
+
+    def test_service(self):
+        """Test that a service subscriber only reads the entries of its symbols."""
+
+        async def read():
+            subscriber = StreamSubscriber(service='QUOTE', symbols=['AAPL'])
+            await subscriber.deliver(message=quote_message(sequence=1))
+            await subscriber.deliver(message={'notify': [{'heartbeat': '1'}]})
+            subscriber.close()
+            return [item async for item in subscriber]
+
+        items = asyncio.run(read())
+
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]['content'], [{'key': 'AAPL', '1': 321.0}])
+
+    def test_drop_oldest(self):
+        """Test that a slow subscriber only fills its own queue."""
+
+        async def read():
+            subscriber = StreamSubscriber(maxsize=2)
+            for sequence in range(5):
+                await subscriber.deliver(message=quote_message(sequence=sequence))
+            subscriber.close()
+            return [item async for item in subscriber], subscriber.stats
+
+        items, stats = asyncio.run(read())
+
+        self.assertEqual([item['data'][0]['timestamp'] for item in items], [3, 4])
+        self.assertEqual(stats['dropped'], 3)
+
+    def test_conflate(self):
+        """Test that a subscriber that falls behind reads the latest state of each symbol."""
+
+        async def read():
+            subscriber = StreamSubscriber(service='QUOTE', overflow='conflate')
+            await subscriber.deliver(message=quote_message(sequence=1))
+            await subscriber.deliver(message=ask_update())
+            subscriber.close()
+            return [item async for item in subscriber], subscriber.stats
+
+        items, stats = asyncio.run(read())
+
+        self.assertEqual(
+            [item['content'] for item in items],
+            [[{'key': 'MSFT', '1': 181.0, '2': 185.0}], [{'key': 'AAPL', '1': 321.0}]]
+        )
+        self.assertEqual(items[0]['timestamp'], 2)
+        self.assertEqual(stats['coalesced'], 1)
+
+    def test_conflate_records(self):
+        """Test that conflated records keep the fields the update didn't carry."""
+
+        async def read():
+            subscriber = StreamSubscriber(service='QUOTE', records=True, overflow='conflate')
+            stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+            for message in (quote_message(sequence=1), ask_update()):
+                await subscriber.deliver(message=message, records=stream_client.decode_records(message=message))
+            subscriber.close()
+            return [item async for item in subscriber]
+
+        items = asyncio.run(read())
+
+        self.assertEqual((items[0].symbol, items[0].bid_price, items[0].ask_price), ('MSFT', 181.0, 185.0))
+        self.assertEqual(len(items), 2)
+
+    def test_conflate_shared(self):
+        """Test that conflating doesn't change the messages other subscribers read."""
+
+        async def read():
+            conflating = StreamSubscriber(overflow='conflate')
+            every_tick = StreamSubscriber()
+            for message in (quote_message(sequence=1), quote_message(sequence=2)):
+                await conflating.deliver(message=message)
+                await every_tick.deliver(message=message)
+            conflating.close()
+            every_tick.close()
+            return [item async for item in conflating], [item async for item in every_tick]
+
+        conflated, ticks = asyncio.run(read())
+
+        self.assertEqual(len(conflated), 2)
+        self.assertEqual(conflated[0]['data'][0]['content'], [{'key': 'MSFT', '1': 182.0}])
+        self.assertEqual([tick['data'][0]['content'][0]['1'] for tick in ticks], [181.0, 182.0])
+
+    def test_invalid_subscriber(self):
+        """Test that records need a service, and that the policy is known."""
+
+        with self.assertRaises(ValueError):
+            StreamSubscriber(records=True)
+
+        with self.assertRaises(ValueError):
+            StreamSubscriber(service='QUOTE', overflow='coalesce')
+
+    def test_fan_out(self):
+        """Test that several subscribers read the same connection."""
+
+        async def handler(websocket, path=None):
+
+            async for request in websocket:
+
+                requests = json.loads(request)['requests']
+
+                if requests and requests[0]['command'] == 'LOGIN':
+                    await websocket.send(LOGIN_RESPONSE)
+                    continue
+
+                for sequence in range(3):
+                    await websocket.send(json.dumps(quote_message(sequence=sequence)))
+
+                await websocket.close()
+
+        async def run_stream():
+
+            server = await websockets.serve(handler, '127.0.0.1', 0)
+
+            stream_client = TDStreamerClient(websocket_url='localhost', user_principal_data={}, credentials={})
+            stream_client.websocket_url = 'ws://127.0.0.1:{}'.format(server.sockets[0].getsockname()[1])
+            stream_client._build_login_request = lambda: json.dumps({'requests': [{'command': 'LOGIN'}]})
+
+            await stream_client.build_pipeline()
+
+            messages = stream_client.add_subscriber()
+            quotes = stream_client.add_subscriber(service='QUOTE', symbols=['MSFT'], records=True)
+
+            read_messages = [message async for message in messages]
+            read_quotes = [quote async for quote in quotes]
+
+            server.close()
+            await server.wait_closed()
+
+            return read_messages, read_quotes, stream_client
+
+        messages, quotes, stream_client = asyncio.run(run_stream())
+
+        self.assertEqual(len(messages), 3)
+        self.assertEqual([quote.bid_price for quote in quotes], [180.0, 181.0, 182.0])
+        self.assertEqual(type(quotes[0]).__name__, 'QuoteRecord')
+        self.assertEqual(stream_client.subscribers, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import shutil
+import tempfile
+import unittest
+
+from unittest import TestCase
+from td.tick_store import DICTIONARY_FILE
+from td.tick_store import TICK_RECORD
+from td.tick_store import Tick
+from td.tick_store import TickReader
+from td.tick_store import TickWriter
+
+
+def timesale_message(sequence: int, symbol: str) -> dict:
+    """Builds a TIMESALE_EQUITY data message."""
+
+    return {
+        'data': [
+            {
+                'service': 'TIMESALE_EQUITY',
+                'timestamp': 1403804712166 + sequence,
+                'command': 'SUBS',
+                'content': [
+                    {'1': 1403804709455 + sequence, '2': 90.2976, '3': 1500, '4': sequence, 'seq': sequence, 'key': symbol}
+                ]
+            }
+        ]
+    }
+
+
+def quote_message(content: dict, timestamp: object = 1) -> dict:
+    """Builds a QUOTE data message for MSFT."""
+
+    return {'data': [{'service': 'QUOTE', 'timestamp': timestamp, 'content': [dict(content, key='MSFT')]}]}
+
+
+class TDTickStore(TestCase):
+
+    """Will perform a unit test for the binary tick store."""
+
+    def setUp(self) -> None:
+        """Set up the Store."""
+
+        self.directory = tempfile.mkdtemp()
+
+    def test_round_trip(self):
+        """Test that the written ticks are read back in order."""
+
+        tick_writer = TickWriter(directory=self.directory, flush_interval=0.0)
+
+        for sequence in range(10):
+            tick_writer.append(message=timesale_message(sequence=sequence, symbol='MSFT' if sequence % 2 else 'AAPL'))
+
+        tick_writer.append(message={'notify': [{'heartbeat': '1'}]})
+        tick_writer.close()
+
+        self.assertEqual(tick_writer.stats['records_written'], 50)
+
+        tick_reader = TickReader(directory=self.directory)
+        ticks = list(tick_reader.scan(service='TIMESALE_EQUITY', symbols=['MSFT']))
+
+        self.assertEqual(len(ticks), 25)
+        self.assertEqual(ticks[0], Tick(1403804712167, 'MSFT', 'TIMESALE_EQUITY', 'trade_time', 1403804709456))
+        self.assertEqual(ticks[1].field, 'last_price')
+        self.assertEqual(set(tick_reader.symbols), {'AAPL', 'MSFT'})
+
+    def test_text_values_and_append(self):
+        """Test that text fields are kept in the dictionary across writers."""
+
+        tick_writer = TickWriter(directory=self.directory)
+        tick_writer.append(message=timesale_message(sequence=0, symbol='AAPL'))
+        tick_writer.close()
+
+        tick_writer = TickWriter(directory=self.directory)
+        tick_writer.append(message=quote_message(content={'25': 'Microsoft', '1': 183.63}))
+        tick_writer.close()
+
+        ticks = list(TickReader(directory=self.directory).scan(service='QUOTE'))
+
+        self.assertEqual([(tick.field, tick.value) for tick in ticks], [('description', 'Microsoft'), ('bid_price', 183.63)])
+
+    def test_large_integers(self):
+        """Test that integers keep every digit, and floats and texts still round trip."""
+
+        tick_writer = TickWriter(directory=self.directory)
+        tick_writer.append(message=quote_message(content={'8': 2 ** 53 + 1, '1': -0.5, '25': 'Microsoft'}))
+        tick_writer.close()
+
+        ticks = list(TickReader(directory=self.directory).scan())
+
+        self.assertEqual([tick.value for tick in ticks], [2 ** 53 + 1, -0.5, 'Microsoft'])
+        self.assertIsInstance(ticks[1].value, float)
+
+    def test_failed_write(self):
+        """Test that a write that raises marks the writer failed, instead of stopping it."""
+
+        tick_writer = TickWriter(directory=self.directory, flush_interval=0.0, capacity=4)
+        tick_writer.append(message=quote_message(content={'1': 1.0}, timestamp='now'))
+        tick_writer.close()
+
+        self.assertTrue(tick_writer.failed)
+        self.assertEqual(tick_writer.stats['errors'], 1)
+        self.assertEqual(tick_writer.capacity, 4)
+
+    def test_segments_rotate(self):
+        """Test that a full segment starts a new one, and torn records are skipped."""
+
+        for sequence in range(3):
+            tick_writer = TickWriter(directory=self.directory, segment_size=TICK_RECORD.size * 5)
+            tick_writer.append(message=timesale_message(sequence=sequence, symbol='AAPL'))
+            tick_writer.close()
+
+        tick_reader = TickReader(directory=self.directory)
+
+        with open(tick_reader.segments[-1], 'ab') as segment_file:
+            segment_file.write(b'\x00' * 3)
+
+        self.assertEqual(len(tick_reader.segments), 3)
+        self.assertEqual(len(list(tick_reader.scan())), 15)
+
+    def test_append_after_crash(self):
+        """Test that a record and an entry cut short by a crash don't shift what's appended after them."""
+
+        tick_writer = TickWriter(directory=self.directory)
+        tick_writer.append(message=quote_message(content={'1': 183.63, '25': 'Microsoft'}))
+        tick_writer.close()
+
+        tick_reader = TickReader(directory=self.directory)
+
+        with open(tick_reader.segments[-1], 'ab') as segment_file:
+            segment_file.write(b'\x00' * 5)
+
+        with open(tick_reader.directory.joinpath(DICTIONARY_FILE), 'a') as dictionary_file:
+            dictionary_file.write('["text", 1, "Micro')
+
+        tick_writer = TickWriter(directory=self.directory)
+        tick_writer.append(message=quote_message(content={'1': 184.0, '25': 'NASDAQ'}, timestamp=2))
+        tick_writer.close()
+
+        ticks = list(TickReader(directory=self.directory).scan())
+
+        self.assertEqual(
+            [(tick.timestamp, tick.field, tick.value) for tick in ticks],
+            [(1, 'bid_price', 183.63), (1, 'description', 'Microsoft'), (2, 'bid_price', 184.0), (2, 'description', 'NASDAQ')]
+        )
+
+    def tearDown(self) -> None:
+        """Teardown the Store."""
+
+        shutil.rmtree(self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import time
+import tempfile
+import unittest
+
+from unittest import TestCase
+from td.load_generator import create_mock_client
+from td.mock_api import MockTDServer
+
+
+class TDTokenRefresher(TestCase):
+
+    """Will perform a unit test for the token deadlines and the `TokenRefresher`."""
+
+    def setUp(self) -> None:
+        """Start the mock server, and create a client for it."""
+
+        self.temp_directory = tempfile.TemporaryDirectory()
+
+        self.mock_server = MockTDServer()
+        self.mock_server.start()
+
+        self.td_client = create_mock_client(
+            url=self.mock_server.url,
+            credentials_path=os.path.join(self.temp_directory.name, 'td_state.json')
+        )
+
+    def tearDown(self) -> None:
+        """Stop the refresher and the mock server."""
+
+        self.td_client.stop_token_refresher()
+        self.td_client.close_session()
+        self.mock_server.stop()
+        self.temp_directory.cleanup()
+
+    def _expire_access_token(self, seconds: float) -> None:
+        """Moves the access token expiration time, so it's due in `seconds`."""
+
+        self.td_client.state['access_token'] = 'EXPIRED_ACCESS_TOKEN'
+        self.td_client.state['access_token_expires_at'] = time.time() + self.td_client.ACCESS_TOKEN_MARGIN + seconds
+        self.td_client._update_token_deadlines()
+
+    def test_fresh_tokens(self):
+        """Test that fresh tokens aren't refreshed."""
+
+        self.assertGreater(self.td_client._token_deadline, time.monotonic())
+        self.assertTrue(self.td_client.validate_token())
+        self.assertEqual(self.mock_server.stats['requests'], 0)
+
+    def test_expired_access_token(self):
+        """Test that an expired access token is refreshed inline."""
+
+        self._expire_access_token(seconds=-1.0)
+
+        self.assertTrue(self.td_client.validate_token())
+        self.assertEqual(self.td_client.state['access_token'], 'MOCK_ACCESS_TOKEN')
+        self.assertGreater(self.td_client._access_token_deadline, time.monotonic() + 1000)
+        self.assertEqual(self.mock_server.stats['requests'], 1)
+        self.assertTrue(os.path.exists(self.td_client.credentials_path))
+
+    def test_token_refresher(self):
+        """Test that the refresher refreshes the access token before it's due."""
+
+        self._expire_access_token(seconds=0.2)
+
+        token_refresher = self.td_client.start_token_refresher(lead_time=0.1, retry_delay=0.1)
+
+        for _ in range(50):
+            if token_refresher.refreshes:
+                break
+            time.sleep(0.05)
+
+        self.assertEqual(token_refresher.refreshes, 1)
+        self.assertEqual(token_refresher.errors, 0)
+        self.assertEqual(self.td_client.state['access_token'], 'MOCK_ACCESS_TOKEN')
+
+        # The request path doesn't refresh anything.
+        self.assertTrue(self.td_client.validate_token())
+        self.assertEqual(self.mock_server.stats['requests'], 1)
+
+        self.td_client.stop_token_refresher()
+        self.assertFalse(token_refresher.running)
+
+    def test_missing_expiration_times(self):
+        """Test that the tokens aren't valid without their expiration times."""
+
+        del self.td_client.state['access_token_expires_at']
+        self.td_client._update_token_deadlines()
+
+        self.assertFalse(self.td_client.validate_token())
+        self.assertEqual(self.mock_server.stats['requests'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import os
+import time
+import tempfile
+import unittest
+import multiprocessing as mp
+
+from unittest import TestCase
+from td.load_generator import create_mock_client
+from td.mock_api import MockTDServer
+from td.token_store import SharedTokenStore
+
+
+def _write_state(token_store: SharedTokenStore) -> None:
+    """Writes a state to the store, from another process."""
+
+    token_store.write(state={'access_token': 'CHILD_ACCESS_TOKEN'})
+
+
+def _die_while_writing(token_store: SharedTokenStore) -> None:
+    """Starts a write and exits without finishing it, from another process."""
+
+    token_store.lock.acquire()
+    token_store._sequence.value += 1
+
+
+def _refresh_access_token(td_client) -> None:
+    """Refreshes the access token of the client, from another process."""
+
+    td_client.state['access_token_expires_at'] = time.time()
+    td_client._update_token_deadlines()
+    td_client.validate_token()
+    td_client.close_session()
+
+
+class TDSharedTokenStore(TestCase):
+
+    """Will perform a unit test for the `SharedTokenStore`."""
+
+    def test_read_write(self):
+        """Test that a reader only gets the state back when it changed."""
+
+        token_store = SharedTokenStore()
+
+        version, state = token_store.read()
+        self.assertEqual((version, state), (0, {}))
+
+        version = token_store.write(state={'access_token': 'ACCESS_TOKEN'})
+        self.assertEqual(token_store.read(), (version, {'access_token': 'ACCESS_TOKEN'}))
+        self.assertEqual(token_store.read(since=version), (version, None))
+
+    def test_capacity(self):
+        """Test that a state larger than the store isn't written."""
+
+        token_store = SharedTokenStore(capacity=16)
+
+        with self.assertRaises(ValueError):
+            token_store.write(state={'access_token': 'A' * 16})
+
+        self.assertEqual(token_store.version, 0)
+
+    def test_stopped_writer(self):
+        """Test that a reader doesn't spin forever on a write that never finishes."""
+
+        token_store = SharedTokenStore()
+        token_store.write(state={'access_token': 'ACCESS_TOKEN'})
+
+        # The sequence is odd, but the lock was released, so it's read under the lock.
+        token_store._sequence.value += 1
+        self.assertEqual(token_store.read()[1], {'access_token': 'ACCESS_TOKEN'})
+
+        token_store._sequence.value += 1
+
+        process = mp.Process(target=_die_while_writing, args=(token_store,))
+        process.start()
+        process.join()
+
+        with self.assertRaises(TimeoutError):
+            token_store.read(timeout=0.1)
+
+    def test_processes(self):
+        """Test that a state written by a child process is seen by its parent."""
+
+        token_store = SharedTokenStore()
+
+        process = mp.Process(target=_write_state, args=(token_store,))
+        process.start()
+        process.join()
+
+        self.assertEqual(token_store.read()[1], {'access_token': 'CHILD_ACCESS_TOKEN'})
+
+    @unittest.skipUnless(mp.get_start_method() == 'fork', 'The client is shared by forking.')
+    def test_shared_client(self):
+        """Test that a token refreshed by one process isn't refreshed again by another."""
+
+        with MockTDServer() as mock_server, tempfile.TemporaryDirectory() as temp_directory:
+
+            td_client = create_mock_client(
+                url=mock_server.url,
+                credentials_path=os.path.join(temp_directory, 'td_state.json'),
+                _multiprocessing_safe=True
+            )
+
+            process = mp.Process(target=_refresh_access_token, args=(td_client,))
+            process.start()
+            process.join()
+
+            self.assertEqual(mock_server.stats['requests'], 1)
+
+            # The access token is due here too, but the store has the new one.
+            td_client.state['access_token_expires_at'] = time.time()
+            td_client._update_token_deadlines()
+
+            self.assertTrue(td_client.validate_token())
+            self.assertEqual(mock_server.stats['requests'], 1)
+            self.assertGreater(td_client._access_token_deadline, time.monotonic() + 1000)
+
+            td_client.close_session()
+
+    @unittest.skipUnless(mp.get_start_method() == 'fork', 'The client is shared by forking.')
+    def test_fork_during_refresh(self):
+        """Test that a process forked while a refresh holds the token lock can refresh its tokens."""
+
+        with MockTDServer() as mock_server, tempfile.TemporaryDirectory() as temp_directory:
+
+            td_client = create_mock_client(
+                url=mock_server.url,
+                credentials_path=os.path.join(temp_directory, 'td_state.json')
+            )
+
+            # The lock is held, like it is while the refresher thread refreshes the tokens.
+            with td_client._token_lock:
+                process = mp.Process(target=_refresh_access_token, args=(td_client,))
+                process.start()
+                process.join(timeout=10)
+
+            if process.is_alive():
+                process.terminate()
+
+            self.assertEqual(process.exitcode, 0)
+            self.assertEqual(mock_server.stats['requests'], 1)
+
+            td_client.close_session()
+
+
+if __name__ == '__main__':
+    unittest.main()